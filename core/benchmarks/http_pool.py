@@ -0,0 +1,103 @@
+"""Per-call latency of a bare `requests.get` against `core.sdk.http.get`.
+
+    python -m core.benchmarks.http_pool            # 200 calls each
+    python -m core.benchmarks.http_pool 1000
+
+Both run against a local keep-alive HTTP server, so the difference is the
+connection setup alone: a bare call opens and closes a TCP connection every
+time, the pooled one reuses the first. Against a real host the gap is wider
+— each fresh connection there also pays DNS and a TLS handshake, tens of
+milliseconds to Telegram or Biwenger where the loopback TCP setup here is
+tens of microseconds. Offline, like the api benchmarks.
+"""
+
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from core.sdk import http
+
+_BODY = b'{"ok": true}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    # Headers and body go out as two writes; with Nagle on, the second waits
+    # for the client's delayed ACK (~40 ms) on a reused connection. Real
+    # servers set TCP_NODELAY too.
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_BODY)))
+        self.end_headers()
+        self.wfile.write(_BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def local_server():
+    """A keep-alive HTTP server on a free loopback port; yields its URL and
+    a list that grows by one per accepted connection."""
+    connections: list = []
+
+    class Server(ThreadingHTTPServer):
+        daemon_threads = True
+
+        def process_request(self, request, client_address):
+            connections.append(client_address)
+            super().process_request(request, client_address)
+
+    server = Server(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/", connections
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _measure(call, url: str, calls: int) -> dict:
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call(url, timeout=5).raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": round(cuts[49], 3), "p99_ms": round(cuts[98], 3)}
+
+
+def run(calls: int = 200) -> dict:
+    """`{"bare"|"pooled": {"p50_ms", "p99_ms", "connections"}}`."""
+    results = {}
+    with local_server() as (url, connections):
+        for name, call in (("bare", requests.get), ("pooled", http.get)):
+            http.reset_sessions()
+            before = len(connections)
+            results[name] = {
+                **_measure(call, url, calls),
+                "connections": len(connections) - before,
+            }
+    http.reset_sessions()
+    return results
+
+
+def main(argv: list[str]) -> int:
+    calls = int(argv[0]) if argv else 200
+    print(f"{'':10}{'p50 ms':>10}{'p99 ms':>10}{'conns':>8}   ({calls} calls)")
+    for name, r in run(calls).items():
+        print(f"{name:10}{r['p50_ms']:>10}{r['p99_ms']:>10}{r['connections']:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
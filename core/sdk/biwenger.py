@@ -1,11 +1,18 @@
 """Biwenger API client."""
 
+import hashlib
 import json
+import os
 import re
-from typing import Optional, Tuple, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional, Tuple, Union
 
 import requests
 
+from core.sdk import http
 from core.sdk.http import retry_http_request
 from core.utils import get_logger
 
@@ -27,11 +34,93 @@ ACCOUNT_URL = f"{BIWENGER_API_BASE}/account"
 MARKET_URL = f"{BIWENGER_API_BASE}/market"
 OFFERS_URL = f"{BIWENGER_API_BASE}/offers"
 USER_OFFERS_URL = f"{BIWENGER_API_BASE}/user?fields=offers(*,from(*),to(*))"
+
 LINEUP_URL = f"{BIWENGER_API_BASE}/user?fields=*,lineup(date)"
 USER_LINEUP_URL = f"{BIWENGER_API_BASE}/user?fields=lineup(date,formation,players)"
 ALL_PLAYERS_DATA_URL = f"{BIWENGER_CF_BASE}/competitions/la-liga/data?lang=es&score=100"
 
 
+# How long a competition snapshot is served without asking Biwenger again.
+# Prices move once a day (overnight), so five minutes only bounds how stale a
+# chained command can be — past it the snapshot is revalidated, not re-parsed,
+# unless the payload actually changed.
+COMPETITION_CACHE_TTL_SECONDS = 300
+
+_BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/138.0.0.0 Safari/537.36"
+)
+
+
+@dataclass
+class _CompetitionSnapshot:
+    """One cached download of the public competition payload."""
+
+    data: dict
+    digest: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+# Process-wide, keyed by URL. The payload is public and the same for every
+# league, so every caller in the instance — `build_context`, the scraper, the
+# draft market — shares one copy. The lock makes concurrent gunicorn threads
+# wait on a single download instead of each starting their own.
+_COMPETITION_CACHE: dict[str, _CompetitionSnapshot] = {}
+_COMPETITION_LOCK = threading.Lock()
+
+
+# --- Outbound rate limit ---
+# The api, the scraper job and the draft all spend one request budget
+# against biwenger.as.com, which answers bursts past it with 429s. Every
+# request there waits on a token bucket: `BIWENGER_BURST` at once — a whole
+# league's squad fan-out — then `BIWENGER_RATE_PER_SECOND`. With
+# `BIWENGER_QUOTA_DOC` ("collection/doc") the instances also share a
+# Firestore window of a minute's worth of that rate. The CDN
+# (cf.biwenger.com) is not limited.
+BIWENGER_RATE_PER_SECOND = float(os.getenv("BIWENGER_RATE_PER_SECOND", "4"))
+BIWENGER_BURST = int(os.getenv("BIWENGER_BURST", "10"))
+BIWENGER_QUOTA_DOC = os.getenv("BIWENGER_QUOTA_DOC", "")
+
+
+def _shared_quota():
+    if not BIWENGER_QUOTA_DOC:
+        return None
+    # Imported here so processes without a shared budget skip Firestore.
+    from core.sdk import firestore
+
+    collection, _, doc_id = BIWENGER_QUOTA_DOC.rpartition("/")
+    return firestore.WindowCounter(
+        collection, doc_id, limit=int(BIWENGER_RATE_PER_SECOND * 60)
+    )
+
+
+http.rate_limit(
+    BIWENGER_API_BASE,
+    BIWENGER_RATE_PER_SECOND,
+    BIWENGER_BURST,
+    shared=_shared_quota(),
+)
+
+
+def reset_competition_cache() -> None:
+    """Drop every cached competition snapshot so the next read downloads."""
+    with _COMPETITION_LOCK:
+        _COMPETITION_CACHE.clear()
+
+
+def _parse_competition_payload(text: str) -> dict:
+    """The `data` block of a competition payload, JSON or JSONP-wrapped."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        json_str = re.search(r"^\s*jsonp_\d+\((.*)\)\s*$", text, re.DOTALL).group(1)
+        data = json.loads(json_str)
+    return data.get("data", {}) or {}
+
+
 def league_url(league_id: Union[str, int]) -> str:
     return f"{BIWENGER_API_BASE}/league/{league_id}"
 
@@ -91,6 +180,14 @@ class BiwengerClient:
     """
 
     DEFAULT_PAGE_LIMIT = 200
+    # Requests a fan-out keeps in flight against Biwenger at once: enough to
+    # read a whole league's squads in one round-trip, within `BIWENGER_BURST`
+    # so the rate limit lets them all go at once, and within the session's
+    # connection pool so no request waits for a socket.
+    MAX_CONCURRENT_REQUESTS = 8
+    # Board pages requested together once the first page comes back full. A
+    # window overshoots the end by at most `PAGE_WINDOW - 1` short pages.
+    PAGE_WINDOW = 4
 
     def __init__(
         self,
@@ -100,30 +197,71 @@ class BiwengerClient:
         account_url: str,
         league_id: Union[str, int],
     ) -> None:
-        self.session = requests.Session()
+        self.session = http.pooled_session()
         self.email = email
         self.password = password
         self.login_url = login_url
         self.account_url = account_url
         self.league_id = str(league_id)
         self.user_id: Optional[int] = None
+        self._auth_lock = threading.Lock()
+        # Per-thread flags: the login itself and the one resend after it must
+        # not re-enter the 401 hook.
+        self._hook_state = threading.local()
+        self.session.hooks["response"].append(self._reauthenticate_on_401)
         self._authenticate()
 
+    def _reauthenticate_on_401(
+        self, response: requests.Response, *args, **kwargs
+    ) -> requests.Response:
+        """Response hook: log in again on a rejected token and resend once.
+
+        The bearer token carries no expiry claim, so a long-lived session only
+        learns it went stale from a `401`. Retrying that is safe even for the
+        admin writes that never retry: a `401` is refused before Biwenger
+        applies anything. Threads that hit the same stale token log in once
+        between them — whoever takes the lock second finds the header already
+        replaced and just resends.
+        """
+        state = self._hook_state
+        if response.status_code != 401 or getattr(state, "busy", False):
+            return response
+        state.busy = True
+        try:
+            rejected = response.request.headers.get("Authorization")
+            with self._auth_lock:
+                if self.session.headers.get("Authorization") == rejected:
+                    logger.info("Biwenger session rejected — re-authenticating.")
+                    self._authenticate()
+            retry = response.request.copy()
+            retry.headers["Authorization"] = self.session.headers["Authorization"]
+            response.close()
+            return self.session.send(retry, **kwargs)
+        finally:
+            state.busy = False
+
     def _authenticate(self) -> None:
         """Logs in and configures the session with the required headers."""
+        state = self._hook_state
+        was_busy = getattr(state, "busy", False)
+        state.busy = True
+        try:
+            self._login()
+        finally:
+            state.busy = was_busy
+
+    def _login(self) -> None:
         logger.info("Authenticating with Biwenger...")
         login_headers = {
             "Accept": "application/json, text/plain, */*",
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/138.0.0.0 Safari/537.36"
-            ),
+            "User-Agent": _BROWSER_USER_AGENT,
             "X-Lang": "es",
             "X-Version": "628",
         }
         login_payload = {"email": self.email, "password": self.password}
 
+        # A re-login must not send the stale token along with the credentials.
+        self.session.headers.pop("Authorization", None)
         login_response = self.session.post(
             self.login_url, data=login_payload, headers=login_headers
         )
@@ -272,30 +410,77 @@ class BiwengerClient:
         response.raise_for_status()
         return response.json()
 
+    def _paginate(
+        self,
+        fetch_page: Callable[[str], dict],
+        base_url: str,
+        limit: int,
+        *,
+        label: str,
+        stop_when: Optional[Callable[[dict], bool]] = None,
+    ) -> list:
+        """Every entry of a `limit`/`offset` feed, later pages concurrently.
+
+        Page 0 is read alone — most feeds fit in it, and incremental reads stop
+        there. Past it, `PAGE_WINDOW` offsets are requested at once and
+        consumed in order; the first short page ends the feed, and whatever
+        the window fetched beyond it is dropped. `stop_when` also ends it: the
+        page holding the first entry it accepts is the last one kept.
+        """
+
+        def page(offset: int) -> list:
+            data = fetch_page(f"{base_url}&limit={limit}&offset={offset}")
+            entries = data.get("data", []) or []
+            if isinstance(entries, dict):
+                entries = list(entries.values())
+            logger.info(
+                "%s page fetched.",
+                label,
+                extra={"offset": offset, "count": len(entries)},
+            )
+            return entries
+
+        def last(entries: list) -> bool:
+            if len(entries) < limit:
+                return True
+            return stop_when is not None and any(stop_when(e) for e in entries)
+
+        collected = page(0)
+        if last(collected):
+            return collected
+        next_offset = limit
+        with ThreadPoolExecutor(max_workers=self.PAGE_WINDOW) as pool:
+            while True:
+                offsets = [next_offset + i * limit for i in range(self.PAGE_WINDOW)]
+                next_offset += self.PAGE_WINDOW * limit
+                for entries in pool.map(page, offsets):
+                    collected.extend(entries)
+                    if last(entries):
+                        return collected
+
     def get_all_board_messages(
-        self, base_url: str, limit: int = DEFAULT_PAGE_LIMIT
+        self,
+        base_url: str,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        stop_when: Optional[Callable[[dict], bool]] = None,
     ) -> list:
         """Paginates board messages from `base_url` until exhausted.
 
         `base_url` already contains the query string up to (but not including)
         `limit`/`offset`, e.g. ".../board?type=text".
         Returns a flat list of message entries.
+
+        The board is served newest first, so an incremental reader passes
+        `stop_when` — e.g. "this message is already stored" — and the crawl
+        ends at the first page that reaches known history.
         """
-        all_messages: list = []
-        offset = 0
-        while True:
-            url = f"{base_url}&limit={limit}&offset={offset}"
-            data = self.get_board_messages(url)
-            messages = data.get("data", [])
-            logger.info(
-                "Board page fetched.", extra={"offset": offset, "count": len(messages)}
-            )
-            if not messages:
-                break
-            all_messages.extend(messages)
-            offset += limit
-            if len(messages) < limit:
-                break
+        all_messages = self._paginate(
+            self.get_board_messages,
+            base_url,
+            limit,
+            label="Board",
+            stop_when=stop_when,
+        )
         logger.info("All board messages fetched.", extra={"total": len(all_messages)})
         return all_messages
 
@@ -303,26 +488,53 @@ class BiwengerClient:
     def _fetch_competition_data(url: str) -> dict:
         """Return the `data` block of the public competition payload.
 
+        Served from a process-wide snapshot. Within
+        `COMPETITION_CACHE_TTL_SECONDS` no request is made at all; past it the
+        snapshot is revalidated with `If-None-Match`/`If-Modified-Since`, and
+        a `304` — or a `200` whose body hashes the same — keeps the parsed
+        copy. The result is shared: treat it as read-only.
+
         The endpoint sometimes answers with a JSONP wrapper instead of plain
         JSON, hence the fallback unwrap.
         """
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/138.0.0.0 Safari/537.36"
+        with _COMPETITION_LOCK:
+            cached = _COMPETITION_CACHE.get(url)
+            now = time.monotonic()
+            if (
+                cached is not None
+                and now - cached.fetched_at < COMPETITION_CACHE_TTL_SECONDS
+            ):
+                logger.info("Competition data served from cache.", extra={"url": url})
+                return cached.data
+
+            headers = {"User-Agent": _BROWSER_USER_AGENT}
+            if cached is not None and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached is not None and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+            response = http.get(url, headers=headers, timeout=30)
+
+            if cached is not None and response.status_code == 304:
+                cached.fetched_at = now
+                logger.info("Competition data not modified.", extra={"url": url})
+                return cached.data
+            response.raise_for_status()
+
+            digest = hashlib.sha256(response.content).hexdigest()
+            if cached is not None and cached.digest == digest:
+                cached.fetched_at = now
+                logger.info("Competition data unchanged.", extra={"url": url})
+                return cached.data
+
+            data = _parse_competition_payload(response.text)
+            _COMPETITION_CACHE[url] = _CompetitionSnapshot(
+                data=data,
+                digest=digest,
+                fetched_at=now,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
             )
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        try:
-            data = response.json()
-        except json.JSONDecodeError:
-            json_str = re.search(
-                r"^\s*jsonp_\d+\((.*)\)\s*$", response.text, re.DOTALL
-            ).group(1)
-            data = json.loads(json_str)
-        return data.get("data", {}) or {}
+            return data
 
     @staticmethod
     def _build_teams_map(data: dict) -> dict:
@@ -366,7 +578,8 @@ class BiwengerClient:
 
         Callers that need both would otherwise pull the same ~550-player
         payload twice. The endpoint is public, so this needs no session —
-        hence a classmethod, callable without authenticating.
+        hence a classmethod, callable without authenticating. Repeated calls
+        within the cache TTL share that download too.
         """
         logger.info("Downloading Biwenger competition data...")
         data = cls._fetch_competition_data(all_players_data_url)
@@ -381,6 +594,35 @@ class BiwengerClient:
         response.raise_for_status()
         return (response.json().get("data") or {}).get("players", [])
 
+    def get_manager_squads(
+        self,
+        manager_squad_url_template: str,
+        manager_ids,
+        max_workers: int = MAX_CONCURRENT_REQUESTS,
+    ) -> dict:
+        """Returns `{manager_id: squad}`, reading the squads concurrently.
+
+        At most `max_workers` reads are in flight, each through
+        `retry_http_request`, so a transient 5xx on one manager retries
+        that manager alone. The result keeps the order of `manager_ids`; any
+        read that still fails raises, exactly as the serial loop did.
+        """
+        ids = list(manager_ids)
+        if not ids:
+            return {}
+
+        def fetch(manager_id):
+            url = manager_squad_url_template.format(manager_id=manager_id)
+            response = retry_http_request(
+                lambda: self.session.get(url, timeout=30), label="squad GET"
+            )
+            return (response.json().get("data") or {}).get("players", [])
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as pool:
+            squads = list(pool.map(fetch, ids))
+        logger.info("Squads fetched.", extra={"count": len(ids)})
+        return dict(zip(ids, squads))
+
     def get_market_players(self, market_url: str) -> list:
         """Returns the players currently on the transfer market."""
         logger.info("Fetching market players...")
@@ -758,26 +1000,42 @@ class BiwengerClient:
         `limit`/`offset`. Returns `{"data": [...]}` to keep parity with the
         single-page response shape.
         """
-        all_entries: list = []
+        all_entries = self._paginate(
+            self.get_clausulazos, base_url, limit, label="Clausulazos"
+        )
+        logger.info("All clausulazos fetched.", extra={"total": len(all_entries)})
+        return {"data": all_entries}
+
+    def iter_clausulazos(
+        self, base_url: str, since: float, limit: int = DEFAULT_PAGE_LIMIT
+    ) -> Iterator[dict]:
+        """Clausulazo entries dated `since` (epoch seconds) or later.
+
+        The board is served newest first, so pages are read one at a time
+        and the first page reaching past the cutoff is the last one: a
+        recent window costs a request or two however long the season's
+        history has grown. Older entries on that page are skipped, not
+        yielded.
+        """
         offset = 0
         while True:
-            url = f"{base_url}&limit={limit}&offset={offset}"
-            data = self.get_clausulazos(url)
-            entries = data.get("data", [])
+            data = self.get_clausulazos(f"{base_url}&limit={limit}&offset={offset}")
+            entries = data.get("data", []) or []
             if isinstance(entries, dict):
                 entries = list(entries.values())
             logger.info(
                 "Clausulazos page fetched.",
-                extra={"offset": offset, "count": len(entries)},
+                extra={"offset": offset, "count": len(entries), "since": since},
             )
-            if not entries:
-                break
-            all_entries.extend(entries)
+            reached_cutoff = False
+            for entry in entries:
+                if (entry.get("date") or 0) < since:
+                    reached_cutoff = True
+                    continue
+                yield entry
+            if reached_cutoff or len(entries) < limit:
+                return
             offset += limit
-            if len(entries) < limit:
-                break
-        logger.info("All clausulazos fetched.", extra={"total": len(all_entries)})
-        return {"data": all_entries}
 
     def set_lineup(
         self,
@@ -824,3 +1082,39 @@ class BiwengerClient:
             extra={"formation": formation, "captain": captain},
         )
         return response.json()
+
+
+# Process-wide authenticated clients, one per account + league. Logging in is
+# two requests (`/auth/login` + `/account`) against the rate budget the whole
+# league shares, so a long-lived service builds the client once and lets the
+# 401 hook refresh its token. `requests.Session` pools its connections and is
+# shared by gunicorn's request threads.
+_SHARED_CLIENTS: dict[tuple[str, str, str, str], BiwengerClient] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+def get_shared_client(
+    email: str,
+    password: str,
+    login_url: str,
+    account_url: str,
+    league_id: Union[str, int],
+) -> BiwengerClient:
+    """The instance's authenticated client for these credentials.
+
+    The first caller logs in; everyone after reuses the session and its
+    bearer token. A failed login caches nothing, so the next call retries.
+    """
+    key = (email, login_url, account_url, str(league_id))
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(key)
+        if client is None or client.password != password:
+            client = BiwengerClient(email, password, login_url, account_url, league_id)
+            _SHARED_CLIENTS[key] = client
+        return client
+
+
+def reset_shared_clients() -> None:
+    """Forget every shared client so the next call logs in from scratch."""
+    with _SHARED_CLIENTS_LOCK:
+        _SHARED_CLIENTS.clear()
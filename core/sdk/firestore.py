@@ -17,10 +17,17 @@ number of path segments for a collection reference; the helpers below do not
 validate that — callers build the paths.
 """
 
+import hashlib
+import json
 import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from typing import Any, Callable, Iterable, Iterator, Optional
 
+from google.api_core import exceptions as gexc
 from google.cloud import firestore
+from google.cloud.firestore_v1.bulk_batch import BulkWriteBatch
 
 from core.utils import get_logger
 
@@ -29,6 +36,26 @@ logger = get_logger(__name__)
 # Firestore caps a single WriteBatch at 500 operations.
 _BATCH_LIMIT = 500
 
+# Batch commits `bulk_write` keeps in flight at once. Each commit is a round
+# trip of tens of milliseconds that the server mostly spends waiting, so a
+# few in parallel turn a latency-bound rewrite into a throughput-bound one.
+BULK_MAX_IN_FLIGHT = 4
+
+# Backoff (seconds) before each retry of the ops a commit could not apply.
+BULK_BACKOFFS: tuple[float, ...] = (1, 2, 4)
+
+# gRPC codes worth retrying: DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED,
+# INTERNAL, UNAVAILABLE. Anything else (a bad path, a permission) will fail
+# the same way again.
+_RETRYABLE_CODES = frozenset({4, 8, 10, 13, 14})
+_RETRYABLE_ERRORS = (
+    gexc.DeadlineExceeded,
+    gexc.ResourceExhausted,
+    gexc.Aborted,
+    gexc.InternalServerError,
+    gexc.ServiceUnavailable,
+)
+
 _client: Optional[firestore.Client] = None
 
 
@@ -109,32 +136,252 @@ def count(collection_path: str) -> int:
     return int(result[0][0].value)
 
 
-def batch_write(collection_path: str, docs: Iterable[tuple[str, dict]]) -> int:
-    """Bulk-write ``(doc_id, data)`` pairs, chunked under the 500-op batch cap.
+class BulkWriteError(RuntimeError):
+    """Raised when some writes of a bulk operation could not be applied."""
 
-    Each write is a ``set`` (full overwrite), so re-running with the same doc
-    ids is idempotent. Returns the number of documents written.
+    def __init__(self, collection_path: str, failed: dict[str, str]):
+        super().__init__(
+            f"{len(failed)} write(s) to {collection_path} failed: "
+            + ", ".join(sorted(failed)[:10])
+        )
+        self.failed = failed
+
+
+@dataclass
+class BulkWriteResult:
+    """Outcome of `bulk_write`: what landed, what did not, and how fast."""
+
+    written: int = 0
+    # doc_id -> last error, for the ops that ran out of retries.
+    failed: dict[str, str] = field(default_factory=dict)
+    commits: int = 0
+    retries: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def docs_per_second(self) -> float:
+        return self.written / self.elapsed_s if self.elapsed_s else 0.0
+
+
+def _commit_chunk(
+    client, collection, chunk: list[tuple[str, Optional[dict]]]
+) -> list[Optional[tuple[str, bool]]]:
+    """Commit one chunk as a non-atomic batch; one entry per op.
+
+    ``None`` means the op was applied; otherwise ``(error, retryable)``.
+    Unlike a ``WriteBatch``, a ``BulkWriteBatch`` reports every write on its
+    own, so one rejected document does not sink the other 499.
+    """
+    batch = BulkWriteBatch(client)
+    for doc_id, data in chunk:
+        ref = collection.document(doc_id)
+        if data is None:
+            batch.delete(ref)
+        else:
+            batch.set(ref, data)
+    try:
+        response = batch.commit()
+    except _RETRYABLE_ERRORS as exc:
+        return [(str(exc), True)] * len(chunk)
+    except gexc.GoogleAPICallError as exc:
+        return [(str(exc), False)] * len(chunk)
+    return [
+        None if status.code == 0 else (status.message, status.code in _RETRYABLE_CODES)
+        for status in response.status
+    ]
+
+
+def _write_chunk(
+    client, collection, chunk: list[tuple[str, Optional[dict]]], backoffs
+) -> BulkWriteResult:
+    """Commit a chunk, re-sending only the ops that failed transiently."""
+    result = BulkWriteResult()
+    pending = chunk
+    for attempt, backoff in enumerate((0,) + tuple(backoffs)):
+        if attempt:
+            result.retries += len(pending)
+            time.sleep(backoff)
+        outcomes = _commit_chunk(client, collection, pending)
+        result.commits += 1
+        retry = []
+        for (doc_id, data), outcome in zip(pending, outcomes):
+            if outcome is None:
+                result.written += 1
+                result.failed.pop(doc_id, None)
+                continue
+            error, retryable = outcome
+            result.failed[doc_id] = error
+            if retryable:
+                retry.append((doc_id, data))
+        pending = retry
+        if not pending:
+            break
+    return result
+
+
+def _chunks(
+    ops: Iterable[tuple[str, Optional[dict]]],
+) -> Iterator[list[tuple[str, Optional[dict]]]]:
+    """Cut ``ops`` into batches under the cap.
+
+    A bulk batch may not touch the same document twice (its writes apply in
+    no particular order), so a repeated id also starts a new chunk; `bulk_write`
+    then keeps the two chunks from being in flight together.
+    """
+    chunk: list[tuple[str, Optional[dict]]] = []
+    ids: set[str] = set()
+    for doc_id, data in ops:
+        if len(chunk) >= _BATCH_LIMIT or doc_id in ids:
+            yield chunk
+            chunk, ids = [], set()
+        chunk.append((doc_id, data))
+        ids.add(doc_id)
+    if chunk:
+        yield chunk
+
+
+def bulk_write(
+    collection_path: str,
+    ops: Iterable[tuple[str, Optional[dict]]],
+    max_in_flight: int = BULK_MAX_IN_FLIGHT,
+    backoffs: tuple[float, ...] = BULK_BACKOFFS,
+) -> BulkWriteResult:
+    """Apply ``(doc_id, data)`` ops with several batch commits in flight.
+
+    ``data`` is a full-overwrite ``set``; ``None`` deletes the document.
+    ``ops`` is consumed lazily, so a generator over a large collection is
+    never held in memory beyond the batches in flight.
+
+    Ops on the same document apply in the order given: the later one waits
+    until the commit (and retries) of the earlier one is over.
+
+    Batches are not atomic: each op succeeds or fails on its own, and the
+    ones that fail transiently are re-sent alone after a backoff. Ops that
+    still fail are reported in ``failed`` rather than raised — callers that
+    need all-or-nothing raise `BulkWriteError` themselves.
     """
     client = get_client()
     collection = client.collection(collection_path)
-    written = 0
-    batch = client.batch()
-    pending = 0
-    for doc_id, data in docs:
-        batch.set(collection.document(doc_id), data)
-        pending += 1
-        written += 1
-        if pending >= _BATCH_LIMIT:
-            batch.commit()
-            batch = client.batch()
-            pending = 0
-    if pending:
-        batch.commit()
+    result = BulkWriteResult()
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        # Future -> the doc ids its chunk writes, retries included.
+        in_flight: dict = {}
+
+        def _settle(futures) -> None:
+            wait(futures)
+            for future in futures:
+                part = future.result()
+                # An op that landed clears the failure of an earlier op on
+                # the same document.
+                for doc_id in in_flight.pop(future) - part.failed.keys():
+                    result.failed.pop(doc_id, None)
+                result.written += part.written
+                result.failed.update(part.failed)
+                result.commits += part.commits
+                result.retries += part.retries
+
+        for chunk in _chunks(ops):
+            ids = {doc_id for doc_id, _ in chunk}
+            # A chunk that writes a document an earlier one is still writing
+            # waits for it, so the later op is the one that lands.
+            _settle([f for f, busy in in_flight.items() if not busy.isdisjoint(ids)])
+            if len(in_flight) >= max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                _settle(done)
+            future = pool.submit(_write_chunk, client, collection, chunk, backoffs)
+            in_flight[future] = ids
+        _settle(list(in_flight))
+
+    result.elapsed_s = time.monotonic() - started
+    log = logger.warning if result.failed else logger.info
+    log(
+        "Bulk write finished.",
+        extra={
+            "collection": collection_path,
+            "written": result.written,
+            "failed": len(result.failed),
+            "commits": result.commits,
+            "retries": result.retries,
+            "elapsed_s": round(result.elapsed_s, 3),
+            "docs_per_s": round(result.docs_per_second, 1),
+        },
+    )
+    return result
+
+
+def _bulk_write_or_raise(
+    collection_path: str, ops: Iterable[tuple[str, Optional[dict]]]
+) -> int:
+    """`bulk_write` that raises `BulkWriteError` if any op failed for good."""
+    result = bulk_write(collection_path, ops)
+    if result.failed:
+        raise BulkWriteError(collection_path, result.failed)
+    return result.written
+
+
+def batch_write(collection_path: str, docs: Iterable[tuple[str, dict]]) -> int:
+    """Bulk-write ``(doc_id, data)`` pairs through `bulk_write`.
+
+    Each write is a ``set`` (full overwrite), so re-running with the same doc
+    ids is idempotent. Returns the number of documents written; raises
+    `BulkWriteError` if any of them could not be.
+    """
+    return _bulk_write_or_raise(collection_path, docs)
+
+
+def content_hash(data: dict) -> str:
+    """Stable fingerprint of a document body, independent of key order.
+
+    ``default=str`` covers the non-JSON types Firestore hands back
+    (timestamps), so a stored document and the dict it was written from hash
+    the same.
+    """
+    raw = json.dumps(data, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def sync_collection(
+    collection_path: str, docs: Iterable[tuple[str, dict]]
+) -> dict[str, int]:
+    """Make a collection hold exactly ``docs``, writing only the difference.
+
+    Reads what is stored, compares it to ``docs`` by doc id and
+    ``content_hash``, and commits just the creates, updates and deletes
+    through `bulk_write`. A document gone from ``docs`` is
+    deleted, so removals upstream still propagate, but a run that changes two
+    documents costs two writes instead of a wipe and a rewrite of them all.
+
+    Returns the counts per outcome: ``created``, ``updated``, ``deleted`` and
+    ``unchanged``.
+    """
+    desired = dict(docs)
+    stored = {
+        doc_id: content_hash(data) for doc_id, data in list_documents(collection_path)
+    }
+    counts = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    writes: list[tuple[str, Optional[dict]]] = []
+    for doc_id, data in desired.items():
+        if doc_id not in stored:
+            counts["created"] += 1
+        elif stored[doc_id] != content_hash(data):
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        writes.append((doc_id, data))
+    for doc_id in stored.keys() - desired.keys():
+        counts["deleted"] += 1
+        writes.append((doc_id, None))
+
+    if writes:
+        _bulk_write_or_raise(collection_path, writes)
+    # `created` is a reserved LogRecord attribute, hence the nesting.
     logger.info(
-        "Batch write committed.",
-        extra={"collection": collection_path, "count": written},
+        "Collection synced.", extra={"collection": collection_path, "counts": counts}
     )
-    return written
+    return counts
 
 
 def run_transaction(fn: Callable[[firestore.Transaction], Any]) -> Any:
@@ -154,24 +401,61 @@ def run_transaction(fn: Callable[[firestore.Transaction], Any]) -> Any:
     return _run(transaction)
 
 
-def delete_collection(collection_path: str, page_size: int = _BATCH_LIMIT) -> int:
+class WindowCounter:
+    """A request budget every instance draws on: at most `limit` permits per
+    `window_seconds`, counted in one document.
+
+    The `shared` side of `core.sdk.http.TokenBucket`. `lease(n)` takes `n`
+    permits in a transaction and returns 0, or — when the window cannot spare
+    them — the seconds until the next one opens. One transaction per lease,
+    so buckets lease a burst at a time rather than a request at a time. The
+    document is `{"window": <window number>, "count": <permits taken>}`;
+    windows are numbered off the wall clock, which every instance shares.
+    """
+
+    def __init__(
+        self,
+        collection_path: str,
+        doc_id: str,
+        limit: int,
+        window_seconds: float = 60,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.collection_path = collection_path
+        self.doc_id = doc_id
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self._clock = clock
+
+    def lease(self, n: int) -> float:
+        if n > self.limit:
+            raise ValueError(f"cannot lease {n} of a {self.limit}-permit window")
+        now = self._clock()
+        window = int(now // self.window_seconds)
+        ref = get_client().collection(self.collection_path).document(self.doc_id)
+
+        def take(transaction) -> float:
+            snapshot = ref.get(transaction=transaction)
+            data = (snapshot.to_dict() or {}) if snapshot.exists else {}
+            used = data.get("count", 0) if data.get("window") == window else 0
+            if used + n > self.limit:
+                return (window + 1) * self.window_seconds - now
+            transaction.set(ref, {"window": window, "count": used + n})
+            return 0.0
+
+        return run_transaction(take)
+
+
+def delete_collection(collection_path: str) -> int:
     """Delete every document in a collection. Returns the number deleted.
 
-    Used by tests and to make the backfill safely re-runnable. Note this does
-    not recurse into subcollections — Firestore keeps those independent.
+    Used by tests and to make the backfill safely re-runnable. One id-only
+    stream feeds `bulk_write` deletes, instead of re-querying a page and
+    waiting on its commit before asking for the next. Note this does not
+    recurse into subcollections — Firestore keeps those independent.
     """
-    client = get_client()
-    collection = client.collection(collection_path)
-    deleted = 0
-    while True:
-        snapshots = list(collection.limit(page_size).stream())
-        if not snapshots:
-            break
-        batch = client.batch()
-        for snapshot in snapshots:
-            batch.delete(snapshot.reference)
-        batch.commit()
-        deleted += len(snapshots)
-        if len(snapshots) < page_size:
-            break
-    return deleted
+    collection = get_client().collection(collection_path)
+    return _bulk_write_or_raise(
+        collection_path,
+        ((snap.id, None) for snap in collection.select([]).stream()),
+    )
@@ -4,14 +4,24 @@ Deliberate: the google-genai SDK would add a dependency (and a python-base
 image rebuild) for what is a single POST. Same philosophy as
 `core/sdk/biwenger.py`. Structured output via `responseSchema` guarantees
 parseable JSON back.
+
+Both calls take an optional `cache` — a `DiskCache` or `GcsCache`, or
+`cache_from_url("...")` — that answers a byte-identical request from a
+stored earlier success instead of the model (see "Response cache" below).
 """
 
 import base64
+import hashlib
 import json
+import os
+import threading
 import time
+from pathlib import Path
+from urllib.parse import quote
 
 import requests
 
+from core.sdk import http
 from core.utils import get_logger
 
 logger = get_logger(__name__)
@@ -36,18 +46,180 @@ class GeminiError(Exception):
         self.status_code = status_code
 
 
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+#
+# The same label gets read more than once: a form resubmitted, an audit
+# `--fix` pass over labels already read, a studio re-run on the photo it
+# started from. The model's answer to identical bytes is as good the second
+# time, so a successful response is stored under a hash of everything that
+# shapes it — model, prompt, schema or output kind, and the image — and a
+# repeat is answered from the store in milliseconds without spending quota.
+# Failures are never stored: a 429 or a blocked generation must be retried.
+
+
+def cache_key(
+    kind: str,
+    model: str,
+    prompt: str,
+    schema: dict | None,
+    image_bytes: bytes | None,
+    image_mime: str,
+) -> str:
+    """Content address of one request: sha256 over `(kind, model, prompt
+    hash, schema hash, image mime, image sha256)`."""
+
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    parts = [
+        kind,
+        model,
+        digest(prompt.encode()),
+        digest(json.dumps(schema, sort_keys=True).encode()),
+        image_mime,
+        digest(image_bytes or b""),
+    ]
+    return digest("\n".join(parts).encode())
+
+
+class DiskCache:
+    """Responses as files in `directory`, least recently used evicted past
+    `max_bytes`. A hit refreshes the file's mtime, which is the LRU order.
+    Writes go through a temp file and a rename, so a reader in another
+    process never sees half a response."""
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = 256 << 20):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        path = self.directory / key
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.directory / f".{key}.{os.getpid()}.{threading.get_ident()}"
+            tmp.write_bytes(data)
+            os.replace(tmp, self.directory / key)
+            with self._lock:
+                self._evict()
+        except OSError as exc:
+            logger.warning("Gemini cache not written.", extra={"error": str(exc)})
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.iterdir():
+            if path.name.startswith("."):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # evicted by another process meanwhile
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+class GcsCache:
+    """Responses as objects under `prefix` in a GCS bucket, through the JSON
+    API with Application Default Credentials — shared by every instance and
+    by the local audit scripts.
+
+    Eviction is the bucket's: give the prefix a lifecycle rule (delete after
+    N days). Storage errors read as a miss and a skipped write; the cache
+    must never be why a model call fails.
+    """
+
+    _API = "https://storage.googleapis.com"
+
+    def __init__(self, bucket: str, prefix: str = "gemini-cache/"):
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _auth_header(self) -> dict:
+        # Imported here so callers without a GCS cache do not need google-auth.
+        import google.auth
+        import google.auth.transport.requests
+
+        credentials, _ = google.auth.default(
+            scopes=["https://www.googleapis.com/auth/devstorage.read_write"]
+        )
+        credentials.refresh(google.auth.transport.requests.Request())
+        return {"Authorization": f"Bearer {credentials.token}"}
+
+    def get(self, key: str) -> bytes | None:
+        name = quote(self.prefix + key, safe="")
+        try:
+            response = http.get(
+                f"{self._API}/storage/v1/b/{self.bucket}/o/{name}",
+                params={"alt": "media"},
+                headers=self._auth_header(),
+                timeout=10,
+            )
+        except Exception as exc:
+            logger.warning("Gemini cache unreadable.", extra={"error": str(exc)})
+            return None
+        return response.content if response.status_code == 200 else None
+
+    def put(self, key: str, data: bytes) -> None:
+        try:
+            response = http.post(
+                f"{self._API}/upload/storage/v1/b/{self.bucket}/o",
+                params={"uploadType": "media", "name": self.prefix + key},
+                headers={
+                    **self._auth_header(),
+                    "Content-Type": "application/octet-stream",
+                },
+                data=data,
+                timeout=30,
+            )
+            response.raise_for_status()
+        except Exception as exc:
+            logger.warning("Gemini cache not written.", extra={"error": str(exc)})
+
+
+def cache_from_url(url: str, max_bytes: int = 256 << 20):
+    """`"gs://bucket/prefix/"` → `GcsCache`, a path → `DiskCache`, `""` → None."""
+    if not url:
+        return None
+    if url.startswith("gs://"):
+        bucket, _, prefix = url[len("gs://") :].partition("/")
+        return GcsCache(bucket, prefix)
+    return DiskCache(url, max_bytes=max_bytes)
+
+
+def _cached(cache, key: str, model: str) -> bytes | None:
+    if cache is None:
+        return None
+    data = cache.get(key)
+    if data is not None:
+        logger.info("Gemini cache hit.", extra={"model": model, "key": key[:12]})
+    return data
+
+
 def _post_with_retry(
     url: str, api_key: str, payload: dict, timeout: int, retries: int
 ) -> requests.Response:
     """POST, resending on a 429/503 (transient overload) up to `retries` times."""
-    response = requests.post(
-        url, params={"key": api_key}, json=payload, timeout=timeout
-    )
+    response = http.post(url, params={"key": api_key}, json=payload, timeout=timeout)
     for _ in range(retries):
         if response.status_code not in _RETRYABLE_STATUS:
             break
         time.sleep(_RETRY_BACKOFF_SECONDS)
-        response = requests.post(
+        response = http.post(
             url, params={"key": api_key}, json=payload, timeout=timeout
         )
     return response
@@ -62,6 +234,7 @@ def generate_json(
     model: str = DEFAULT_MODEL,
     timeout: int = 45,
     retries: int = 0,
+    cache=None,
 ) -> dict:
     """One-shot structured generation: prompt (+ optional image) → dict.
 
@@ -69,8 +242,14 @@ def generate_json(
     propagate as `requests.RequestException` so callers can distinguish
     "Gemini said no" from "the wire broke". `retries` resends the request
     on a 429/503 (transient overload) before giving up — 0 by default so
-    existing callers keep their current latency.
+    existing callers keep their current latency. With a `cache`, an
+    identical earlier success is returned without calling the model.
     """
+    key = cache_key("json", model, prompt, schema, image_bytes, image_mime)
+    hit = _cached(cache, key, model)
+    if hit is not None:
+        return json.loads(hit)
+
     parts: list[dict] = [{"text": prompt}]
     if image_bytes is not None:
         parts.append(
@@ -99,9 +278,12 @@ def generate_json(
         )
     try:
         text = response.json()["candidates"][0]["content"]["parts"][0]["text"]
-        return json.loads(text)
+        result = json.loads(text)
     except (KeyError, IndexError, TypeError, json.JSONDecodeError) as exc:
         raise GeminiError(f"Unparseable Gemini response: {exc}") from exc
+    if cache is not None:
+        cache.put(key, json.dumps(result).encode())
+    return result
 
 
 def generate_image(
@@ -112,10 +294,16 @@ def generate_image(
     model: str = DEFAULT_IMAGE_MODEL,
     timeout: int = 90,
     retries: int = 0,
+    cache=None,
 ) -> bytes:
     """Image-editing call: prompt + source image → edited image bytes.
 
-    Same error contract as `generate_json`."""
+    Same error contract and `cache` as `generate_json`."""
+    key = cache_key("image", model, prompt, None, image_bytes, image_mime)
+    hit = _cached(cache, key, model)
+    if hit is not None:
+        return hit
+
     response = _post_with_retry(
         f"{GEMINI_API_BASE}/models/{model}:generateContent",
         api_key,
@@ -156,13 +344,19 @@ def generate_image(
                 f"(finishReason={candidate.get('finishReason')!r}, "
                 f"promptFeedback={data.get('promptFeedback')!r})"
             )
+        image = None
         for part in content["parts"]:
             blob = part.get("inlineData") or part.get("inline_data")
             if blob and blob.get("data"):
-                return base64.b64decode(blob["data"])
-        raise GeminiError(
-            "Gemini returned no image part "
-            f"(finishReason={candidate.get('finishReason')!r})"
-        )
+                image = base64.b64decode(blob["data"])
+                break
+        if image is None:
+            raise GeminiError(
+                "Gemini returned no image part "
+                f"(finishReason={candidate.get('finishReason')!r})"
+            )
     except (KeyError, IndexError, TypeError, ValueError) as exc:
         raise GeminiError(f"Unparseable Gemini image response: {exc}") from exc
+    if cache is not None:
+        cache.put(key, image)
+    return image
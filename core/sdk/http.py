@@ -1,12 +1,29 @@
 """HTTP utilities shared by SDK clients.
 
 `retry_http_request` retries on network errors + 5xx, fails fast on 4xx.
+
+`get`/`post`/`request` go through `session_for(url)`: one pooled
+`requests.Session` per host, kept for the life of the process. A bare
+`requests.get` opens a fresh connection — DNS, TCP and TLS again — on
+every call; a pooled session keeps the connection alive, so only the first
+call to a host pays for the handshake. Every request also gets
+`DEFAULT_TIMEOUT` unless it passes its own, so a forgotten timeout can no
+longer hang a worker.
+
+`rate_limit(url, rate, burst)` holds a host's outbound requests to a token
+bucket, optionally shared between instances; pooled sessions wait on it
+before every send, retries and fan-outs included.
 """
 
+import http.cookiejar
+import os
+import threading
 import time
 from typing import Callable, Tuple
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from core.utils import get_logger
 
@@ -17,6 +34,205 @@ logger = get_logger(__name__)
 # bot's 10 min api timeout. Override per-call when needed.
 DEFAULT_BACKOFFS: Tuple[int, ...] = (2, 5, 10)
 
+# (connect, read) seconds, for calls that pass no timeout of their own.
+DEFAULT_TIMEOUT: Tuple[float, float] = (5, 30)
+
+# Connections kept open per host. urllib3 opens more under a burst and
+# discards the extra afterwards, so this bounds what is kept, not what runs.
+# Sized for a gunicorn worker's threads plus the pools that fan out from it.
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+
+class TokenBucket:
+    """`rate` requests a second on average, in bursts of up to `burst`.
+
+    `acquire` reserves a token and sleeps outside the lock until it is due,
+    so concurrent callers queue up rather than overshoot — the scheme of
+    telegram's `ChatRateLimiter`, for a whole host instead of one chat.
+
+    A bucket only sees its own process. With `shared`, it also leases its
+    permits, `burst` at a time, from a budget every instance draws on:
+    `shared.lease(n)` returns 0 when granted, or the seconds until the budget
+    has room (see `core.sdk.firestore.WindowCounter`). A shared store that
+    fails is logged and the block granted locally — the local bucket still
+    holds, and the outage costs one attempt per block, not one per request.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        *,
+        shared=None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.shared = shared
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last = clock()
+        self._lease_lock = threading.Lock()
+        self._leased = 0
+
+    def acquire(self) -> float:
+        """Wait for the next request slot. Returns the seconds waited."""
+        waited = self._lease() if self.shared is not None else 0.0
+        with self._lock:
+            now = self._clock()
+            tokens = min(
+                float(self.burst), self._tokens + (now - self._last) * self.rate
+            )
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            # Going negative is the reservation: the next caller's wait
+            # counts from after this one's.
+            self._tokens, self._last = tokens - 1, now
+        if wait:
+            self._sleep(wait)
+        return waited + wait
+
+    def _lease(self) -> float:
+        waited = 0.0
+        with self._lease_lock:
+            while self._leased <= 0:
+                try:
+                    wait = self.shared.lease(self.burst)
+                except Exception as exc:
+                    logger.warning(
+                        "Shared rate budget unavailable; limiting locally.",
+                        extra={"error": str(exc)},
+                    )
+                    wait = 0.0
+                if not wait:
+                    self._leased = self.burst
+                    break
+                self._sleep(wait)
+                waited += wait
+            self._leased -= 1
+        return waited
+
+
+# host → bucket, consulted by every pooled session before it sends.
+_limits: dict[str, TokenBucket] = {}
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc or url
+
+
+def rate_limit(url: str, rate: float, burst: int, shared=None) -> TokenBucket:
+    """Hold every pooled request to `url`'s host to a token bucket, replacing
+    any bucket the host had."""
+    bucket = TokenBucket(rate, burst, shared=shared)
+    _limits[_host(url)] = bucket
+    return bucket
+
+
+def limiter_for(url: str) -> TokenBucket | None:
+    return _limits.get(_host(url))
+
+
+class _PooledAdapter(HTTPAdapter):
+    """`HTTPAdapter` that fills in a default timeout and waits on the host's
+    `rate_limit` bucket, if it has one."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        if timeout is None:
+            timeout = self.timeout
+        bucket = _limits.get(_host(request.url))
+        if bucket is not None:
+            waited = bucket.acquire()
+            if waited >= 1:
+                logger.info(
+                    "Request held by the rate limit.",
+                    extra={"host": _host(request.url), "waited_s": round(waited, 2)},
+                )
+        return super().send(request, timeout=timeout, **kwargs)
+
+
+class _NoCookies(http.cookiejar.DefaultCookiePolicy):
+    def set_ok(self, cookie, request):
+        return False
+
+
+def pooled_session(
+    timeout=DEFAULT_TIMEOUT, pool_maxsize: int | None = None
+) -> requests.Session:
+    """A new `requests.Session` with the tuned pool and default timeout, for
+    clients that keep state of their own (auth headers, cookies, hooks)."""
+    session = requests.Session()
+    adapter = _PooledAdapter(
+        timeout=timeout,
+        pool_connections=4,
+        pool_maxsize=pool_maxsize or POOL_MAXSIZE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_pid = os.getpid()
+_sessions_lock = threading.Lock()
+
+
+def session_for(url: str) -> requests.Session:
+    """The process's shared session for `url`'s host.
+
+    Shared by every caller, so it stores no cookies: one caller's state
+    must not ride along on another's request. Created on first use and
+    dropped in a forked child — gunicorn forks after import, and a socket
+    inherited from the parent would be shared by two processes.
+    """
+    global _sessions_pid
+    host = _host(url)
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = pooled_session()
+            session.cookies.set_policy(_NoCookies())
+        return session
+
+
+def reset_sessions() -> None:
+    """Close and forget every shared session. Tests and benchmarks only."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """`requests.request` over the host's shared session."""
+    return session_for(url).request(method, url, **kwargs)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("allow_redirects", False)  # as `requests.head`
+    return request("HEAD", url, **kwargs)
+
+
+def delete(url: str, **kwargs) -> requests.Response:
+    return request("DELETE", url, **kwargs)
+
 
 def retry_http_request(
     request_fn: Callable[[], requests.Response],
@@ -15,12 +15,21 @@ has its own `updated_at` inside the batch. Sampling 5 players covers
 the case where the top one by `priceIncrement DESC` happens to be a
 no-op in the latest refresh (the failure mode that single-player
 probing exhibited).
+
+With `persistent=True` a second tier sits behind the in-process one: the
+last full payload, compressed, in a Firestore document shared by every
+instance. A cold instance validates it with the same probe and skips the
+full fetch whenever another instance already paid for this snapshot.
 """
 
+import json
+import zlib
+from datetime import datetime, timezone
 from typing import Optional
 
 import requests
 
+from core.sdk import firestore, http
 from core.utils import get_logger
 
 logger = get_logger(__name__)
@@ -32,11 +41,16 @@ JP_HEADERS = {
 }
 
 # In-process cache. `(competition, score_type) → (updated_at, players)`. Lives
-# per Cloud Run instance — losing it on cold start is fine, and not sharing
-# across instances just means two instances may each pay one full fetch per
-# JP refresh (a couple of seconds for a single-user league).
+# per Cloud Run instance; the persistent tier below is what survives a cold
+# start and is shared between instances.
 _CACHE: dict[tuple[int, int], tuple[Optional[int], list[dict]]] = {}
 
+# Persistent tier: one document per `(competition, score_type)`, holding the
+# fingerprint and the zlib-compressed JSON payload (~549 players compress to a
+# small fraction of Firestore's 1 MiB document cap; bigger ones are not kept).
+PERSISTED_COLLECTION = "jp_cache"
+_PERSISTED_MAX_BYTES = 900_000
+
 
 def _build_params(
     auth_token: str,
@@ -110,7 +124,7 @@ def _peek_fingerprint(
     params = _build_params(auth_token, competition, score_type)
     params["limit"] = str(_PROBE_SAMPLE_SIZE)
     try:
-        response = requests.get(JP_URL, headers=JP_HEADERS, params=params, timeout=10)
+        response = http.get(JP_URL, headers=JP_HEADERS, params=params, timeout=10)
         response.raise_for_status()
         players = response.json().get("players") or []
     except (requests.RequestException, ValueError):
@@ -118,10 +132,68 @@ def _peek_fingerprint(
     return _max_updated_at(players, score_type)
 
 
+def _persisted_doc_id(competition: int, score_type: int) -> str:
+    return f"{competition}-{score_type}"
+
+
+def _load_persisted(
+    competition: int, score_type: int
+) -> Optional[tuple[int, list[dict]]]:
+    """`(fingerprint, players)` from the persistent tier, or None.
+
+    Any failure — no document, no credentials, a corrupt payload — is a
+    miss: the full fetch is always there to fall back on.
+    """
+    try:
+        doc = firestore.get_document(
+            PERSISTED_COLLECTION, _persisted_doc_id(competition, score_type)
+        )
+        if not doc or doc.get("fingerprint") is None:
+            return None
+        players = json.loads(zlib.decompress(doc["players"]))
+    except Exception as exc:
+        logger.warning("JP persistent cache unreadable.", extra={"error": str(exc)})
+        return None
+    return doc["fingerprint"], players
+
+
+def _persist(
+    competition: int, score_type: int, fingerprint: Optional[int], players: list
+) -> None:
+    """Store the payload for the next cold instance. Never raises."""
+    if fingerprint is None:
+        return  # nothing a later probe could validate it against
+    blob = zlib.compress(
+        json.dumps(players, separators=(",", ":")).encode("utf-8"), level=6
+    )
+    if len(blob) > _PERSISTED_MAX_BYTES:
+        logger.warning("JP payload too large to persist.", extra={"bytes": len(blob)})
+        return
+    try:
+        firestore.set_document(
+            PERSISTED_COLLECTION,
+            _persisted_doc_id(competition, score_type),
+            {
+                "fingerprint": fingerprint,
+                "players": blob,
+                "count": len(players),
+                "stored_at": datetime.now(timezone.utc),
+            },
+        )
+    except Exception as exc:
+        logger.warning("JP persistent cache not written.", extra={"error": str(exc)})
+        return
+    logger.info(
+        "JP players persisted.",
+        extra={"fingerprint": fingerprint, "bytes": len(blob)},
+    )
+
+
 def fetch_all_players(
     auth_token: str,
     competition: int = 1,
     score_type: int = 2,
+    persistent: bool = False,
 ) -> list[dict]:
     """Returns the full JP player list for the given competition + score type.
 
@@ -130,16 +202,24 @@ def fetch_all_players(
     cache, skips the probe — we'd fetch in full either way.
 
     Cache fingerprint is `max(updated_at)` across the probe sample; the
-    cached payload stores `max(updated_at)` across all ~549 players so
-    a strictly increasing snapshot triggers a refetch.
+    cached payload stores the same max over its own first
+    `_PROBE_SAMPLE_SIZE` players, so the two compare like for like and a
+    newer snapshot triggers a refetch.
+
+    With `persistent=True`, a miss in memory (cold or stale) consults the
+    Firestore tier before the full fetch, and a full fetch is written back
+    to it. The probe runs at most once per call either way.
     """
     cache_key = (competition, score_type)
     cached_entry = _CACHE.get(cache_key)
+    current_fingerprint = None
+    probed = False
 
     # Warm-cache path: probe for staleness with a cheap multi-player call.
     if cached_entry is not None:
         cached_fingerprint, cached_players = cached_entry
         current_fingerprint = _peek_fingerprint(auth_token, competition, score_type)
+        probed = True
         if (
             current_fingerprint is not None
             and cached_fingerprint == current_fingerprint
@@ -155,12 +235,37 @@ def fetch_all_players(
             )
             return cached_players
 
+    # Persistent path: another instance may already hold this snapshot. Read
+    # the document first so a cold instance with nothing stored pays no probe.
+    if persistent:
+        stored = _load_persisted(competition, score_type)
+        if stored is not None:
+            if not probed:
+                current_fingerprint = _peek_fingerprint(
+                    auth_token, competition, score_type
+                )
+            stored_fingerprint, stored_players = stored
+            if current_fingerprint is not None and (
+                stored_fingerprint == current_fingerprint
+            ):
+                _CACHE[cache_key] = stored
+                logger.info(
+                    "JP players served from the persistent cache.",
+                    extra={
+                        "competition": competition,
+                        "score_type": score_type,
+                        "count": len(stored_players),
+                        "fingerprint": stored_fingerprint,
+                    },
+                )
+                return stored_players
+
     logger.info(
         "Fetching JP players...",
         extra={"competition": competition, "score_type": score_type},
     )
     params = _build_params(auth_token, competition, score_type)
-    response = requests.get(JP_URL, headers=JP_HEADERS, params=params, timeout=30)
+    response = http.get(JP_URL, headers=JP_HEADERS, params=params, timeout=30)
     response.raise_for_status()
     payload = response.json()
     _raise_if_unhealthy(response.status_code, payload)
@@ -175,6 +280,8 @@ def fetch_all_players(
         "JP players fetched.",
         extra={"count": len(players), "fingerprint": fresh_fingerprint},
     )
+    if persistent:
+        _persist(competition, score_type, fresh_fingerprint, players)
     return players
 
 
@@ -204,7 +311,7 @@ def check_api_health(
     """Lanza RuntimeError si la API no responde o el token ha rotado."""
     params = {**_build_params(auth_token, competition, score_type), "limit": "1"}
     try:
-        response = requests.get(JP_URL, headers=JP_HEADERS, params=params, timeout=15)
+        response = http.get(JP_URL, headers=JP_HEADERS, params=params, timeout=15)
     except requests.RequestException as e:
         raise RuntimeError(f"JP API unreachable: {e}") from e
 
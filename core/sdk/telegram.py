@@ -1,8 +1,13 @@
 import hmac
-from typing import Any, Optional
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
 
 import requests
 
+from core.sdk import http
 from core.utils import get_logger
 
 logger = get_logger(__name__)
@@ -15,10 +20,107 @@ TELEGRAM_EDIT_MESSAGE_URL = "https://api.telegram.org/bot{token}/editMessageText
 TELEGRAM_EDIT_REPLY_MARKUP_URL = (
     "https://api.telegram.org/bot{token}/editMessageReplyMarkup"
 )
+TELEGRAM_SEND_PHOTO_URL = "https://api.telegram.org/bot{token}/sendPhoto"
+TELEGRAM_SEND_MEDIA_GROUP_URL = "https://api.telegram.org/bot{token}/sendMediaGroup"
 
 # Hard limit on Bot API sendMessage; anything longer is truncated server-side.
 TELEGRAM_MAX_MESSAGE_LENGTH = 4096
 
+# sendMediaGroup takes 2–10 items per album.
+TELEGRAM_MAX_MEDIA_GROUP = 10
+
+# A 429 asking for a longer pause than this is not retried: the caller's
+# fallback is better than a request parked for minutes.
+MAX_RETRY_AFTER_SECONDS = 30
+
+
+class ChatRateLimiter:
+    """Token bucket per chat, at the Bot API's documented send limits.
+
+    Telegram asks bots to stay under about one message a second in a private
+    chat and twenty a minute in a group (negative chat ids), tolerating short
+    bursts; past that it answers 429. Each chat gets a bucket of `burst`
+    tokens refilling at its rate, so the first few sends of a flow go out at
+    once and a long one settles at the limit — instead of sleeping a fixed
+    half-second after every photo whether or not the chat was busy.
+
+    `acquire` reserves a token and sleeps outside the lock until it is due,
+    so concurrent senders to one chat queue up rather than overshoot.
+    """
+
+    def __init__(
+        self,
+        private_rate: float = 1.0,
+        group_rate: float = 20 / 60,
+        burst: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.private_rate = private_rate
+        self.group_rate = group_rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def _rate(self, chat_id: str) -> float:
+        return self.group_rate if str(chat_id).startswith("-") else self.private_rate
+
+    def acquire(self, chat_id: str) -> float:
+        """Wait for `chat_id`'s next send slot. Returns the seconds waited."""
+        key = str(chat_id)
+        rate = self._rate(key)
+        with self._lock:
+            now = self._clock()
+            tokens, last = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / rate
+            # Going negative is the reservation: the next caller's wait
+            # counts from after this one's.
+            self._buckets[key] = (tokens - 1, now)
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+_limiter = ChatRateLimiter()
+
+
+def reset_rate_limits() -> None:
+    """Forget every chat's send history. Tests only."""
+    _limiter.reset()
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """The pause a 429 asks for, from `parameters.retry_after`."""
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _post_to_chat(url: str, chat_id: str, **kwargs) -> requests.Response:
+    """POST a send to `chat_id` once its rate allows, retrying a 429 once
+    after the pause Telegram asks for. Texts and photos share one bucket:
+    Telegram counts every message in the chat against the same limit."""
+    _limiter.acquire(chat_id)
+    response = http.post(url, **kwargs)
+    if response.status_code == 429:
+        retry_after = _retry_after(response)
+        if retry_after is not None and retry_after <= MAX_RETRY_AFTER_SECONDS:
+            logger.warning(
+                "Telegram rate-limited a send; retrying.",
+                extra={"chat_id": chat_id, "retry_after": retry_after},
+            )
+            time.sleep(retry_after)
+            response = http.post(url, **kwargs)
+    return response
+
 
 def send_telegram_message(
     bot_token: str,
@@ -58,7 +160,7 @@ def send_telegram_message(
     if reply_markup is not None:
         payload["reply_markup"] = reply_markup
     try:
-        response = requests.post(url, json=payload, timeout=15)
+        response = _post_to_chat(url, chat_id, json=payload, timeout=15)
         response.raise_for_status()
         logger.info("Telegram message sent.", extra={"chars": len(text)})
         return True
@@ -81,7 +183,7 @@ def answer_callback_query(
     if text:
         payload["text"] = text[:200]
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = http.post(url, json=payload, timeout=10)
         response.raise_for_status()
     except requests.RequestException as e:
         logger.error("Failed to answer callback_query.", extra={"error": str(e)})
@@ -110,7 +212,7 @@ def edit_message_text(
     if reply_markup is not None:
         payload["reply_markup"] = reply_markup
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = http.post(url, json=payload, timeout=10)
         response.raise_for_status()
     except requests.RequestException as e:
         logger.error("Failed to edit Telegram message.", extra={"error": str(e)})
@@ -134,7 +236,7 @@ def edit_message_reply_markup(
     if reply_markup is not None:
         payload["reply_markup"] = reply_markup
     try:
-        response = requests.post(url, json=payload, timeout=10)
+        response = http.post(url, json=payload, timeout=10)
         response.raise_for_status()
     except requests.RequestException as e:
         logger.error("Failed to edit Telegram reply markup.", extra={"error": str(e)})
@@ -150,11 +252,14 @@ def send_telegram_photo(
 
     Returns ``True`` on success, ``False`` on any 4xx/5xx/network
     failure (also logged). Same contract as `send_telegram_message`.
+    Waits for the chat's send slot first (see `ChatRateLimiter`), so
+    callers sending several in a row need no pause of their own.
     """
-    url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
+    url = TELEGRAM_SEND_PHOTO_URL.format(token=bot_token)
     try:
-        response = requests.post(
+        response = _post_to_chat(
             url,
+            chat_id,
             data={"chat_id": chat_id, "caption": caption, "parse_mode": "HTML"},
             files={"photo": ("image.png", image_bytes, "image/png")},
             timeout=30,
@@ -167,6 +272,57 @@ def send_telegram_photo(
         return False
 
 
+def send_telegram_media_group(
+    bot_token: str,
+    chat_id: str,
+    photos: list[tuple[bytes, str]],
+) -> bool:
+    """Sends `(image_bytes, caption)` pairs as albums via sendMediaGroup.
+
+    One upload per ten photos instead of one per photo — one rate-limit
+    slot, one round trip. Each photo keeps its caption, but Telegram only
+    shows them when a photo is opened, so this suits images that carry
+    their own title (`build_table_image` draws it in) rather than ones
+    whose caption is the message. A trailing single photo goes out via
+    sendPhoto, as an album needs two. Returns ``True`` only if every
+    album landed; on a failure the rest are not sent.
+    """
+    url = TELEGRAM_SEND_MEDIA_GROUP_URL.format(token=bot_token)
+    for start in range(0, len(photos), TELEGRAM_MAX_MEDIA_GROUP):
+        chunk = photos[start : start + TELEGRAM_MAX_MEDIA_GROUP]
+        if len(chunk) == 1:
+            if not send_telegram_photo(bot_token, chat_id, *chunk[0]):
+                return False
+            continue
+        media = [
+            {
+                "type": "photo",
+                "media": f"attach://photo{i}",
+                "caption": caption,
+                "parse_mode": "HTML",
+            }
+            for i, (_, caption) in enumerate(chunk)
+        ]
+        files = {
+            f"photo{i}": (f"image{i}.png", image, "image/png")
+            for i, (image, _) in enumerate(chunk)
+        }
+        try:
+            response = _post_to_chat(
+                url,
+                chat_id,
+                data={"chat_id": chat_id, "media": json.dumps(media)},
+                files=files,
+                timeout=60,
+            )
+            response.raise_for_status()
+            logger.info("Telegram album sent.", extra={"photos": len(chunk)})
+        except requests.RequestException as e:
+            logger.error("Failed to send Telegram album.", extra={"error": str(e)})
+            return False
+    return True
+
+
 def send_telegram_animation(
     bot_token: str,
     chat_id: str,
@@ -181,7 +337,7 @@ def send_telegram_animation(
     """
     url = f"https://api.telegram.org/bot{bot_token}/sendAnimation"
     try:
-        response = requests.post(
+        response = http.post(
             url,
             data={
                 "chat_id": chat_id,
@@ -234,6 +390,40 @@ def send_telegram_photo_or_raise(
         raise TelegramDeliveryError("Telegram photo delivery failed")
 
 
+class DeliveryPipeline:
+    """Sends a multi-photo flow's messages in order, behind the caller.
+
+    `submit` queues a send on one background thread and returns its
+    `Future` at once, so the caller renders image N+1 while image N
+    uploads — the two used to alternate, each waiting on the other. One
+    thread keeps the chat's order exactly as submitted; the rate limiter
+    inside the send helpers keeps it within Telegram's limits.
+
+    Use as a context manager: leaving the block waits for every queued send,
+    including when the block raised, so nothing is cut off mid-flow. A send
+    that raises only surfaces through its own `Future`.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="telegram-delivery"
+        )
+
+    def submit(self, send: Callable, /, *args, **kwargs) -> Future:
+        """Queue `send(*args, **kwargs)` after everything submitted so far."""
+        return self._executor.submit(send, *args, **kwargs)
+
+    def close(self) -> None:
+        """Wait for the queued sends, then stop the thread."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "DeliveryPipeline":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
 def build_persistent_reply_keyboard(labels: list[str], cols: int = 2) -> dict:
     """`ReplyKeyboardMarkup` laid out in `cols` columns, pinned via
     `is_persistent: true`. Tapping a button posts its label as plain
@@ -262,7 +452,7 @@ def register_bot_commands(
     if scope is not None:
         payload["scope"] = scope
     try:
-        response = requests.post(url, json=payload, timeout=15)
+        response = http.post(url, json=payload, timeout=15)
         response.raise_for_status()
         extra = {"count": len(commands)}
         if scope is not None:
@@ -281,7 +471,7 @@ def set_commands_menu_button(bot_token: str) -> None:
     """
     url = TELEGRAM_SET_MENU_BUTTON_URL.format(token=bot_token)
     try:
-        response = requests.post(
+        response = http.post(
             url, json={"menu_button": {"type": "commands"}}, timeout=15
         )
         response.raise_for_status()
@@ -300,9 +490,7 @@ def reset_menu_button_to_default(bot_token: str) -> None:
     """
     url = TELEGRAM_SET_MENU_BUTTON_URL.format(token=bot_token)
     try:
-        response = requests.post(
-            url, json={"menu_button": {"type": "default"}}, timeout=15
-        )
+        response = http.post(url, json={"menu_button": {"type": "default"}}, timeout=15)
         response.raise_for_status()
         logger.info("Menu button reset to 'default'.")
     except requests.RequestException as e:
@@ -349,7 +537,7 @@ def set_webhook(
         allowed_updates = ["message", "callback_query"]
     api_url = f"https://api.telegram.org/bot{bot_token}/setWebhook"
     try:
-        response = requests.post(
+        response = http.post(
             api_url,
             json={
                 "url": url,
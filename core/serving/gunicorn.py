@@ -5,7 +5,7 @@ import sys
 from gunicorn.app.wsgiapp import run as _run
 
 
-def run(app_path: str, timeout: int | None = None) -> None:
+def run(app_path: str, timeout: int | None = None, threads: int | None = None) -> None:
     """Launch gunicorn bound to 0.0.0.0:8080, serving `app_path`.
 
     `app_path` is the WSGI target in `module.path:app` form. `timeout`, when
@@ -13,10 +13,16 @@ def run(app_path: str, timeout: int | None = None) -> None:
     that legitimately runs longer (chained external calls, heavy rendering,
     uploads) would otherwise get SIGKILLed before any Python `except` block
     can run, so the caller sees a silent 500 with no error message at all.
+
+    `threads`, when given, serves requests from that many threads per worker
+    (gunicorn's gthread worker), so one long request does not hold up the
+    rest.
     """
     argv = ["gunicorn", "--bind", "0.0.0.0:8080"]
     if timeout is not None:
         argv += ["--timeout", str(timeout)]
+    if threads is not None:
+        argv += ["--threads", str(threads)]
     argv.append(app_path)
     sys.argv = argv
     _run()
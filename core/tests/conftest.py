@@ -6,6 +6,7 @@ import pytest
 import requests_mock
 
 # Importaciones de tu código
+from core.sdk import biwenger as biwenger_sdk
 from core.sdk.biwenger import BiwengerClient
 from .constants import (
     TEST_LOGIN_URL,
@@ -17,6 +18,15 @@ from .constants import (
 
 
 # --- Fixtures compartidos y de utilidad ---
+@pytest.fixture(autouse=True)
+def _fresh_competition_cache():
+    """Each test starts without a cached competition snapshot — the cache is
+    process-wide, so a payload mocked by one test would leak into the next."""
+    biwenger_sdk.reset_competition_cache()
+    yield
+    biwenger_sdk.reset_competition_cache()
+
+
 @pytest.fixture
 def load_json_fixture():
     def _loader(filename):
@@ -4,6 +4,7 @@ import pytest
 import requests
 import requests_mock
 
+from core.sdk import biwenger as biwenger_sdk
 from core.sdk.biwenger import (
     BiwengerError,
     BiwengerClient,
@@ -110,6 +111,71 @@ def test_authentication_raises_when_user_not_in_league(load_json_fixture):
             )
 
 
+def test_stale_token_re_authenticates_and_resends_once(
+    biwenger_client_authenticated, load_json_fixture
+):
+    """A `401` logs in again and replays the request with the new token, so a
+    long-lived shared session never surfaces a stale token to its caller."""
+    client = biwenger_client_authenticated
+    with requests_mock.Mocker() as m:
+        m.post(TEST_LOGIN_URL, json={"token": "fresh"})
+        m.get(TEST_ACCOUNT_URL, json=load_json_fixture("account_response.json"))
+        m.get(
+            TEST_MARKET_URL,
+            [{"status_code": 401}, {"json": {"data": {"sales": [{"id": 1}]}}}],
+        )
+
+        assert client.get_market_players(TEST_MARKET_URL) == [{"id": 1}]
+
+        market_calls = [r for r in m.request_history if r.url == TEST_MARKET_URL]
+        assert len(market_calls) == 2
+        assert market_calls[1].headers["Authorization"] == "Bearer fresh"
+        assert client.session.headers["Authorization"] == "Bearer fresh"
+
+
+def test_persistent_401_surfaces_after_one_re_authentication(
+    biwenger_client_authenticated, load_json_fixture
+):
+    """A token that is rejected right after a fresh login is not retried
+    forever: one re-login, one resend, then the `401` reaches the caller."""
+    client = biwenger_client_authenticated
+    with requests_mock.Mocker() as m:
+        m.post(TEST_LOGIN_URL, json={"token": "fresh"})
+        m.get(TEST_ACCOUNT_URL, json=load_json_fixture("account_response.json"))
+        m.get(TEST_MARKET_URL, status_code=401)
+
+        with pytest.raises(requests.HTTPError):
+            client.get_market_players(TEST_MARKET_URL)
+
+        logins = [r for r in m.request_history if r.url == TEST_LOGIN_URL]
+        assert len(logins) == 1
+
+
+def test_shared_client_logs_in_once_per_account(load_json_fixture):
+    """Every API handler reuses the instance's session instead of paying a
+    login + `/account` round-trip per bot command."""
+    biwenger_sdk.reset_shared_clients()
+    try:
+        with requests_mock.Mocker() as m:
+            m.post(TEST_LOGIN_URL, json=load_json_fixture("login_response.json"))
+            m.get(TEST_ACCOUNT_URL, json=load_json_fixture("account_response.json"))
+            args = (
+                TEST_EMAIL,
+                TEST_PASSWORD,
+                TEST_LOGIN_URL,
+                TEST_ACCOUNT_URL,
+                TEST_LEAGUE_ID,
+            )
+
+            first = biwenger_sdk.get_shared_client(*args)
+            second = biwenger_sdk.get_shared_client(*args)
+
+            assert first is second
+            assert m.call_count == 2  # one login + one /account
+    finally:
+        biwenger_sdk.reset_shared_clients()
+
+
 def test_get_all_players_data_map_json(
     biwenger_client_authenticated, load_json_fixture
 ):
@@ -164,6 +230,68 @@ def test_get_competition_maps_downloads_once(load_json_fixture):
         assert isinstance(teams_map, dict)
 
 
+def test_competition_data_is_shared_within_the_ttl(load_json_fixture):
+    """A daily digest followed by `/teams` and `/alinear` pays for one
+    download: every map accessor reads the same process-wide snapshot."""
+    with requests_mock.Mocker() as m:
+        m.get(
+            TEST_PLAYERS_DATA_URL,
+            json=load_json_fixture("all_players_data.json"),
+            status_code=200,
+        )
+
+        BiwengerClient.get_competition_maps(TEST_PLAYERS_DATA_URL)
+        BiwengerClient._build_players_map(
+            BiwengerClient._fetch_competition_data(TEST_PLAYERS_DATA_URL)
+        )
+        players_map, _ = BiwengerClient.get_competition_maps(TEST_PLAYERS_DATA_URL)
+
+        assert m.call_count == 1
+        assert players_map[1001]["name"] == "Yamal"
+
+
+def test_competition_data_revalidates_with_etag_after_the_ttl(
+    load_json_fixture, monkeypatch
+):
+    """Past the TTL the snapshot is revalidated, and a 304 keeps it."""
+    monkeypatch.setattr(biwenger_sdk, "COMPETITION_CACHE_TTL_SECONDS", 0)
+    with requests_mock.Mocker() as m:
+        m.get(
+            TEST_PLAYERS_DATA_URL,
+            [
+                {
+                    "json": load_json_fixture("all_players_data.json"),
+                    "headers": {"ETag": '"v1"'},
+                },
+                {"status_code": 304},
+            ],
+        )
+
+        BiwengerClient.get_competition_maps(TEST_PLAYERS_DATA_URL)
+        players_map, _ = BiwengerClient.get_competition_maps(TEST_PLAYERS_DATA_URL)
+
+        assert m.call_count == 2
+        assert m.request_history[1].headers["If-None-Match"] == '"v1"'
+        assert players_map[1001]["name"] == "Yamal"
+
+
+def test_competition_data_refreshes_when_the_payload_changes(monkeypatch):
+    """A new body past the TTL replaces the snapshot; an identical one,
+    from a server that ignores conditional headers, keeps the parsed copy."""
+    monkeypatch.setattr(biwenger_sdk, "COMPETITION_CACHE_TTL_SECONDS", 0)
+    v1 = {"data": {"players": {"1": {"id": 1, "name": "Isco"}}}}
+    v2 = {"data": {"players": {"1": {"id": 1, "name": "Isco Alarcón"}}}}
+    with requests_mock.Mocker() as m:
+        m.get(TEST_PLAYERS_DATA_URL, [{"json": v1}, {"json": v1}, {"json": v2}])
+
+        first = BiwengerClient._fetch_competition_data(TEST_PLAYERS_DATA_URL)
+        same = BiwengerClient._fetch_competition_data(TEST_PLAYERS_DATA_URL)
+        changed = BiwengerClient._fetch_competition_data(TEST_PLAYERS_DATA_URL)
+
+        assert same is first
+        assert changed["players"]["1"]["name"] == "Isco Alarcón"
+
+
 def test_get_manager_squad(biwenger_client_authenticated, load_json_fixture):
     """Verifica que get_manager_squad devuelve la plantilla del mánager."""
     client = biwenger_client_authenticated
@@ -178,6 +306,47 @@ def test_get_manager_squad(biwenger_client_authenticated, load_json_fixture):
         assert squad[1]["id"] == 1002
 
 
+def test_get_manager_squads_reads_every_manager_in_order(
+    biwenger_client_authenticated, load_json_fixture
+):
+    """The fan-out returns one squad per manager, keyed and ordered like the
+    ids it was given, however the concurrent reads happen to finish."""
+    client = biwenger_client_authenticated
+    with requests_mock.Mocker() as m:
+        for manager_id in (3, 1, 2):
+            m.get(
+                TEST_MANAGER_SQUAD_URL_TEMPLATE.format(manager_id=manager_id),
+                json={"data": {"players": [{"id": manager_id * 100}]}},
+            )
+
+        squads = client.get_manager_squads(TEST_MANAGER_SQUAD_URL_TEMPLATE, [3, 1, 2])
+
+        assert list(squads) == [3, 1, 2]
+        assert squads[1] == [{"id": 100}]
+        assert m.call_count == 3
+
+
+def test_get_manager_squads_retries_a_transient_failure(
+    biwenger_client_authenticated,
+):
+    """A 5xx on one manager retries that read alone instead of failing the
+    whole league."""
+    client = biwenger_client_authenticated
+    with requests_mock.Mocker() as m, patch("core.sdk.http.time.sleep"):
+        m.get(
+            TEST_MANAGER_SQUAD_URL_TEMPLATE.format(manager_id=1),
+            [{"status_code": 502}, {"json": {"data": {"players": [{"id": 7}]}}}],
+        )
+        m.get(
+            TEST_MANAGER_SQUAD_URL_TEMPLATE.format(manager_id=2),
+            json={"data": {"players": []}},
+        )
+
+        squads = client.get_manager_squads(TEST_MANAGER_SQUAD_URL_TEMPLATE, [1, 2])
+
+        assert squads == {1: [{"id": 7}], 2: []}
+
+
 def test_get_market_players(biwenger_client_authenticated, load_json_fixture):
     """Verifica que el método procesa correctamente una respuesta del mercado."""
     client = biwenger_client_authenticated
@@ -230,40 +399,111 @@ def test_get_all_board_messages_single_page(biwenger_client_authenticated):
     assert seen_urls == ["http://test.com&limit=200&offset=0"]
 
 
-def test_get_all_board_messages_paginates(biwenger_client_authenticated):
-    """Stops once a page is shorter than `limit`."""
-    client = biwenger_client_authenticated
-    pages = [
-        {"data": [{"id": i} for i in range(200)]},
-        {"data": [{"id": i} for i in range(200, 250)]},
-        {"data": []},
-    ]
+def _paged_feed(total: int, limit: int = 200):
+    """Stub page fetcher serving `total` entries by offset, in any call order."""
     seen_urls = []
 
-    def stub(url):
+    def fetch(url):
         seen_urls.append(url)
-        return pages.pop(0)
+        offset = int(url.rsplit("offset=", 1)[1])
+        return {"data": [{"id": i} for i in range(offset, min(offset + limit, total))]}
+
+    return fetch, seen_urls
+
+
+def test_get_all_board_messages_paginates(biwenger_client_authenticated):
+    """Stops once a page is shorter than `limit`, keeping feed order."""
+    client = biwenger_client_authenticated
+    client.get_board_messages, seen_urls = _paged_feed(250)
+    messages = client.get_all_board_messages("http://test.com")
+    assert [m["id"] for m in messages] == list(range(250))
+    assert seen_urls[0] == "http://test.com&limit=200&offset=0"
+    assert "http://test.com&limit=200&offset=200" in seen_urls
+
 
-    client.get_board_messages = stub
+def test_get_all_board_messages_fetches_later_pages_in_a_window(
+    biwenger_client_authenticated,
+):
+    """Past page 0 the offsets go out a window at a time, and the first short
+    page ends the crawl — a full season no longer costs one serial round-trip
+    per page, and the overshoot is bounded by the window."""
+    client = biwenger_client_authenticated
+    client.get_board_messages, seen_urls = _paged_feed(1_150)
     messages = client.get_all_board_messages("http://test.com")
-    assert len(messages) == 250
-    assert seen_urls == [
-        "http://test.com&limit=200&offset=0",
-        "http://test.com&limit=200&offset=200",
-    ]
+    assert [m["id"] for m in messages] == list(range(1_150))
+    offsets = {int(u.rsplit("=", 1)[1]) for u in seen_urls}
+    # Every page up to the short one, plus at most the rest of its window —
+    # pages the window had not started yet are cancelled.
+    assert (
+        {0, 200, 400, 600, 800, 1000}
+        <= offsets
+        <= {0, 200, 400, 600, 800, 1000, 1200, 1400, 1600}
+    )
+
+
+def test_get_all_board_messages_stops_at_known_history(
+    biwenger_client_authenticated,
+):
+    """Incremental mode: the page holding the first already-stored message is
+    the last one read, so a run with two new messages costs one request."""
+    client = biwenger_client_authenticated
+    client.get_board_messages, seen_urls = _paged_feed(5_000)
+    messages = client.get_all_board_messages(
+        "http://test.com", stop_when=lambda m: m["id"] == 2
+    )
+    assert len(messages) == 200
+    assert seen_urls == ["http://test.com&limit=200&offset=0"]
 
 
 def test_get_all_clausulazos_paginates(biwenger_client_authenticated):
     """Aggregates pages and returns a `{'data': [...]}` envelope."""
     client = biwenger_client_authenticated
-    pages = [
-        {"data": [{"date": i} for i in range(200)]},
-        {"data": [{"date": i} for i in range(50)]},
-    ]
-    client.get_clausulazos = lambda url: pages.pop(0)
+    client.get_clausulazos, _ = _paged_feed(250)
     result = client.get_all_clausulazos("http://api/board?type=transfer")
     assert len(result["data"]) == 250
-    assert pages == []
+
+
+def _dated_feed(total: int, limit: int = 200):
+    """Like `_paged_feed`, newest first: entry `i` is dated `10_000 - i`."""
+    fetch, seen_urls = _paged_feed(total, limit)
+
+    def dated(url):
+        page = fetch(url)
+        return {"data": [dict(e, date=10_000 - e["id"]) for e in page["data"]]}
+
+    return dated, seen_urls
+
+
+def test_iter_clausulazos_reads_only_the_window(biwenger_client_authenticated):
+    """A recent window costs the page that reaches the cutoff, however long
+    the season's history is."""
+    client = biwenger_client_authenticated
+    client.get_clausulazos, seen_urls = _dated_feed(5_000)
+
+    entries = list(client.iter_clausulazos("http://api/b?type=transfer", since=9_950))
+
+    assert [e["id"] for e in entries] == list(range(51))
+    assert seen_urls == ["http://api/b?type=transfer&limit=200&offset=0"]
+
+
+def test_iter_clausulazos_pages_until_the_cutoff(biwenger_client_authenticated):
+    client = biwenger_client_authenticated
+    client.get_clausulazos, seen_urls = _dated_feed(5_000)
+
+    entries = list(client.iter_clausulazos("http://api/b?type=transfer", since=9_700))
+
+    assert len(entries) == 301
+    assert len(seen_urls) == 2
+
+
+def test_iter_clausulazos_ends_with_a_short_feed(biwenger_client_authenticated):
+    client = biwenger_client_authenticated
+    client.get_clausulazos, seen_urls = _dated_feed(120)
+
+    entries = list(client.iter_clausulazos("http://api/b?type=transfer", since=0))
+
+    assert len(entries) == 120
+    assert len(seen_urls) == 1
 
 
 def test_get_all_clausulazos_stops_on_empty(biwenger_client_authenticated):
@@ -0,0 +1,152 @@
+"""Tests for the pipelining and retry logic of `core.sdk.firestore.bulk_write`.
+
+Unlike test_firestore_sdk.py these need no emulator: the commit of a single
+chunk is stubbed, which is exactly the boundary the engine is built around.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from core.sdk import firestore
+
+
+@pytest.fixture
+def commits():
+    """Stub `_commit_chunk`; record the doc ids of every commit."""
+    calls = []
+    with patch.object(firestore, "get_client", return_value=MagicMock()), patch.object(
+        firestore, "_commit_chunk"
+    ) as commit:
+
+        def _ok(client, collection, chunk):
+            calls.append([doc_id for doc_id, _ in chunk])
+            return [None] * len(chunk)
+
+        commit.side_effect = _ok
+        commit.calls = calls
+        yield commit
+
+
+def test_chunks_respect_the_batch_cap_and_keep_every_op(commits):
+    ops = [(f"d{i}", {"i": i}) for i in range(1203)]
+
+    result = firestore.bulk_write("c", ops, backoffs=())
+
+    assert result.written == 1203
+    assert result.failed == {}
+    assert sorted(len(c) for c in commits.calls) == [203, 500, 500]
+    assert sorted(i for c in commits.calls for i in c) == sorted(i for i, _ in ops)
+
+
+def test_a_repeated_id_starts_a_new_chunk(commits):
+    """A bulk batch applies its writes in no order: two ops on one doc must
+    never share it."""
+    firestore.bulk_write("c", [("a", {"v": 1}), ("b", {}), ("a", None)])
+
+    assert commits.calls == [["a", "b"], ["a"]]
+
+
+def test_a_repeated_id_waits_for_the_commit_in_flight_before_it(commits):
+    """Chunks commit concurrently, so a chunk that writes a document again
+    must not start until the one before it — retries and all — is over."""
+    events = []
+
+    def _slow_first(client, collection, chunk):
+        ids = [doc_id for doc_id, _ in chunk]
+        events.append(("start", ids[0]))
+        if ids[0] == "a" and chunk[0][1] is not None:
+            time.sleep(0.05)
+        events.append(("end", ids[0]))
+        return [None] * len(chunk)
+
+    commits.side_effect = _slow_first
+    # "a" opens the first full chunk and comes back in the second, so the
+    # two are cut by the cap rather than by the repeat.
+    filler = [(f"d{i}", {}) for i in range(firestore._BATCH_LIMIT - 1)]
+    ops = [("a", {"v": 1})] + filler + [("a", None)]
+
+    result = firestore.bulk_write("c", ops, max_in_flight=3)
+
+    assert events == [("start", "a"), ("end", "a"), ("start", "a"), ("end", "a")]
+    assert result.written == len(ops)
+
+
+def test_a_repeated_id_that_lands_clears_the_earlier_failure(commits):
+    seen = []
+
+    def _first_denied(client, collection, chunk):
+        seen.append(chunk[0][0])
+        return [("denied", False) if seen.count("a") == 1 else None] * len(chunk)
+
+    commits.side_effect = _first_denied
+    result = firestore.bulk_write("c", [("a", {"v": 1}), ("a", {"v": 2})])
+
+    assert result.failed == {}
+    assert result.written == 1
+
+
+def test_only_transiently_failed_ops_are_resent(commits):
+    attempts = []
+
+    def _flaky(client, collection, chunk):
+        attempts.append([doc_id for doc_id, _ in chunk])
+        if len(attempts) == 1:
+            return [None, ("unavailable", True), ("denied", False)]
+        return [None] * len(chunk)
+
+    commits.side_effect = _flaky
+    with patch.object(firestore.time, "sleep") as sleep:
+        result = firestore.bulk_write(
+            "c", [("ok", {}), ("flaky", {}), ("bad", {})], backoffs=(0.5,)
+        )
+
+    assert attempts == [["ok", "flaky", "bad"], ["flaky"]]
+    sleep.assert_called_once_with(0.5)
+    assert result.written == 2
+    assert result.failed == {"bad": "denied"}
+    assert result.retries == 1
+
+
+def test_ops_still_failing_after_the_backoffs_are_reported(commits):
+    commits.side_effect = lambda client, collection, chunk: [("busy", True)] * len(
+        chunk
+    )
+    with patch.object(firestore.time, "sleep"):
+        result = firestore.bulk_write("c", [("a", {})], backoffs=(0, 0))
+
+    assert result.failed == {"a": "busy"}
+    assert result.commits == 3
+
+
+def test_batch_write_raises_on_failed_docs(commits):
+    commits.side_effect = lambda client, collection, chunk: [("denied", False)] * len(
+        chunk
+    )
+    with pytest.raises(firestore.BulkWriteError) as excinfo:
+        firestore.batch_write("c", [("a", {})])
+    assert excinfo.value.failed == {"a": "denied"}
+
+
+def test_commits_overlap_up_to_the_in_flight_limit(commits):
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def _slow(client, collection, chunk):
+        with lock:
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+        time.sleep(0.02)
+        with lock:
+            state["now"] -= 1
+        return [None] * len(chunk)
+
+    commits.side_effect = _slow
+    ops = [(f"d{i}", {}) for i in range(firestore._BATCH_LIMIT * 6)]
+
+    result = firestore.bulk_write("c", ops, max_in_flight=3)
+
+    assert result.written == len(ops)
+    assert 1 < state["peak"] <= 3
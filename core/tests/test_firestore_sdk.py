@@ -106,6 +106,21 @@ def test_run_transaction_reads_and_writes_atomically(collection):
     assert firestore.get_document(collection, "d") == {"n": 2}
 
 
+def test_window_counter_grants_until_the_window_is_spent(collection):
+    from core.sdk import firestore
+
+    now = [125.0]
+    counter = firestore.WindowCounter(
+        collection, "quota", limit=5, window_seconds=60, clock=lambda: now[0]
+    )
+
+    assert counter.lease(3) == 0
+    assert counter.lease(3) == 55.0  # 2 left; wait for the window at 180 s
+    now[0] = 180.0
+    assert counter.lease(3) == 0
+    assert firestore.get_document(collection, "quota") == {"window": 3, "count": 3}
+
+
 def test_delete_collection(collection):
     from core.sdk import firestore
 
@@ -113,3 +128,29 @@ def test_delete_collection(collection):
     deleted = firestore.delete_collection(collection)
     assert deleted == 10
     assert firestore.count(collection) == 0
+
+
+def test_sync_collection_writes_only_the_difference(collection):
+    from core.sdk import firestore
+
+    firestore.batch_write(
+        collection, [("keep", {"v": 1}), ("edit", {"v": 1}), ("gone", {"v": 1})]
+    )
+    counts = firestore.sync_collection(
+        collection, [("keep", {"v": 1}), ("edit", {"v": 2}), ("new", {"v": 3})]
+    )
+    assert counts == {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+    assert dict(firestore.list_documents(collection)) == {
+        "keep": {"v": 1},
+        "edit": {"v": 2},
+        "new": {"v": 3},
+    }
+
+
+def test_content_hash_ignores_key_order():
+    from core.sdk import firestore
+
+    assert firestore.content_hash({"a": 1, "b": "x"}) == firestore.content_hash(
+        {"b": "x", "a": 1}
+    )
+    assert firestore.content_hash({"a": 1}) != firestore.content_hash({"a": 2})
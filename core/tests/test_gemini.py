@@ -2,6 +2,7 @@
 
 import base64
 import json
+import os
 from unittest.mock import patch
 
 import pytest
@@ -135,3 +136,72 @@ def test_generate_image_surfaces_finish_reason_when_content_missing():
         m.post(_IMG_URL, json={"candidates": [{"finishReason": "IMAGE_SAFETY"}]})
         with pytest.raises(gemini.GeminiError, match="IMAGE_SAFETY"):
             gemini.generate_image("key", "isolate", b"src")
+
+
+# --- response cache ----------------------------------------------------------
+
+
+def test_a_cached_answer_skips_the_model(tmp_path):
+    cache = gemini.DiskCache(tmp_path)
+    with requests_mock.Mocker() as m:
+        m.post(_URL, json=_api_response({"name": "Solán"}))
+        first = gemini.generate_json("key", "p", image_bytes=b"img", cache=cache)
+        again = gemini.generate_json("key", "p", image_bytes=b"img", cache=cache)
+    assert first == again == {"name": "Solán"}
+    assert m.call_count == 1
+
+
+def test_any_change_to_the_request_misses():
+    base = ("json", "m", "p", {"type": "OBJECT"}, b"img", "image/jpeg")
+    keys = {
+        gemini.cache_key(*base),
+        gemini.cache_key("image", *base[1:]),
+        gemini.cache_key(base[0], "other-model", *base[2:]),
+        gemini.cache_key(*base[:2], "p2", *base[3:]),
+        gemini.cache_key(*base[:3], {"type": "ARRAY"}, *base[4:]),
+        gemini.cache_key(*base[:4], b"img2", base[5]),
+    }
+    assert len(keys) == 6
+    # Schema key order is not a different request.
+    assert gemini.cache_key(
+        "json", "m", "p", {"a": 1, "b": 2}, None, "image/jpeg"
+    ) == gemini.cache_key("json", "m", "p", {"b": 2, "a": 1}, None, "image/jpeg")
+
+
+def test_failures_are_not_cached(tmp_path):
+    """A 503 or a safety block must reach the model again next time."""
+    cache = gemini.DiskCache(tmp_path)
+    with requests_mock.Mocker() as m:
+        m.post(_IMG_URL, json={"candidates": [{"finishReason": "IMAGE_SAFETY"}]})
+        with pytest.raises(gemini.GeminiError):
+            gemini.generate_image("key", "isolate", b"src", cache=cache)
+        m.post(_URL, status_code=503, text="overloaded")
+        with pytest.raises(gemini.GeminiError):
+            gemini.generate_json("key", "p", cache=cache)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_disk_cache_evicts_the_least_recently_used(tmp_path):
+    cache = gemini.DiskCache(tmp_path, max_bytes=300)
+    for i, key in enumerate(("a", "b", "c")):
+        cache.put(key, b"x" * 100)
+        os.utime(tmp_path / key, (i, i))
+    cache.get("a")  # read: now the most recent
+    cache.put("d", b"x" * 100)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a", "c", "d"]
+
+
+def test_gcs_cache_reads_misses_and_writes_objects():
+    cache = gemini.cache_from_url("gs://bucket/gemini/")
+    obj = f"{gemini.GcsCache._API}/storage/v1/b/bucket/o/gemini%2Fk"
+    upload = f"{gemini.GcsCache._API}/upload/storage/v1/b/bucket/o"
+    with patch.object(
+        gemini.GcsCache, "_auth_header", return_value={}
+    ), requests_mock.Mocker() as m:
+        m.get(obj, [{"status_code": 404}, {"content": b"{}"}])
+        m.post(upload, status_code=500)
+        assert cache.get("k") is None
+        assert cache.get("k") == b"{}"
+        cache.put("k", b"{}")  # a failed write is logged, never raised
+    assert m.request_history[-1].qs["name"] == ["gemini/k"]
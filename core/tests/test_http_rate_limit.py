@@ -0,0 +1,88 @@
+"""Tests for the outbound token buckets in `core.sdk.http`."""
+
+from unittest.mock import MagicMock, patch
+
+from core.sdk import biwenger, http
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _bucket(rate=2.0, burst=3, shared=None):
+    clock = _Clock()
+    return (
+        http.TokenBucket(rate, burst, shared=shared, clock=clock, sleep=clock.sleep),
+        clock,
+    )
+
+
+def test_a_burst_goes_at_once_then_the_rate_holds():
+    bucket, clock = _bucket(rate=2.0, burst=3)
+
+    waits = [bucket.acquire() for _ in range(5)]
+
+    assert waits == [0, 0, 0, 0.5, 0.5]
+    assert clock.now == 1.0
+
+
+def test_concurrent_callers_queue_behind_each_others_reservations():
+    """Reserved at the same instant, each waits a slot after the previous —
+    a fan-out is spread out, not let through together."""
+    sleeps = []
+    bucket = http.TokenBucket(2.0, 1, clock=lambda: 0.0, sleep=sleeps.append)
+
+    for _ in range(3):
+        bucket.acquire()
+
+    assert sleeps == [0.5, 1.0]
+
+
+def test_permits_are_leased_from_the_shared_budget_a_burst_at_a_time():
+    shared = MagicMock()
+    shared.lease.side_effect = [0, 7.0, 0]
+    bucket, clock = _bucket(rate=100.0, burst=3, shared=shared)
+
+    for _ in range(4):
+        bucket.acquire()
+
+    # One lease covers three requests; the fourth waits out a full window.
+    assert [c.args for c in shared.lease.call_args_list] == [(3,), (3,), (3,)]
+    assert 7.0 in clock.slept
+
+
+def test_a_failing_shared_budget_falls_back_to_the_local_bucket():
+    shared = MagicMock()
+    shared.lease.side_effect = RuntimeError("firestore down")
+    bucket, _ = _bucket(rate=100.0, burst=3, shared=shared)
+
+    for _ in range(6):
+        bucket.acquire()
+
+    assert shared.lease.call_count == 2  # once per block, not per request
+
+
+def test_pooled_sessions_wait_on_the_hosts_bucket(monkeypatch):
+    limited = MagicMock(acquire=MagicMock(return_value=0.0))
+    monkeypatch.setitem(http._limits, "limited.test", limited)
+    with patch("requests.adapters.HTTPAdapter.send"):
+        for url in ("https://limited.test/a", "https://free.test/a"):
+            adapter = http.session_for(url).get_adapter(url)
+            adapter.send(MagicMock(url=url))
+
+    limited.acquire.assert_called_once_with()
+
+
+def test_biwenger_api_is_limited_and_its_cdn_is_not():
+    bucket = http.limiter_for(biwenger.LOGIN_URL)
+    assert bucket is not None and bucket.burst == biwenger.BIWENGER_BURST
+    assert http.limiter_for(biwenger.BIWENGER_CF_BASE) is None
@@ -0,0 +1,61 @@
+"""Tests for the shared per-host session registry in `core.sdk.http`."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests_mock
+
+from core.benchmarks import http_pool
+from core.sdk import http
+
+
+@pytest.fixture(autouse=True)
+def _fresh():
+    http.reset_sessions()
+    yield
+    http.reset_sessions()
+
+
+def test_calls_to_one_host_reuse_one_connection():
+    with http_pool.local_server() as (url, connections):
+        for _ in range(5):
+            http.get(url).raise_for_status()
+    assert len(connections) == 1
+
+
+def test_each_host_gets_its_own_session():
+    a = http.session_for("https://api.telegram.org/bot1/sendMessage")
+    assert a is http.session_for("https://api.telegram.org/bot2/sendPhoto")
+    assert a is not http.session_for("https://biwenger.as.com/api/v2")
+
+
+def test_a_default_timeout_is_applied_unless_one_is_passed():
+    url = "https://example.test/"
+    adapter = http.session_for(url).get_adapter(url)
+    with patch("requests.adapters.HTTPAdapter.send") as send:
+        adapter.send(MagicMock(url=url))
+        adapter.send(MagicMock(url=url), timeout=3)
+    assert [c.kwargs["timeout"] for c in send.call_args_list] == [
+        http.DEFAULT_TIMEOUT,
+        3,
+    ]
+
+
+def test_shared_sessions_keep_no_cookies():
+    """One caller's cookies must not ride along on another's request."""
+    with requests_mock.Mocker() as m:
+        m.get("https://example.test/login", headers={"Set-Cookie": "sid=abc"})
+        http.get("https://example.test/login")
+    assert not http.session_for("https://example.test/").cookies
+
+
+def test_a_forked_child_starts_with_fresh_sessions():
+    parent = http.session_for("https://example.test/")
+    with patch("core.sdk.http.os.getpid", return_value=-1):
+        assert http.session_for("https://example.test/") is not parent
+
+
+def test_the_benchmark_reports_pooled_reuse():
+    results = http_pool.run(calls=5)
+    assert results["bare"]["connections"] == 5
+    assert results["pooled"]["connections"] == 1
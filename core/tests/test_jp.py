@@ -112,6 +112,77 @@ def test_fetch_all_players_raises_on_auth_error_masked_as_200():
             fetch_all_players(TOKEN)
 
 
+# --- persistent tier ---
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """An in-memory stand-in for the Firestore documents the tier reads."""
+    docs: dict = {}
+    monkeypatch.setattr(
+        jp.firestore,
+        "get_document",
+        lambda collection, doc_id: docs.get((collection, doc_id)),
+    )
+    monkeypatch.setattr(
+        jp.firestore,
+        "set_document",
+        lambda collection, doc_id, data: docs.__setitem__((collection, doc_id), data),
+    )
+    return docs
+
+
+def test_cold_instance_loads_the_persisted_payload_after_one_probe(store):
+    """Another instance paid for the full fetch; a cold one only probes."""
+    batch = _batch(start_ts=1779000000)
+    with requests_mock.Mocker() as m:
+        m.get(JP_URL, json={"players": batch})
+        fetch_all_players(TOKEN, persistent=True)
+        jp._CACHE.clear()  # a fresh instance
+        second = fetch_all_players(TOKEN, persistent=True)
+        limits = [req.qs.get("limit", [""])[0] for req in m.request_history]
+
+    assert second == batch
+    assert limits == ["600", "5"]
+    stored = store[(jp.PERSISTED_COLLECTION, "1-2")]
+    assert stored["fingerprint"] == 1779000000 + 5 * 30
+    assert isinstance(stored["players"], bytes)  # compressed, not the raw list
+
+
+def test_persisted_payload_from_an_older_snapshot_is_refetched(store):
+    """JP refreshed since the document was written: full fetch, then the
+    document moves forward for the next instance."""
+    stale = _batch(start_ts=1779000000)
+    fresh = _batch(start_ts=1779900000)
+    with requests_mock.Mocker() as m:
+        m.get(JP_URL, json={"players": stale})
+        fetch_all_players(TOKEN, persistent=True)
+        jp._CACHE.clear()
+        m.get(JP_URL, json={"players": fresh})
+        second = fetch_all_players(TOKEN, persistent=True)
+        limits = [req.qs.get("limit", [""])[0] for req in m.request_history]
+
+    assert second == fresh
+    assert limits == ["600", "5", "600"]
+    assert store[(jp.PERSISTED_COLLECTION, "1-2")]["fingerprint"] == (
+        1779900000 + 5 * 30
+    )
+
+
+def test_an_unreachable_persistent_tier_falls_back_to_the_full_fetch(monkeypatch):
+    """No credentials, a quota, a corrupt blob: all a miss, never an error."""
+
+    def broken(*args, **kwargs):
+        raise RuntimeError("firestore down")
+
+    monkeypatch.setattr(jp.firestore, "get_document", broken)
+    monkeypatch.setattr(jp.firestore, "set_document", broken)
+    batch = _batch(start_ts=1779000000)
+    with requests_mock.Mocker() as m:
+        m.get(JP_URL, json={"players": batch})
+        assert fetch_all_players(TOKEN, persistent=True) == batch
+
+
 def test_get_predict_rate_returns_value():
     player = {
         "predict": [
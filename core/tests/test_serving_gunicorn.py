@@ -48,3 +48,17 @@ def test_run_invokes_gunicorns_own_entrypoint():
     with patch("core.serving.gunicorn._run") as mock_run:
         gunicorn.run("packages.biwenger_tools.bot.app:app", timeout=180)
     mock_run.assert_called_once_with()
+
+
+def test_run_with_threads_adds_the_flag():
+    """A service whose requests can run for minutes serves the rest from
+    other threads of the same worker."""
+    with patch("core.serving.gunicorn._run"):
+        gunicorn.run("packages.biwenger_tools.bot.app:app", timeout=660, threads=4)
+    assert sys.argv[3:] == [
+        "--timeout",
+        "660",
+        "--threads",
+        "4",
+        "packages.biwenger_tools.bot.app:app",
+    ]
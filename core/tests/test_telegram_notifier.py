@@ -1,16 +1,25 @@
-from unittest.mock import MagicMock
+import json
+import threading
+from unittest.mock import MagicMock, patch
 
 import requests_mock
 
+from core.sdk import telegram
 from core.sdk.telegram import (
+    TELEGRAM_SEND_MEDIA_GROUP_URL,
     TELEGRAM_SEND_MESSAGE_URL,
+    TELEGRAM_SEND_PHOTO_URL,
     TELEGRAM_SET_COMMANDS_URL,
     TELEGRAM_SET_MENU_BUTTON_URL,
+    ChatRateLimiter,
+    DeliveryPipeline,
     configure_bot_commands,
     extract_webhook_update,
     parse_command,
     register_bot_commands,
+    send_telegram_media_group,
     send_telegram_message,
+    send_telegram_photo,
     validate_webhook_secret,
 )
 
@@ -228,3 +237,149 @@ def test_configure_bot_commands_with_scope_skips_menu_button_reset():
             if r.url == TELEGRAM_SET_MENU_BUTTON_URL.format(token=TEST_BOT_TOKEN)
         ]
         assert len(menu_calls) == 0
+
+
+# --- Multi-photo delivery ---
+
+
+class _FakeClock:
+    """A clock that only moves when the limiter sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _idle_limiter():
+    clock = _FakeClock()
+    return ChatRateLimiter(clock=clock, sleep=clock.sleep), clock
+
+
+def test_rate_limiter_allows_a_burst_then_paces_a_private_chat():
+    limiter, clock = _idle_limiter()
+
+    waits = [limiter.acquire(TEST_CHAT_ID) for _ in range(5)]
+
+    assert waits == [0.0, 0.0, 0.0, 1.0, 1.0]
+    assert clock.now == 2.0
+
+
+def test_rate_limiter_paces_groups_slower_and_chats_independently():
+    """Twenty a minute in a group; a busy group does not hold up a private
+    chat."""
+    limiter, _ = _idle_limiter()
+    for _ in range(3):
+        limiter.acquire("-100123")
+
+    assert limiter.acquire("-100123") == 3.0
+    assert limiter.acquire(TEST_CHAT_ID) == 0.0
+
+
+def test_photo_is_retried_once_after_a_429():
+    limiter, _ = _idle_limiter()
+    url = TELEGRAM_SEND_PHOTO_URL.format(token=TEST_BOT_TOKEN)
+    with requests_mock.Mocker() as m, patch.object(
+        telegram, "_limiter", limiter
+    ), patch.object(telegram.time, "sleep") as pause:
+        m.post(
+            url,
+            [
+                {"status_code": 429, "json": {"parameters": {"retry_after": 2}}},
+                {"json": {"ok": True}},
+            ],
+        )
+        ok = send_telegram_photo(TEST_BOT_TOKEN, TEST_CHAT_ID, b"png", "Mi equipo")
+
+    assert ok is True
+    assert m.call_count == 2
+    pause.assert_called_once_with(2.0)
+
+
+def test_texts_and_photos_share_the_chats_bucket():
+    """A text fallback in the middle of a photo run is a message in the same
+    chat: it waits its turn, and the photo after it still counts it."""
+    limiter, clock = _idle_limiter()
+    group = "-100123"
+    with requests_mock.Mocker() as m, patch.object(telegram, "_limiter", limiter):
+        m.post(TELEGRAM_SEND_PHOTO_URL.format(token=TEST_BOT_TOKEN), json={})
+        m.post(TELEGRAM_SEND_MESSAGE_URL.format(token=TEST_BOT_TOKEN), json={})
+        for i in range(3):
+            assert send_telegram_photo(TEST_BOT_TOKEN, group, b"png", f"Equipo {i}")
+        assert send_telegram_message(TEST_BOT_TOKEN, group, "⚠️ Equipo 3 sin imagen")
+        assert send_telegram_photo(TEST_BOT_TOKEN, group, b"png", "Mercado")
+
+    assert [r.url.rsplit("/", 1)[1] for r in m.request_history] == [
+        "sendPhoto",
+        "sendPhoto",
+        "sendPhoto",
+        "sendMessage",
+        "sendPhoto",
+    ]
+    assert clock.slept == [3.0, 3.0]
+
+
+def test_media_group_sends_albums_of_ten_and_a_lone_tail_as_a_photo():
+    limiter, _ = _idle_limiter()
+    photos = [(f"png{i}".encode(), f"Equipo {i}") for i in range(11)]
+    with requests_mock.Mocker() as m, patch.object(telegram, "_limiter", limiter):
+        m.post(TELEGRAM_SEND_MEDIA_GROUP_URL.format(token=TEST_BOT_TOKEN), json={})
+        m.post(TELEGRAM_SEND_PHOTO_URL.format(token=TEST_BOT_TOKEN), json={})
+        ok = send_telegram_media_group(TEST_BOT_TOKEN, TEST_CHAT_ID, photos)
+
+    assert ok is True
+    album, tail = m.request_history
+    assert album.url.endswith("/sendMediaGroup")
+    assert tail.url.endswith("/sendPhoto")
+    # The multipart body carries the media list and one part per attach://.
+    body = album.body.decode("latin-1")
+    media = json.loads(body.split('name="media"\r\n\r\n')[1].split("\r\n")[0])
+    assert [item["media"] for item in media] == [
+        f"attach://photo{i}" for i in range(10)
+    ]
+    assert media[3]["caption"] == "Equipo 3"
+    assert 'name="photo9"' in body
+
+
+def test_pipeline_sends_in_order_while_the_caller_keeps_rendering():
+    """`submit` returns while the upload is still in flight, so the next
+    image can be rendered meanwhile; the chat still sees them in order."""
+    uploading = threading.Event()
+    release = threading.Event()
+    sent = []
+
+    def send(caption):
+        if caption == "first":
+            uploading.set()
+            release.wait(5)
+        sent.append(caption)
+        return True
+
+    with DeliveryPipeline() as pipeline:
+        first = pipeline.submit(send, "first")
+        assert uploading.wait(5)
+        # Still uploading "first": this is where image two gets rendered.
+        assert not first.done()
+        second = pipeline.submit(send, "second")
+        release.set()
+
+    assert sent == ["first", "second"]
+    assert first.result() and second.result()
+
+
+def test_pipeline_waits_for_queued_sends_when_the_block_raises():
+    sent = []
+    try:
+        with DeliveryPipeline() as pipeline:
+            pipeline.submit(sent.append, "queued")
+            raise ValueError("render failed")
+    except ValueError:
+        pass
+
+    assert sent == ["queued"]
@@ -3,15 +3,76 @@
 The official registry carries identity only (commercial name, spring,
 place) — never compositions. It powers the add-form prefill and the
 sync coverage stat; it never creates catalog entries by itself.
+
+The snapshot is fixed for the life of the process, so it is indexed once at
+import (`_RegistryIndex`): tokens and normalised keys per entry, plus a
+token → entries inverted index. A name lookup only inspects the entries
+sharing a token with it, and coverage is computed once per set of catalog
+names rather than on every `/comunidad` and `/acerca` view.
 """
 
+from functools import lru_cache
+
 from unidecode import unidecode
 
 from packages.be_water.web.aesan_snapshot import AESAN_WATERS
 
 
-def _tokens(text: str) -> set:
-    return set(unidecode(text or "").lower().replace("-", " ").split())
+def _tokens(text: str) -> frozenset:
+    return frozenset(unidecode(text or "").lower().replace("-", " ").split())
+
+
+@lru_cache(maxsize=4096)
+def _key(text: str) -> str:
+    return unidecode(text or "").strip().lower()
+
+
+class _RegistryIndex:
+    """Everything the lookups need from `entries`, precomputed."""
+
+    def __init__(self, entries: list[dict]):
+        self.entries = entries
+        self.tokens = [_tokens(e["name"]) for e in entries]
+        self.keys = [_key(e["name"]) for e in entries]
+        self.registry_keys = frozenset(self.keys)
+        self.by_token: dict[str, list[int]] = {}
+        for position, entry_tokens in enumerate(self.tokens):
+            for token in entry_tokens:
+                self.by_token.setdefault(token, []).append(position)
+        # Order of the "still to catalogue" list: province, then name.
+        self.by_province = sorted(
+            range(len(entries)),
+            key=lambda i: (entries[i]["province"], entries[i]["name"]),
+        )
+        self.match_positions = lru_cache(maxsize=1024)(self._match_positions)
+        self.covered_keys = lru_cache(maxsize=8)(self._covered_keys)
+
+    def _match_positions(self, tokens: frozenset) -> tuple[int, ...]:
+        # Either subset direction implies a shared token, so the entries
+        # indexed under `tokens` are the only candidates.
+        candidates = {i for token in tokens for i in self.by_token.get(token, ())}
+        return tuple(
+            i
+            for i in sorted(candidates)
+            if tokens <= self.tokens[i] or self.tokens[i] <= tokens
+        )
+
+    def _covered_keys(self, names: frozenset) -> frozenset:
+        return frozenset(
+            r for r in self.registry_keys if any(r in n or n in r for n in names)
+        )
+
+
+_INDEX = _RegistryIndex(AESAN_WATERS)
+
+
+def _index() -> _RegistryIndex:
+    """The import-time index, rebuilt only if `AESAN_WATERS` was swapped
+    (tests patch in a small registry)."""
+    global _INDEX
+    if _INDEX.entries is not AESAN_WATERS:
+        _INDEX = _RegistryIndex(AESAN_WATERS)
+    return _INDEX
 
 
 def registry_matches(name: str) -> list[dict]:
@@ -20,25 +81,21 @@ def registry_matches(name: str) -> list[dict]:
     tokens = _tokens(name)
     if not tokens:
         return []
-    return [
-        entry
-        for entry in AESAN_WATERS
-        if (t := _tokens(entry["name"])) and (tokens <= t or t <= tokens)
-    ]
+    index = _index()
+    return [index.entries[i] for i in index.match_positions(tokens)]
 
 
-def _key(text: str) -> str:
-    return unidecode(text or "").strip().lower()
+def _catalog_keys(catalog_names) -> frozenset:
+    return frozenset(_key(n) for n in catalog_names if n)
 
 
 def coverage(catalog_names) -> dict:
     """How much of the registry the given names cover (containment either
     way, accent-insensitive). White labels register under the producer's
     name and rightly don't match."""
-    registry = {_key(e["name"]) for e in AESAN_WATERS}
-    names = {_key(n) for n in catalog_names if n}
-    covered = {r for r in registry if any(r in n or n in r for n in names)}
-    return {"total": len(registry), "covered": len(covered)}
+    index = _index()
+    covered = index.covered_keys(_catalog_keys(catalog_names))
+    return {"total": len(index.registry_keys), "covered": len(covered)}
 
 
 def pending_waters(catalog_names) -> list[dict]:
@@ -50,22 +107,13 @@ def pending_waters(catalog_names) -> list[dict]:
     Vella, Cabreiroá…) once per spring, and counting rows here while counting
     names there made "quedan N por fichar" disagree with "ver las M pendientes".
     """
-    names = {_key(n) for n in catalog_names if n}
-    uncovered = sorted(
-        (
-            entry
-            for entry in AESAN_WATERS
-            if not any(
-                _key(entry["name"]) in n or n in _key(entry["name"]) for n in names
-            )
-        ),
-        key=lambda e: (e["province"], e["name"]),
-    )
+    index = _index()
+    covered = index.covered_keys(_catalog_keys(catalog_names))
     seen = set()
     deduped = []
-    for entry in uncovered:
-        key = _key(entry["name"])
-        if key not in seen:
+    for i in index.by_province:
+        key = index.keys[i]
+        if key not in covered and key not in seen:
             seen.add(key)
-            deduped.append(entry)
+            deduped.append(index.entries[i])
     return deduped
@@ -22,6 +22,7 @@ from packages.be_water.web import (  # noqa: F401
     label_ocr,
     photos,
     repository,
+    studio_jobs,
 )
 from packages.be_water.web.routes import add, admin, main, session
 
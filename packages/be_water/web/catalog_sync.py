@@ -26,7 +26,7 @@ from packages.be_water.web import aesan
 from packages.be_water.web import config  # also sets FIRESTORE_PROJECT
 from packages.be_water.web.aesan_snapshot import AESAN_VERSION
 from packages.be_water.web.domain import Water
-from packages.be_water.web.repository import WATERS
+from packages.be_water.web.repository import WATERS, bump_catalog_version
 from packages.be_water.web.seed_data import SEED_WATERS
 
 logger = get_logger(__name__)
@@ -63,12 +63,15 @@ def _aesan_coverage() -> dict:
 def sync_catalog() -> dict:
     existing = dict(firestore.list_documents(WATERS))
     created, updated, unchanged, kept_verified = [], [], [], []
+    # Collected and written in one pipelined bulk write at the end: a full
+    # re-sync touches most of the catalog, one round trip per bottle is slow.
+    writes: list[tuple[str, dict]] = []
 
     for raw in SEED_WATERS:
         water = _dataset_water(raw)
         current = existing.get(water.id)
         if current is None:
-            firestore.set_document(WATERS, water.id, water.to_firestore())
+            writes.append((water.id, water.to_firestore()))
             created.append(water.name)
             continue
         if current.get("verified"):
@@ -87,7 +90,7 @@ def sync_catalog() -> dict:
                     enriched[extra_field] = dataset_value
                     changed = True
             if changed:
-                firestore.set_document(WATERS, water.id, enriched)
+                writes.append((water.id, enriched))
                 updated.append(water.name)
             else:
                 kept_verified.append(water.name)
@@ -118,9 +121,13 @@ def sync_catalog() -> dict:
         if merged == current:
             unchanged.append(water.name)
         else:
-            firestore.set_document(WATERS, water.id, merged)
+            writes.append((water.id, merged))
             updated.append(water.name)
 
+    if writes:
+        firestore.batch_write(WATERS, writes)
+        bump_catalog_version()
+
     # Firestore docs the dataset knows nothing about: genuinely new waters
     # worth adding to the dataset — or a typo'd name that slugged into a
     # near-duplicate doc. Either way a human should look at them.
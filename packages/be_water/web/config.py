@@ -1,8 +1,10 @@
 import os
 import sys
+import tempfile
 
 from dotenv import load_dotenv
 
+from core.sdk import gemini
 from core.utils import load_json_secret
 
 # Pulls vars from a local .env when present (used for local dev).
@@ -41,6 +43,17 @@ PHOTOS_BUCKET = os.getenv("PHOTOS_BUCKET", "be-water-photos")
 GEMINI_API_KEY = _FLASK_CFG.get("gemini_api_key") or os.getenv("GEMINI_API_KEY", "")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-flash-latest")
 GEMINI_IMAGE_MODEL = os.getenv("GEMINI_IMAGE_MODEL", "gemini-2.5-flash-image")
+# Where successful label reads and studio cutouts are kept, so a resubmitted
+# form or an audit re-run on the same photo skips the model: a directory
+# (default, per instance — Cloud Run's /tmp is memory, hence the small cap)
+# or "gs://bucket/prefix/" to share them between instances and the scripts.
+# Empty disables the cache.
+GEMINI_CACHE = gemini.cache_from_url(
+    os.getenv(
+        "GEMINI_CACHE_URL", os.path.join(tempfile.gettempdir(), "be-water-gemini")
+    ),
+    max_bytes=int(os.getenv("GEMINI_CACHE_MAX_MB", "64")) << 20,
+)
 
 # Nicknames whose uploads go through the paid studio treatment (image
 # generation has no free tier). Everyone else keeps the free OCR prefill
@@ -52,6 +65,17 @@ ADMIN_NICKNAMES = {
     if n.strip()
 }
 
+# How the studio photo is made. "async" (default) opens the form with the raw
+# photo at once and renders the studio version on a background thread — the
+# image call can take over a minute, which pinned a gunicorn worker for all of
+# it; the form polls and swaps the photo in. Needs Cloud Run's CPU always
+# allocated (`--no-cpu-throttling`), or the thread crawls once the response
+# is out. "sync" makes it inside the request, alongside the OCR.
+STUDIO_MODE = os.getenv("STUDIO_MODE", "async")
+STUDIO_WORKERS = int(os.getenv("STUDIO_WORKERS", "2"))
+# Studio jobs waiting or running, per instance, before new ones are refused.
+STUDIO_QUEUE_MAX = int(os.getenv("STUDIO_QUEUE_MAX", "8"))
+
 # --- Google Sign-In (admin + future public login) ---
 # Empty until the OAuth client exists (see docs/operations.md runbook):
 # the button hides and /admin returns 404, so shipping without it is safe.
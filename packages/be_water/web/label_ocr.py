@@ -43,4 +43,5 @@ def extract_label(image_bytes: bytes) -> dict:
         schema=LABEL_SCHEMA,
         model=config.GEMINI_MODEL,
         retries=1,
+        cache=config.GEMINI_CACHE,
     )
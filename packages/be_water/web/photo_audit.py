@@ -25,6 +25,7 @@ from typing import Optional
 import requests
 from PIL import Image
 
+from core.sdk import http
 from core.utils import get_logger
 from packages.be_water.web import photos, repository
 from packages.be_water.web.domain import Water
@@ -60,7 +61,7 @@ class PhotoStatus:
 
 
 def fetch_image(url: str, timeout: int = 20) -> bytes:
-    resp = requests.get(url, timeout=timeout)
+    resp = http.get(url, timeout=timeout)
     resp.raise_for_status()
     return resp.content
 
@@ -13,7 +13,7 @@ import google.auth.transport.requests
 import requests
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
-from core.sdk import gemini
+from core.sdk import gemini, http
 from core.utils import get_logger
 from packages.be_water.web import config
 
@@ -63,6 +63,7 @@ def studio_photo(raw_photo: bytes) -> bytes:
         prompt=_STUDIO_PROMPT,
         image_bytes=raw_photo,
         model=config.GEMINI_IMAGE_MODEL,
+        cache=config.GEMINI_CACHE,
     )
     img = Image.open(io.BytesIO(cutout)).convert("RGB")
     img.thumbnail((int(STUDIO_SIZE * 0.86), int(STUDIO_SIZE * 0.86)))
@@ -117,7 +118,7 @@ def _auth_header() -> dict:
 
 def upload_photo(object_name: str, data: bytes) -> str:
     """Upload JPEG bytes; returns the public URL."""
-    response = requests.post(
+    response = http.post(
         f"{_STORAGE_API}/upload/storage/v1/b/{config.PHOTOS_BUCKET}/o",
         params={"uploadType": "media", "name": object_name},
         headers={**_auth_header(), "Content-Type": "image/jpeg"},
@@ -133,7 +134,7 @@ def delete_object(object_name: str) -> None:
     """Best-effort delete of a bucket object; logs but never raises — a
     leftover object is orphaned bytes, not a correctness failure."""
     try:
-        requests.delete(
+        http.delete(
             f"{_STORAGE_API}/storage/v1/b/{config.PHOTOS_BUCKET}/o/"
             f"{requests.utils.quote(object_name, safe='')}",
             headers=_auth_header(),
@@ -145,7 +146,7 @@ def delete_object(object_name: str) -> None:
 
 def promote_photo(tmp_name: str, final_name: str) -> str:
     """Server-side copy tmp → final, best-effort delete of tmp."""
-    response = requests.post(
+    response = http.post(
         f"{_STORAGE_API}/storage/v1/b/{config.PHOTOS_BUCKET}/o/"
         f"{requests.utils.quote(tmp_name, safe='')}/copyTo/b/"
         f"{config.PHOTOS_BUCKET}/o/{requests.utils.quote(final_name, safe='')}",
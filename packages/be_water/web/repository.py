@@ -7,8 +7,21 @@ Collections (project `be-water-app`):
                        — snapshot of a water taken just before a contribution
                          overwrote its composition, so a bad edit can be undone
                          (scripts/revert_water.py)
+    meta/catalog       — {"version": token, "changed_at": iso}; bumped on
+                         every catalog write so other instances notice it
+
+The catalog is cached per instance. Every write to `waters` drops the local
+copy and bumps `meta/catalog`; other instances read that one document at most
+every CATALOG_RECHECK_SECONDS and reload only when its version moved. A page
+view therefore costs no reads at all most of the time, instead of streaming
+the whole catalog, and a write made elsewhere shows up within the recheck
+window.
 """
 
+import threading
+import time
+import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from core.sdk import firestore
@@ -20,17 +33,80 @@ logger = get_logger(__name__)
 WATERS = "waters"
 USERS = "users"
 REVISIONS = "water_revisions"
+META = "meta"
+CATALOG_VERSION_DOC = "catalog"
+
+# Longest a cached catalog is served without asking whether it changed — the
+# staleness bound for writes made by another instance (or a script).
+CATALOG_RECHECK_SECONDS = 30
+
+
+@dataclass
+class _CatalogSnapshot:
+    waters: list[Water]
+    version: str | None
+    checked_at: float
+
+
+_CATALOG: _CatalogSnapshot | None = None
+_CATALOG_LOCK = threading.Lock()
 
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def reset_catalog_cache() -> None:
+    """Drop this instance's cached catalog so the next read reloads it."""
+    global _CATALOG
+    with _CATALOG_LOCK:
+        _CATALOG = None
+
+
+def _stored_catalog_version() -> str | None:
+    return (firestore.get_document(META, CATALOG_VERSION_DOC) or {}).get("version")
+
+
+def bump_catalog_version() -> None:
+    """Record that `waters` changed: locally now, elsewhere on their recheck.
+
+    Called by every writer in this module. Code that writes `waters` through
+    the SDK directly (the catalog sync) must call it too.
+    """
+    reset_catalog_cache()
+    firestore.set_document(
+        META,
+        CATALOG_VERSION_DOC,
+        {"version": uuid.uuid4().hex, "changed_at": _now_iso()},
+    )
+
+
 def get_all_waters() -> list[Water]:
-    return [
-        Water.from_firestore(doc_id, data)
-        for doc_id, data in firestore.list_documents(WATERS)
-    ]
+    """The whole catalog, served from the instance cache when it is current.
+
+    The version is read before the collection, so a write that lands while
+    the catalog streams leaves an older version cached and the next recheck
+    reloads. Without a version document (nothing written since the cache
+    shipped) the snapshot is only trusted for the recheck window. The list is
+    a copy; the `Water`s are shared and must not be mutated by callers.
+    """
+    global _CATALOG
+    with _CATALOG_LOCK:
+        now = time.monotonic()
+        snapshot = _CATALOG
+        if snapshot and now - snapshot.checked_at < CATALOG_RECHECK_SECONDS:
+            return list(snapshot.waters)
+        version = _stored_catalog_version()
+        if snapshot and version is not None and version == snapshot.version:
+            snapshot.checked_at = now
+            return list(snapshot.waters)
+        waters = [
+            Water.from_firestore(doc_id, data)
+            for doc_id, data in firestore.list_documents(WATERS)
+        ]
+        _CATALOG = _CatalogSnapshot(waters=waters, version=version, checked_at=now)
+        logger.info("Catalog loaded.", extra={"count": len(waters), "version": version})
+        return list(waters)
 
 
 def get_water(water_id: str) -> Water | None:
@@ -40,6 +116,7 @@ def get_water(water_id: str) -> Water | None:
 
 def save_water(water: Water) -> None:
     firestore.set_document(WATERS, water.id, water.to_firestore())
+    bump_catalog_version()
     logger.info("Water saved.", extra={"water_id": water.id})
 
 
@@ -83,15 +160,18 @@ def delete_revision(revision_id: str) -> None:
 def set_water_sources(water_id: str, sources: dict) -> None:
     """Update only the provenance map, leaving the rest of the doc untouched."""
     firestore.set_document(WATERS, water_id, {"sources": sources}, merge=True)
+    bump_catalog_version()
 
 
 def set_water_community(water_id: str, community: str) -> None:
     """Update only the community, leaving the rest of the doc untouched."""
     firestore.set_document(WATERS, water_id, {"community": community}, merge=True)
+    bump_catalog_version()
 
 
 def delete_water(water_id: str) -> None:
     firestore.delete_document(WATERS, water_id)
+    bump_catalog_version()
     logger.info("Water deleted.", extra={"water_id": water_id})
 
 
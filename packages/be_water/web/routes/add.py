@@ -1,10 +1,19 @@
 """The add-water flow: photo upload + OCR, then the reviewed submission."""
 
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
 import requests
-from flask import abort, redirect, render_template, request, session, url_for
+from flask import (
+    abort,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    session,
+    url_for,
+)
 
 from core.sdk.gemini import GeminiError
 from core.utils import get_logger
@@ -17,6 +26,7 @@ from packages.be_water.web import (
     label_ocr,
     photos,
     repository,
+    studio_jobs,
     submission,
 )
 from packages.be_water.web.domain import MINERAL_FIELDS
@@ -34,6 +44,7 @@ def _render_add_form(
     similar=None,
     stale_warning=None,
     merge_into=None,
+    studio_job=None,
 ):
     return render_template(
         "add.html",
@@ -47,6 +58,7 @@ def _render_add_form(
         similar=similar,
         stale_warning=stale_warning,
         merge_into=merge_into,
+        studio_job=studio_job,
         meta_description="Añade una nueva agua al catálogo con su etiqueta.",
     )
 
@@ -238,6 +250,28 @@ def _prefill_from_aesan(prefill: dict) -> str:
     return " Procedencia completada del registro AESAN 📋" if filled else ""
 
 
+def _upload_display(photo_tmp: str, display_src: bytes, studio: bool) -> str:
+    """Upload the display photo, through the studio first when `studio`.
+
+    Returns the note for the form. Studio version for display is admin-only:
+    image generation is the one paid call in the project, so it fires only
+    for trusted nicknames. Everyone else keeps the (free) OCR prefill and
+    their raw photo — as does an admin whose studio call fails.
+    """
+    display, note = display_src, ""
+    if studio:
+        try:
+            display = photos.studio_photo(display_src)
+            note = " La foto ha pasado por el estudio 📸"
+        except (GeminiError, requests.RequestException) as exc:
+            logger.warning(
+                "Studio photo failed — using raw.", extra={"error": str(exc)[:300]}
+            )
+            note = " El estudio no pudo retocar la foto; se guarda la original."
+    photos.upload_photo(photo_tmp, display)
+    return note
+
+
 def add_water_photo():
     """Photo-first flow: the composition shot feeds the OCR and stays as
     verification proof; an optional front shot becomes the display photo."""
@@ -258,17 +292,9 @@ def add_water_photo():
     if len(raw) > photos.MAX_UPLOAD_BYTES:
         return _render_add_form(error="La foto es demasiado grande (máx. 15 MB).")
 
-    processed = photos.process_image(raw)
-    uid = uuid.uuid4().hex
-    # Both tmps live under uploads/ so the bucket lifecycle rule reclaims
-    # abandoned forms; on save the label shot is promoted to originals/
-    # as the permanent verification proof.
-    label_tmp = f"uploads/{uid}-label.jpg"
-    photos.upload_photo(label_tmp, processed)
-
-    # The display photo prefers the optional front shot — a composition
-    # label is usually the ugly side of the bottle.
-    display_src = processed
+    # Read the optional front shot before any work starts, so a refusal
+    # does not leave an upload and two model calls running behind it.
+    beauty_raw = None
     beauty = request.files.get("beauty")
     if beauty is not None and beauty.filename:
         beauty_raw = beauty.read(photos.MAX_UPLOAD_BYTES + 1)
@@ -276,31 +302,51 @@ def add_water_photo():
             return _render_add_form(
                 error="La foto de la ficha es demasiado grande (máx. 15 MB)."
             )
-        display_src = photos.process_image(beauty_raw)
 
-    # Studio version for display — admin-only: image generation is the one
-    # paid call in the project, so it fires only for trusted nicknames.
-    # Everyone else keeps the (free) OCR prefill and their raw photo.
-    display = display_src
+    processed = photos.process_image(raw)
+    # The display photo prefers the optional front shot — a composition
+    # label is usually the ugly side of the bottle.
+    display_src = processed if beauty_raw is None else photos.process_image(beauty_raw)
+    uid = uuid.uuid4().hex
+    # Both tmps live under uploads/ so the bucket lifecycle rule reclaims
+    # abandoned forms; on save the label shot is promoted to originals/
+    # as the permanent verification proof.
+    label_tmp = f"uploads/{uid}-label.jpg"
+    photo_tmp = f"uploads/{uid}.jpg"
+    admin = session["nickname"] in config.ADMIN_NICKNAMES
+
+    # In async mode the studio photo is made after the response, and the
+    # form swaps it in when it is ready; the request only uploads the raw.
+    studio_inline = admin and config.STUDIO_MODE == "sync"
+    studio_job = None
     studio_note = ""
-    if session["nickname"] in config.ADMIN_NICKNAMES:
+    if admin and not studio_inline:
+        if studio_jobs.submit(uid, display_src):
+            studio_job = uid
+            studio_note = " El estudio está retocando la foto; cambiará sola 📸"
+        else:
+            studio_note = " El estudio está ocupado; se guarda la original."
+
+    # The label upload, the OCR and the display photo (after the studio
+    # cutout, in sync mode) are independent, so they run side by side: the
+    # user waits for the slowest one instead of their sum.
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="add-photo") as pool:
+        label_upload = pool.submit(photos.upload_photo, label_tmp, processed)
+        display_upload = pool.submit(
+            _upload_display, photo_tmp, display_src, studio_inline
+        )
+        ocr = pool.submit(label_ocr.extract_label, processed)
+        label_upload.result()
+        studio_note += display_upload.result()
         try:
-            display = photos.studio_photo(display_src)
-            studio_note = " La foto ha pasado por el estudio 📸"
+            extracted, ocr_error = ocr.result(), None
         except (GeminiError, requests.RequestException) as exc:
-            logger.warning(
-                "Studio photo failed — using raw.", extra={"error": str(exc)[:300]}
-            )
-            studio_note = " El estudio no pudo retocar la foto; se guarda la original."
-    photo_tmp = f"uploads/{uid}.jpg"
-    photos.upload_photo(photo_tmp, display)
+            extracted, ocr_error = None, exc
 
-    try:
-        extracted = label_ocr.extract_label(processed)
-    except (GeminiError, requests.RequestException) as exc:
-        logger.warning("Label OCR failed.", extra={"error": str(exc)[:300]})
+    if ocr_error is not None:
+        logger.warning("Label OCR failed.", extra={"error": str(ocr_error)[:300]})
         # OCR down ≠ photo lost: open the empty form with the photo attached.
-        overloaded = getattr(exc, "status_code", None) in (429, 503)
+        overloaded = getattr(ocr_error, "status_code", None) in (429, 503)
         error = (
             "El lector de etiquetas está saturado ahora mismo — "
             "prueba de nuevo en unos minutos, o rellena a mano."
@@ -311,6 +357,7 @@ def add_water_photo():
             photo_tmp=photo_tmp,
             label_tmp=label_tmp,
             error=error,
+            studio_job=studio_job,
         )
     prefill = {k: v for k, v in extracted.items() if v is not None}
     aesan_note = _prefill_from_aesan(prefill)
@@ -325,11 +372,26 @@ def add_water_photo():
         notice="He leído la etiqueta — revisa los valores antes de guardar."
         + studio_note
         + aesan_note,
+        studio_job=studio_job,
     )
 
 
+def studio_status(job_id):
+    """What the add form polls while a studio job runs: `pending`, `failed`,
+    or `done` with the tmp object and URL to swap in."""
+    if not session.get("nickname"):
+        abort(404)
+    status = studio_jobs.status(job_id)
+    if status is None:
+        abort(404)
+    if status["state"] == "done":
+        status["photo_url"] = photos.public_url(status["photo_tmp"])
+    return jsonify(status)
+
+
 def register(app):
     app.add_url_rule("/anadir", "add_water", add_water, methods=["GET", "POST"])
     app.add_url_rule(
         "/anadir/foto", "add_water_photo", add_water_photo, methods=["POST"]
     )
+    app.add_url_rule("/anadir/estudio/<job_id>", "studio_status", studio_status)
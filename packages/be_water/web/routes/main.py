@@ -203,15 +203,9 @@ def profile():
     traits = similarity.profile_traits(described, catalog) if described else []
     matches = []
     if centroid:
-        fav_ids = {w.id for w in favorites}
-        scored = [
-            (w, similarity.distance(centroid, w.minerals))
-            for w in catalog
-            if w.id not in fav_ids
-        ]
-        scored = [(w, d) for w, d in scored if d != float("inf")]
-        scored.sort(key=lambda t: t[1])
-        matches = scored[:6]
+        matches = similarity.closest_to_centroid(
+            catalog, centroid, exclude_ids={w.id for w in favorites}, top_n=6
+        )
     return render_template(
         "profile.html",
         favorites=favorites,
@@ -3,11 +3,21 @@
 Log10 because mineral ranges span orders of magnitude (Na goes 0-1200 mg/L,
 Mg 0-130): a 100 mg gap means nothing in TDS and everything in sodium.
 TDS weighs double — it is the one-number summary of a water's character.
+
+`distance` is the definition. Pages go through a `SimilarityIndex` instead:
+the catalog's log vectors in one NumPy array, built once per catalog (the
+repository hands out the same `Water` objects until the catalog changes), so
+a centroid query is a single vectorized pass and a water's neighbours are a
+lookup. Both compute the same distance, `MIN_SHARED_FIELDS` cut-off and
+shared-field normalisation included.
 """
 
 import math
+import threading
 from typing import Optional
 
+import numpy as np
+
 from packages.be_water.web import geo
 from packages.be_water.web.domain import Water
 
@@ -45,16 +55,162 @@ def distance(a: dict, b: dict) -> float:
     return math.sqrt(sum(diffs) / len(diffs))
 
 
+_WEIGHTS = np.array([weight for _, weight in _VECTOR_FIELDS])
+
+# Neighbours kept per water; the detail page shows three.
+NEIGHBOURS_PER_WATER = 8
+
+
+def _log_vector(minerals: dict) -> np.ndarray:
+    """`log10(v + 1)` per vector field, NaN where the value is undeclared."""
+    return np.array(
+        [
+            math.log10(minerals[f] + 1) if minerals.get(f) is not None else np.nan
+            for f, _ in _VECTOR_FIELDS
+        ]
+    )
+
+
+class SimilarityIndex:
+    """The catalog as a `(waters × fields)` array of log values.
+
+    Undeclared values are NaN and `declared` masks them, so a comparison only
+    ever counts the fields both sides declare — exactly what `distance` does
+    one pair at a time.
+    """
+
+    def __init__(self, catalog: list[Water]):
+        self.waters = list(catalog)
+        self._position = {id(w): i for i, w in enumerate(self.waters)}
+        self._logs = (
+            np.vstack([_log_vector(w.minerals) for w in self.waters])
+            if self.waters
+            else np.empty((0, len(_VECTOR_FIELDS)))
+        )
+        self._declared = ~np.isnan(self._logs)
+        self._neighbours: Optional[list[list[tuple[int, float]]]] = None
+        self._lock = threading.Lock()
+
+    def is_for(self, catalog: list[Water]) -> bool:
+        """Built from these very `Water` objects, in this order?"""
+        return len(catalog) == len(self.waters) and all(
+            a is b for a, b in zip(catalog, self.waters)
+        )
+
+    def rows(self, waters: list[Water]) -> Optional[list[int]]:
+        """Positions of `waters` in the index, or None if any is not in it."""
+        rows = [self._position.get(id(w)) for w in waters]
+        if any(r is None or self.waters[r] is not w for r, w in zip(rows, waters)):
+            return None
+        return rows
+
+    def _distances(self, logs: np.ndarray, declared: np.ndarray) -> np.ndarray:
+        """`distance` from one log vector to every water in the index."""
+        shared = self._declared & declared
+        diffs = np.where(shared, (logs - self._logs) * _WEIGHTS, 0.0)
+        counts = shared.sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.sqrt((diffs**2).sum(axis=1) / counts)
+        out[counts < MIN_SHARED_FIELDS] = np.inf
+        return out
+
+    def distances_to(self, minerals: dict) -> np.ndarray:
+        logs = _log_vector(minerals)
+        return self._distances(logs, ~np.isnan(logs))
+
+    def neighbours(self, row: int) -> list[tuple[int, float]]:
+        """The water's closest comparable others, closest first.
+
+        Computed for the whole catalog on first use and kept with the index.
+        """
+        with self._lock:
+            if self._neighbours is None:
+                self._neighbours = [
+                    self._closest(
+                        self._distances(self._logs[i], self._declared[i]),
+                        NEIGHBOURS_PER_WATER,
+                        exclude=self._same_id(i),
+                    )
+                    for i in range(len(self.waters))
+                ]
+        return self._neighbours[row]
+
+    def _same_id(self, row: int) -> set[int]:
+        water_id = self.waters[row].id
+        return {i for i, w in enumerate(self.waters) if w.id == water_id}
+
+    @staticmethod
+    def _closest(
+        distances: np.ndarray, top_n: Optional[int], exclude=()
+    ) -> list[tuple[int, float]]:
+        """Finite distances, closest first; ties keep catalog order."""
+        order = np.argsort(distances, kind="stable")
+        out = []
+        for i in order:
+            d = float(distances[i])
+            if not math.isfinite(d):
+                break
+            if int(i) in exclude:
+                continue
+            out.append((int(i), d))
+            if top_n is not None and len(out) == top_n:
+                break
+        return out
+
+    def closest_to(
+        self, minerals: dict, top_n: Optional[int] = None, exclude_ids=()
+    ) -> list[tuple[Water, float]]:
+        """Comparable waters closest-first to a mineral profile."""
+        excluded = {i for i, w in enumerate(self.waters) if w.id in exclude_ids}
+        return [
+            (self.waters[i], d)
+            for i, d in self._closest(self.distances_to(minerals), top_n, excluded)
+        ]
+
+
+_INDEX: Optional[SimilarityIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def index_for(catalog: list[Water]) -> SimilarityIndex:
+    """The index of `catalog`, rebuilt only when the catalog changed."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None or not _INDEX.is_for(catalog):
+            _INDEX = SimilarityIndex(catalog)
+        return _INDEX
+
+
+def _index_covering(waters: list[Water]) -> tuple[SimilarityIndex, list[int]]:
+    """The current catalog index when it holds `waters`, else a throwaway one."""
+    index = _INDEX
+    rows = index.rows(waters) if index is not None else None
+    if rows is None:
+        index = SimilarityIndex(waters)
+        rows = list(range(len(waters)))
+    return index, rows
+
+
 def similar_waters(
     target: Water, catalog: list[Water], top_n: int = 3
 ) -> list[tuple[Water, float]]:
     """Closest waters to `target` in the catalog (excluding itself)."""
-    scored = [
-        (w, distance(target.minerals, w.minerals)) for w in catalog if w.id != target.id
-    ]
-    scored = [(w, d) for w, d in scored if math.isfinite(d)]
-    scored.sort(key=lambda t: t[1])
-    return scored[:top_n]
+    index = index_for(catalog)
+    rows = index.rows([target])
+    if rows is not None and top_n <= NEIGHBOURS_PER_WATER:
+        return [(index.waters[i], d) for i, d in index.neighbours(rows[0])[:top_n]]
+    return index.closest_to(target.minerals, top_n, exclude_ids={target.id})
+
+
+def closest_to_centroid(
+    catalog: list[Water], centroid: dict, exclude_ids=(), top_n: int = 6
+) -> list[tuple[Water, float]]:
+    """Comparable catalog waters closest to a favourites centroid.
+
+    One vectorized pass over the catalog index; `exclude_ids` drops the
+    favourites themselves.
+    """
+    return index_for(catalog).closest_to(centroid, top_n, exclude_ids=exclude_ids)
 
 
 def favorites_centroid(favorites: list[Water]) -> Optional[dict]:
@@ -198,7 +354,11 @@ def rank_by_centroid(waters: list[Water], centroid: dict) -> list[Water]:
     region, and a region's water disappearing from it is a worse answer than
     an unranked one.
     """
-    scored = [(w, distance(centroid, w.minerals)) for w in waters]
-    comparable = sorted((t for t in scored if math.isfinite(t[1])), key=lambda t: t[1])
-    incomparable = by_mineralization([w for w, d in scored if not math.isfinite(d)])
-    return [w for w, _ in comparable] + incomparable
+    index, rows = _index_covering(waters)
+    distances = index.distances_to(centroid)[rows]
+    order = np.argsort(distances, kind="stable")
+    comparable = [waters[i] for i in order if math.isfinite(distances[i])]
+    incomparable = by_mineralization(
+        [w for w, d in zip(waters, distances) if not math.isfinite(d)]
+    )
+    return comparable + incomparable
@@ -0,0 +1,138 @@
+"""Studio photos made in the background, and the status the add form polls.
+
+`photos.studio_photo` is an image-model call that can run past a minute.
+Inside the add-photo request it held a gunicorn worker for all of it; here
+the request uploads the raw photo, opens the form with it, and hands the
+studio work to a small thread pool. The form polls `status()` through
+`GET /anadir/estudio/<job_id>` and swaps the photo in once it is ready.
+
+- `submit()` — start a job for an upload id; False when the pool is full.
+- `status()` — `pending`, `done` (with the studio tmp object) or `failed`.
+- `reset()` — forget every job and the pool. Tests only.
+
+The studio image goes to its own tmp object, `uploads/{id}-studio.jpg`, so
+the raw one stays valid whatever the form does meanwhile: a contributor who
+saves before the studio finishes keeps the raw photo, and the studio object
+is left for the bucket's lifecycle rule like any abandoned upload.
+
+Job state lives in this instance's memory. A poll that lands on another
+instance looks for the studio object in the bucket instead, so a finished
+job is found anywhere; an unfinished one reads as pending there, and the
+form stops polling after a couple of minutes and keeps the raw photo.
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from core.sdk import http
+from core.sdk.gemini import GeminiError
+from core.utils import get_logger
+from packages.be_water.web import config, photos
+
+logger = get_logger(__name__)
+
+# Upload ids are `uuid4().hex`; anything else never names a job.
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+# Finished jobs are forgotten after this long; the form has stopped asking.
+_KEEP_SECONDS = 3600
+
+_lock = threading.Lock()
+_pool: ThreadPoolExecutor | None = None
+_jobs: dict[str, dict] = {}
+
+
+def studio_tmp(job_id: str) -> str:
+    """The tmp object a job writes its studio photo to."""
+    return f"uploads/{job_id}-studio.jpg"
+
+
+def _run(job_id: str, display_src: bytes) -> None:
+    try:
+        studio = photos.studio_photo(display_src)
+        photos.upload_photo(studio_tmp(job_id), studio)
+        state = "done"
+    except (GeminiError, requests.RequestException) as exc:
+        logger.warning(
+            "Studio job failed — keeping raw.",
+            extra={"job_id": job_id, "error": str(exc)[:300]},
+        )
+        state = "failed"
+    except Exception:
+        logger.exception("Studio job crashed.", extra={"job_id": job_id})
+        state = "failed"
+    with _lock:
+        _jobs[job_id].update(state=state, finished=time.monotonic())
+    logger.info("Studio job finished.", extra={"job_id": job_id, "state": state})
+
+
+def _prune(now: float) -> None:
+    for job_id in [
+        j
+        for j, job in _jobs.items()
+        if job.get("finished") and now - job["finished"] > _KEEP_SECONDS
+    ]:
+        del _jobs[job_id]
+
+
+def submit(job_id: str, display_src: bytes) -> bool:
+    """Start the studio photo for upload `job_id` in the background.
+
+    False when `STUDIO_QUEUE_MAX` jobs are already waiting or running on
+    this instance: the caller keeps the raw photo rather than queue behind
+    minutes of image calls.
+    """
+    global _pool
+    with _lock:
+        now = time.monotonic()
+        _prune(now)
+        active = sum(1 for job in _jobs.values() if job["state"] == "pending")
+        if active >= config.STUDIO_QUEUE_MAX:
+            logger.warning("Studio queue full; job refused.", extra={"active": active})
+            return False
+        # Started on first use, never at import: gunicorn forks after it.
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=config.STUDIO_WORKERS, thread_name_prefix="studio"
+            )
+        _jobs[job_id] = {"state": "pending", "started": now}
+        _pool.submit(_run, job_id, display_src)
+    logger.info("Studio job queued.", extra={"job_id": job_id, "active": active + 1})
+    return True
+
+
+def _in_bucket(object_name: str) -> bool:
+    """Whether a finished job's object exists, for a job this instance never
+    saw. The bucket is public, so a HEAD on the public URL answers."""
+    try:
+        return http.head(photos.public_url(object_name), timeout=5).ok
+    except requests.RequestException:
+        return False
+
+
+def status(job_id: str) -> dict | None:
+    """`{"state": ...}` for a job, plus `photo_tmp` once done. None for an
+    id that cannot be a job."""
+    if not _JOB_ID.match(job_id or ""):
+        return None
+    with _lock:
+        job = dict(_jobs.get(job_id) or {})
+    state = job.get("state")
+    if state is None:
+        state = "done" if _in_bucket(studio_tmp(job_id)) else "pending"
+    if state == "done":
+        return {"state": state, "photo_tmp": studio_tmp(job_id)}
+    return {"state": state}
+
+
+def reset() -> None:
+    """Forget every job and drop the pool. Tests only."""
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+        _jobs.clear()
+    if pool is not None:
+        pool.shutdown(wait=True)
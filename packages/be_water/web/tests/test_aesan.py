@@ -38,3 +38,27 @@ def test_pending_length_matches_coverage_gap():
         summary = aesan.coverage(["Bezoya"])
         pending = aesan.pending_waters(["Bezoya"])
     assert len(pending) == summary["total"] - summary["covered"]
+
+
+def test_indexed_matches_equal_a_scan_of_the_registry():
+    """The inverted index only narrows the candidates; the answer for every
+    registry name (and a few partial ones) is what a full scan gives."""
+    from packages.be_water.web.aesan_snapshot import AESAN_WATERS
+
+    def scan(name):
+        tokens = aesan._tokens(name)
+        return [
+            e
+            for e in AESAN_WATERS
+            if (t := aesan._tokens(e["name"])) and (tokens <= t or t <= tokens)
+        ]
+
+    probes = [e["name"] for e in AESAN_WATERS] + ["agua", "font", "Font-Vella Sacalm"]
+    for name in probes:
+        assert aesan.registry_matches(name) == scan(name)
+
+
+def test_pending_follows_a_swapped_registry():
+    with _with_registry():
+        assert len(aesan.pending_waters([])) == 3
+    assert len(aesan.pending_waters([])) > 3  # the real snapshot again
@@ -2,10 +2,20 @@
 
 from unittest.mock import patch
 
+import pytest
+
 from packages.be_water.web import catalog_sync
 
 _MOD = "packages.be_water.web.catalog_sync"
 
+
+@pytest.fixture(autouse=True)
+def _no_version_bump():
+    """The catalog version lives in Firestore too; keep it off the wire."""
+    with patch(f"{_MOD}.bump_catalog_version") as bump:
+        yield bump
+
+
 _DATASET = [
     {
         "id": "solan-de-cabras",
@@ -29,8 +39,8 @@ def _run(existing: dict):
     with patch(f"{_MOD}.SEED_WATERS", _DATASET), patch(
         f"{_MOD}.firestore.list_documents", return_value=list(existing.items())
     ), patch(
-        f"{_MOD}.firestore.set_document",
-        side_effect=lambda col, doc_id, data: written.__setitem__(doc_id, data),
+        f"{_MOD}.firestore.batch_write",
+        side_effect=lambda col, docs: written.update(docs),
     ):
         summary = catalog_sync.sync_catalog()
     return summary, written
@@ -89,8 +99,8 @@ def test_dataset_verified_flag_promotes_existing_entry():
     with patch(f"{_MOD}.SEED_WATERS", dataset), patch(
         f"{_MOD}.firestore.list_documents", return_value=list(existing.items())
     ), patch(
-        f"{_MOD}.firestore.set_document",
-        side_effect=lambda col, doc_id, data: written.__setitem__(doc_id, data),
+        f"{_MOD}.firestore.batch_write",
+        side_effect=lambda col, docs: written.update(docs),
     ):
         catalog_sync.sync_catalog()
     assert written["bezoya"]["verified"] is True
@@ -112,8 +122,8 @@ def test_verified_doc_gets_photo_enrichment_only():
     with patch(f"{_MOD}.SEED_WATERS", dataset), patch(
         f"{_MOD}.firestore.list_documents", return_value=list(existing.items())
     ), patch(
-        f"{_MOD}.firestore.set_document",
-        side_effect=lambda col, doc_id, data: written.__setitem__(doc_id, data),
+        f"{_MOD}.firestore.batch_write",
+        side_effect=lambda col, docs: written.update(docs),
     ):
         catalog_sync.sync_catalog()
     assert written["bezoya"]["photo_url"] == "https://x/bezoya.jpg"
@@ -131,8 +141,8 @@ def test_verified_doc_gets_mentions_enrichment():
     with patch(f"{_MOD}.SEED_WATERS", dataset), patch(
         f"{_MOD}.firestore.list_documents", return_value=list(existing.items())
     ), patch(
-        f"{_MOD}.firestore.set_document",
-        side_effect=lambda col, doc_id, data: written.__setitem__(doc_id, data),
+        f"{_MOD}.firestore.batch_write",
+        side_effect=lambda col, docs: written.update(docs),
     ):
         catalog_sync.sync_catalog()
     assert written["bezoya"]["mentions"] == mention
@@ -213,3 +223,14 @@ def test_notify_sent_with_creds(monkeypatch):
         _run(existing={})
     mock_send.assert_called_once()
     assert "Nuevas (2)" in mock_send.call_args.kwargs["text"]
+
+
+def test_a_sync_that_writes_bumps_the_catalog_version(_no_version_bump):
+    _run(existing={})
+    _no_version_bump.assert_called_once_with()
+
+
+def test_a_noop_sync_leaves_the_catalog_version_alone(_no_version_bump):
+    _, written = _run(existing={})
+    _run(existing=written)
+    assert _no_version_bump.call_count == 1
@@ -0,0 +1,121 @@
+"""The per-instance catalog cache in `repository.get_all_waters`."""
+
+from unittest.mock import patch
+
+import pytest
+
+from packages.be_water.web import repository
+
+_FS = "packages.be_water.web.repository.firestore"
+
+
+class _FakeFirestore:
+    """Just enough of the SDK: a `waters` collection and the version doc."""
+
+    def __init__(self):
+        self.waters = {"solan": {"name": "Solán"}}
+        self.version = "v1"
+        self.catalog_reads = 0
+        self.version_reads = 0
+
+    def list_documents(self, collection):
+        self.catalog_reads += 1
+        return list(self.waters.items())
+
+    def get_document(self, collection, doc_id):
+        self.version_reads += 1
+        return {"version": self.version} if self.version else None
+
+    def set_document(self, collection, doc_id, data, merge=False):
+        if collection == repository.META:
+            self.version = data["version"]
+        else:
+            self.waters[doc_id] = data
+
+    def delete_document(self, collection, doc_id):
+        self.waters.pop(doc_id, None)
+
+
+@pytest.fixture
+def fs():
+    fake = _FakeFirestore()
+    repository.reset_catalog_cache()
+    with patch(_FS, fake):
+        yield fake
+    repository.reset_catalog_cache()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(repository.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_repeat_reads_inside_the_window_cost_nothing(fs, clock):
+    repository.get_all_waters()
+    clock[0] += repository.CATALOG_RECHECK_SECONDS - 1
+    names = [w.name for w in repository.get_all_waters()]
+
+    assert names == ["Solán"]
+    assert (fs.catalog_reads, fs.version_reads) == (1, 1)
+
+
+def test_an_unchanged_version_is_one_read_not_a_reload(fs, clock):
+    repository.get_all_waters()
+    clock[0] += repository.CATALOG_RECHECK_SECONDS
+    repository.get_all_waters()
+
+    assert (fs.catalog_reads, fs.version_reads) == (1, 2)
+
+
+def test_a_write_elsewhere_shows_up_after_the_recheck(fs, clock):
+    repository.get_all_waters()
+    fs.waters["bezoya"] = {"name": "Bezoya"}  # another instance's save
+    fs.version = "v2"
+    assert len(repository.get_all_waters()) == 1  # still inside the window
+
+    clock[0] += repository.CATALOG_RECHECK_SECONDS
+    assert len(repository.get_all_waters()) == 2
+
+
+@pytest.mark.parametrize(
+    "write",
+    [
+        lambda: repository.save_water(
+            repository.Water(
+                id="bezoya",
+                name="Bezoya",
+                brand="Bezoya",
+                spring="",
+                province="Segovia",
+                community="Castilla y León",
+            )
+        ),
+        lambda: repository.delete_water("solan"),
+        lambda: repository.set_water_sources("solan", {"tds": "label"}),
+        lambda: repository.set_water_community("solan", "Castilla-La Mancha"),
+    ],
+)
+def test_local_writes_invalidate_at_once_and_bump_the_version(fs, clock, write):
+    repository.get_all_waters()
+    write()
+
+    repository.get_all_waters()
+
+    assert fs.catalog_reads == 2
+    assert fs.version != "v1"
+
+
+def test_without_a_version_doc_the_window_alone_bounds_staleness(fs, clock):
+    fs.version = None
+    repository.get_all_waters()
+    clock[0] += repository.CATALOG_RECHECK_SECONDS
+    repository.get_all_waters()
+
+    assert fs.catalog_reads == 2
+
+
+def test_callers_get_their_own_list(fs, clock):
+    repository.get_all_waters().clear()
+    assert len(repository.get_all_waters()) == 1
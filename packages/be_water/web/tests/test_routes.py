@@ -367,6 +367,16 @@ def _login(client):
         client.post("/login", data={"nickname": "jorge"})
 
 
+def _uploads(mock_upload):
+    """`(label_call, display_call)` of an add-photo request. They run side by
+    side, so the order they were called in means nothing."""
+    calls = mock_upload.call_args_list
+    label = [c for c in calls if c.args[0].endswith("-label.jpg")]
+    display = [c for c in calls if not c.args[0].endswith("-label.jpg")]
+    assert len(label) == len(display) == 1
+    return label[0], display[0]
+
+
 def test_add_water_requires_login(client):
     resp = client.get("/anadir")
     assert resp.status_code == 302
@@ -746,8 +756,10 @@ def test_slug_strips_accents_so_dedup_catches_lanjaron(client):
 def test_photo_flow_prefills_form_and_runs_studio(client):
     _login(client)
     with patch(f"{_APP}.config.ADMIN_NICKNAMES", {"jorge"}), patch(
-        f"{_APP}.photos.process_image", return_value=b"jpg"
-    ), patch(f"{_APP}.photos.studio_photo", return_value=b"studio"), patch(
+        f"{_APP}.config.STUDIO_MODE", "sync"
+    ), patch(f"{_APP}.photos.process_image", return_value=b"jpg"), patch(
+        f"{_APP}.photos.studio_photo", return_value=b"studio"
+    ), patch(
         f"{_APP}.photos.upload_photo"
     ) as mock_upload, patch(
         f"{_APP}.label_ocr.extract_label",
@@ -769,12 +781,10 @@ def test_photo_flow_prefills_form_and_runs_studio(client):
     # Two uploads, both under uploads/ so the lifecycle rule reclaims
     # abandoned forms: {uid}-label.jpg (raw proof) + {uid}.jpg (studio).
     assert mock_upload.call_count == 2
-    names = [c.args[0] for c in mock_upload.call_args_list]
-    assert names[0].startswith("uploads/")
-    assert names[0].endswith("-label.jpg")
-    assert names[1].startswith("uploads/")
-    assert not names[1].endswith("-label.jpg")
-    assert mock_upload.call_args_list[1].args[1] == b"studio"
+    label_call, display_call = _uploads(mock_upload)
+    assert label_call.args[0].startswith("uploads/")
+    assert display_call.args[0].startswith("uploads/")
+    assert display_call.args[1] == b"studio"
 
 
 def test_beauty_photo_becomes_the_display_shot(client):
@@ -798,7 +808,7 @@ def test_beauty_photo_becomes_the_display_shot(client):
         )
     assert resp.status_code == 200
     assert mock_upload.call_count == 2
-    label_call, display_call = mock_upload.call_args_list
+    label_call, display_call = _uploads(mock_upload)
     assert label_call.args[0].endswith("-label.jpg")
     assert label_call.args[1] == b"label"
     assert display_call.args[1] == b"front"
@@ -874,7 +884,7 @@ def test_non_admin_upload_skips_studio_but_keeps_ocr(client):
     assert resp.status_code == 200
     mock_studio.assert_not_called()
     assert 'value="Font Nova"' in resp.get_data(as_text=True)  # OCR still on
-    assert mock_upload.call_args_list[1].args[1] == b"jpg"  # raw photo kept
+    assert _uploads(mock_upload)[1].args[1] == b"jpg"  # raw photo kept
 
 
 def test_photo_flow_studio_failure_falls_back_to_raw(client):
@@ -882,8 +892,10 @@ def test_photo_flow_studio_failure_falls_back_to_raw(client):
 
     _login(client)
     with patch(f"{_APP}.config.ADMIN_NICKNAMES", {"jorge"}), patch(
-        f"{_APP}.photos.process_image", return_value=b"jpg"
-    ), patch(f"{_APP}.photos.studio_photo", side_effect=GeminiError("img boom")), patch(
+        f"{_APP}.config.STUDIO_MODE", "sync"
+    ), patch(f"{_APP}.photos.process_image", return_value=b"jpg"), patch(
+        f"{_APP}.photos.studio_photo", side_effect=GeminiError("img boom")
+    ), patch(
         f"{_APP}.photos.upload_photo"
     ) as mock_upload, patch(
         f"{_APP}.label_ocr.extract_label", return_value={"name": "X"}
@@ -895,12 +907,117 @@ def test_photo_flow_studio_failure_falls_back_to_raw(client):
         )
     assert resp.status_code == 200
     # Display upload falls back to the processed raw photo.
-    assert mock_upload.call_args_list[1].args[1] == b"jpg"
+    assert _uploads(mock_upload)[1].args[1] == b"jpg"
     body = resp.get_data(as_text=True)
     assert "ha pasado por el estudio" not in body  # success note absent
     assert "no pudo retocar la foto" in body  # honest failure note shown
 
 
+def test_photo_flow_runs_studio_and_ocr_side_by_side(client):
+    """The user waits for the slower Gemini call, not the sum of both: each
+    call here only returns once the other has started."""
+    import threading
+
+    _login(client)
+    studio_started, ocr_started = threading.Event(), threading.Event()
+
+    def _studio(data):
+        studio_started.set()
+        assert ocr_started.wait(5), "OCR waited for the studio"
+        return b"studio"
+
+    def _ocr(data):
+        ocr_started.set()
+        assert studio_started.wait(5), "studio waited for the OCR"
+        return {"name": "Font Nova"}
+
+    with patch(f"{_APP}.config.ADMIN_NICKNAMES", {"jorge"}), patch(
+        f"{_APP}.config.STUDIO_MODE", "sync"
+    ), patch(f"{_APP}.photos.process_image", return_value=b"jpg"), patch(
+        f"{_APP}.photos.studio_photo", side_effect=_studio
+    ), patch(
+        f"{_APP}.photos.upload_photo"
+    ) as mock_upload, patch(
+        f"{_APP}.label_ocr.extract_label", side_effect=_ocr
+    ):
+        resp = client.post(
+            "/anadir/foto",
+            data={"photo": (__import__("io").BytesIO(b"raw"), "label.jpg")},
+            content_type="multipart/form-data",
+        )
+    body = resp.get_data(as_text=True)
+    assert 'value="Font Nova"' in body
+    assert "ha pasado por el estudio" in body
+    assert _uploads(mock_upload)[1].args[1] == b"studio"
+
+
+def test_photo_flow_studio_and_ocr_failures_stay_independent(client):
+    """Both calls down: the raw photo is kept and the form opens empty."""
+    from core.sdk.gemini import GeminiError
+
+    _login(client)
+    with patch(f"{_APP}.config.ADMIN_NICKNAMES", {"jorge"}), patch(
+        f"{_APP}.config.STUDIO_MODE", "sync"
+    ), patch(f"{_APP}.photos.process_image", return_value=b"jpg"), patch(
+        f"{_APP}.photos.studio_photo", side_effect=GeminiError("img boom")
+    ), patch(
+        f"{_APP}.photos.upload_photo"
+    ) as mock_upload, patch(
+        f"{_APP}.label_ocr.extract_label", side_effect=GeminiError("boom")
+    ):
+        resp = client.post(
+            "/anadir/foto",
+            data={"photo": (__import__("io").BytesIO(b"raw"), "label.jpg")},
+            content_type="multipart/form-data",
+        )
+    assert resp.status_code == 200
+    assert _uploads(mock_upload)[1].args[1] == b"jpg"
+    body = resp.get_data(as_text=True)
+    assert 'name="photo_tmp"' in body
+    assert "rellena a mano" in body
+
+
+def test_async_studio_opens_the_form_with_the_raw_photo_at_once(client):
+    """The image call runs after the response; the form gets the raw photo
+    and polls for the studio one."""
+    _login(client)
+    with patch(f"{_APP}.config.ADMIN_NICKNAMES", {"jorge"}), patch(
+        f"{_APP}.config.STUDIO_MODE", "async"
+    ), patch(f"{_APP}.photos.process_image", return_value=b"jpg"), patch(
+        f"{_APP}.photos.studio_photo"
+    ) as mock_studio, patch(
+        f"{_APP}.studio_jobs.submit", return_value=True
+    ) as mock_submit, patch(
+        f"{_APP}.photos.upload_photo"
+    ) as mock_upload, patch(
+        f"{_APP}.label_ocr.extract_label", return_value={"name": "Font Nova"}
+    ):
+        resp = client.post(
+            "/anadir/foto",
+            data={"photo": (__import__("io").BytesIO(b"raw"), "label.jpg")},
+            content_type="multipart/form-data",
+        )
+    body = resp.get_data(as_text=True)
+    mock_studio.assert_not_called()  # not in this request
+    job_id, source = mock_submit.call_args.args
+    assert source == b"jpg"
+    assert _uploads(mock_upload)[1].args == (f"uploads/{job_id}.jpg", b"jpg")
+    assert f"/anadir/estudio/{job_id}" in body
+    assert "retocando la foto" in body
+
+
+def test_studio_status_hands_the_form_the_photo_to_swap_in(client):
+    _login(client)
+    job_id = "c" * 32
+    done = {"state": "done", "photo_tmp": f"uploads/{job_id}-studio.jpg"}
+    with patch(f"{_APP}.studio_jobs.status", return_value=done):
+        resp = client.get(f"/anadir/estudio/{job_id}")
+    assert resp.get_json()["photo_tmp"] == f"uploads/{job_id}-studio.jpg"
+    assert resp.get_json()["photo_url"].endswith(f"uploads/{job_id}-studio.jpg")
+
+    assert client.get("/anadir/estudio/not-a-job").status_code == 404
+
+
 def test_photo_flow_survives_gemini_failure(client):
     """OCR down ≠ photo lost: empty form, photo kept, honest banner."""
     from core.sdk.gemini import GeminiError
@@ -291,3 +291,93 @@ def test_the_spread_is_none_without_declared_values():
         id="x", name="x", brand="", spring="", province="", community="", minerals={}
     )
     assert mineralization_spread([blank]) is None
+
+
+def _random_catalog(size, seed=7):
+    """Waters with every coverage pattern, sparse labels included."""
+    import random
+
+    from packages.be_water.web.similarity import _VECTOR_FIELDS
+
+    rng = random.Random(seed)
+    catalog = []
+    for i in range(size):
+        fields = rng.sample(
+            [f for f, _ in _VECTOR_FIELDS], rng.randint(1, len(_VECTOR_FIELDS))
+        )
+        catalog.append(
+            Water(
+                id=f"w{i}",
+                name=f"w{i}",
+                brand="",
+                spring="",
+                province="",
+                community="",
+                minerals={f: round(rng.uniform(0, 1500), 1) for f in fields},
+            )
+        )
+    return catalog
+
+
+def test_the_index_agrees_with_distance_for_every_pair():
+    import math
+
+    import pytest
+
+    from packages.be_water.web.similarity import SimilarityIndex
+
+    catalog = _random_catalog(60)
+    index = SimilarityIndex(catalog)
+    for water in catalog:
+        got = index.distances_to(water.minerals)
+        for other, d in zip(catalog, got):
+            expected = distance(water.minerals, other.minerals)
+            if math.isinf(expected):
+                assert math.isinf(d)
+            else:
+                assert d == pytest.approx(expected, rel=1e-12)
+
+
+def test_neighbour_lookup_matches_the_brute_force_ranking():
+    import math
+
+    catalog = _random_catalog(80, seed=3)
+    for target in catalog:
+        brute = sorted(
+            (
+                (w, distance(target.minerals, w.minerals))
+                for w in catalog
+                if w.id != target.id
+            ),
+            key=lambda t: t[1],
+        )
+        brute = [w.id for w, d in brute if math.isfinite(d)][:3]
+        assert [w.id for w, _ in similar_waters(target, catalog, top_n=3)] == brute
+
+
+def test_the_index_is_built_once_per_catalog():
+    from packages.be_water.web.similarity import index_for
+
+    catalog = _random_catalog(10)
+    assert index_for(list(catalog)) is index_for(list(catalog))
+    assert index_for(_random_catalog(10)) is not index_for(catalog)
+
+
+def test_centroid_matches_skip_favourites_and_incomparable_waters():
+    from packages.be_water.web.similarity import closest_to_centroid
+
+    sparse = Water(
+        id="sparse",
+        name="sparse",
+        brand="",
+        spring="",
+        province="",
+        community="",
+        minerals={"tds": 260},
+    )
+    catalog = [SOLAN, LIVIANA, BEZOYA, VICHY, sparse]
+    centroid = favorites_centroid([SOLAN])
+
+    matches = closest_to_centroid(catalog, centroid, exclude_ids={"solan"}, top_n=6)
+
+    assert [w.id for w, _ in matches] == ["liviana", "bezoya", "vichy"]
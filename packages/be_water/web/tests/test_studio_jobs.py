@@ -0,0 +1,83 @@
+"""Tests for the background studio jobs in `studio_jobs.py`."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from core.sdk.gemini import GeminiError
+from packages.be_water.web import studio_jobs
+
+_MOD = "packages.be_water.web.studio_jobs"
+_ID = "a" * 32
+
+
+@pytest.fixture(autouse=True)
+def _fresh():
+    studio_jobs.reset()
+    yield
+    studio_jobs.reset()
+
+
+def _settled(job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = studio_jobs.status(job_id)
+        if status["state"] != "pending":
+            return status
+        time.sleep(0.01)
+    raise AssertionError("studio job never finished")
+
+
+def test_a_finished_job_points_at_its_own_studio_object():
+    """The raw tmp the form already holds is never overwritten."""
+    with patch(f"{_MOD}.photos.studio_photo", return_value=b"studio"), patch(
+        f"{_MOD}.photos.upload_photo"
+    ) as upload:
+        assert studio_jobs.submit(_ID, b"raw")
+        status = _settled(_ID)
+
+    assert status == {"state": "done", "photo_tmp": f"uploads/{_ID}-studio.jpg"}
+    upload.assert_called_once_with(f"uploads/{_ID}-studio.jpg", b"studio")
+
+
+def test_a_failed_studio_call_reports_failed():
+    with patch(
+        f"{_MOD}.photos.studio_photo", side_effect=GeminiError("img boom")
+    ), patch(f"{_MOD}.photos.upload_photo") as upload:
+        studio_jobs.submit(_ID, b"raw")
+        assert _settled(_ID) == {"state": "failed"}
+    upload.assert_not_called()
+
+
+def test_a_full_queue_refuses_the_job():
+    gate = threading.Event()
+
+    def _slow(data):
+        gate.wait(5)
+        return b"studio"
+
+    with patch(f"{_MOD}.config.STUDIO_QUEUE_MAX", 1), patch(
+        f"{_MOD}.photos.studio_photo", side_effect=_slow
+    ), patch(f"{_MOD}.photos.upload_photo"):
+        assert studio_jobs.submit(_ID, b"raw")
+        assert not studio_jobs.submit("b" * 32, b"raw")
+        gate.set()
+        assert _settled(_ID)["state"] == "done"
+
+
+def test_a_job_from_another_instance_is_found_in_the_bucket():
+    """Polls are not pinned to the instance that ran the job."""
+    found = MagicMock(ok=True)
+    with patch(f"{_MOD}.http.head", return_value=found) as head:
+        assert studio_jobs.status(_ID)["state"] == "done"
+    assert head.call_args.args[0].endswith(f"uploads/{_ID}-studio.jpg")
+
+    with patch(f"{_MOD}.http.head", side_effect=requests.ConnectionError()):
+        assert studio_jobs.status(_ID) == {"state": "pending"}
+
+
+def test_anything_but_an_upload_id_is_not_a_job():
+    assert studio_jobs.status("../secrets") is None
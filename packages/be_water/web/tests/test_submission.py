@@ -208,16 +208,21 @@ def test_set_water_community_merges_instead_of_rewriting_the_doc():
     """The backfill fills one field on documents it has not fully parsed —
     a whole-document write would drop whatever `to_firestore` does not carry.
     """
-    from unittest.mock import patch
+    from unittest.mock import call, patch
 
     from packages.be_water.web import repository
 
     with patch("packages.be_water.web.repository.firestore") as fs:
         repository.set_water_community("neval", "Castilla-La Mancha")
 
-    fs.set_document.assert_called_once_with(
-        repository.WATERS, "neval", {"community": "Castilla-La Mancha"}, merge=True
-    )
+    waters_writes = [
+        c for c in fs.set_document.call_args_list if c.args[0] == repository.WATERS
+    ]
+    assert waters_writes == [
+        call(
+            repository.WATERS, "neval", {"community": "Castilla-La Mancha"}, merge=True
+        )
+    ]
 
 
 # --- analysis date ----------------------------------------------------------
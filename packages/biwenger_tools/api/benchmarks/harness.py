@@ -0,0 +1,294 @@
+"""Timing budgets for the api's three combinatorial hot paths.
+
+    python -m packages.biwenger_tools.api.benchmarks.harness            # report
+    python -m packages.biwenger_tools.api.benchmarks.harness --write    # rebase
+
+Lineup speed has already reached production once: the capped backtracking
+search that `lineup._solve_shapes` replaced took 4–13 s on an 18–25-man
+squad, under a 300 s job timeout and a 30 s gunicorn kill. Nothing noticed
+until a request died. This measures the paths whose cost grows with the
+squad, on synthetic inputs shaped like the ones that hurt:
+
+- `pick_lineup` on squads of 15–30 with heavy `altPositions` overlap — the
+  case that made the old search blow up;
+- `draft.composition_reachable` on every prefix of those squads, which is
+  what each draft pick asks;
+- `player_matching.build_jp_index` cold, on a JP payload and Biwenger roster
+  the size of the real ones, with the mononym and surname collisions the
+  loose ladder exists for.
+
+Each reports p50/p99 in milliseconds and a **node count**: solver states for
+the lineup, min-cut evaluations for the composition check, loose-ladder
+probes for the index. Only the node counts fail the target: they are
+deterministic, and they catch an algorithmic regression even on a machine
+fast enough to hide it from the clock. The timings are reported against their
+ceilings but never asserted — a p99 over a few hundred samples is close to
+the maximum, and one GC pause or a busy runner moves it past any margin.
+
+Everything is generated from fixed seeds and nothing touches the network, so
+it runs the same offline under Bazel as on a laptop. `BUDGETS` holds the
+stored ceilings; `--write` rebases them on this machine's measurements.
+"""
+
+import json
+import random
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from packages.biwenger_tools.api.logic import draft, lineup, player_matching
+from packages.biwenger_tools.api.logic.lineup import DEF, FWD, GK, MID
+
+BUDGETS = Path(__file__).with_name("budgets.json")
+
+# Ceilings written by `--write`, over what this machine measured: wide enough
+# for a loaded CI runner, narrow enough that a return to exponential search
+# cannot hide under them. Node counts are exact, so they get less room. Below
+# the floor a p99 is one scheduler hiccup away from doubling.
+_TIME_HEADROOM = 10
+_TIME_FLOOR_MS = 5
+_NODE_HEADROOM = 1.5
+
+SQUAD_SIZES = range(15, 31)
+SQUADS_PER_SIZE = 4
+JP_PLAYERS = 600
+INDEX_RUNS = 200
+
+_OUTFIELD = (DEF, MID, FWD)
+_SYLLABLES = ("ra", "mo", "lu", "ca", "te", "ni", "so", "vi", "ga", "ro", "be", "za")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+
+def _player(bw_id: int, rng: random.Random, position: int) -> dict:
+    """A squad row. Most outfielders cover a second line and some a third:
+    the overlap is what multiplies the ways an eleven can be placed."""
+    alts = []
+    if position != GK:
+        others = [p for p in _OUTFIELD if p != position]
+        roll = rng.random()
+        if roll < 0.3:
+            alts = others
+        elif roll < 0.8:
+            alts = rng.sample(others, k=1)
+    roll = rng.random()
+    return {
+        "bw_id": bw_id,
+        "name": f"P{bw_id}",
+        "price": rng.randrange(200_000, 6_000_000, 100_000),
+        "position_id": position,
+        "alt_positions": alts,
+        "jp_player": {
+            "status": "injured" if roll < 0.05 else "ok",
+            "nextMatch": {"status": "pending", "playerInLineup": roll > 0.2},
+            "predict": [{"type": 2, "rate": rng.randrange(0, 700, 5)}],
+        },
+    }
+
+
+def squads() -> list[list[dict]]:
+    """`SQUADS_PER_SIZE` squads of every size in `SQUAD_SIZES`, two keepers
+    in each."""
+    out = []
+    for size in SQUAD_SIZES:
+        for k in range(SQUADS_PER_SIZE):
+            rng = random.Random(size * 100 + k)
+            out.append(
+                [_player(i, rng, GK) for i in range(2)]
+                + [_player(i, rng, rng.choice(_OUTFIELD)) for i in range(2, size)]
+            )
+    return out
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+
+
+def jp_roster() -> tuple[list[dict], list[str]]:
+    """A JP payload and the Biwenger names to match against it.
+
+    Biwenger's names diverge from JP's the ways the real ones do: a full name
+    where JP has a mononym, a surname JP lists with a first name, and first
+    names shared by several players so the ambiguity check has work to do.
+    """
+    rng = random.Random(7)
+    firsts = [_word(rng) for _ in range(40)]
+    jp, names = [], []
+    for i in range(JP_PLAYERS):
+        first, last = rng.choice(firsts), _word(rng)
+        shape = rng.random()
+        if shape < 0.15:
+            jp_name, bw_name = last, f"{first} {last}"
+        elif shape < 0.25:
+            jp_name, bw_name = f"{first} {last} {_word(rng)}", f"{first} {last}"
+        else:
+            jp_name = bw_name = f"{first} {last}"
+        jp.append({"name": jp_name, "slug": f"{jp_name.lower().replace(' ', '-')}-{i}"})
+        names.append(bw_name)
+    return jp, names
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+@contextmanager
+def _counting(module, attr: str, weigh=lambda result: 1):
+    """Count calls to `module.attr` (weighted by `weigh(result)`) while
+    inside the block. Used only on an untimed pass, so the wrapper costs the
+    timings nothing."""
+    original = getattr(module, attr)
+    counter = [0]
+
+    def counted(*args, **kwargs):
+        result = original(*args, **kwargs)
+        counter[0] += weigh(result)
+        return result
+
+    setattr(module, attr, counted)
+    try:
+        yield counter
+    finally:
+        setattr(module, attr, original)
+
+
+def _percentiles(samples: list[float]) -> dict:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": round(cuts[49], 3), "p99_ms": round(cuts[98], 3)}
+
+
+def _time(call, inputs) -> list[float]:
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        call(item)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_pick_lineup() -> dict:
+    """One `pick_lineup` per squad. Nodes: solver states, summed over every
+    solve the demotion fixpoint runs."""
+    inputs = squads()
+    with _counting(lineup, "_solve_shapes", len) as nodes:
+        for squad in inputs:
+            lineup.pick_lineup(squad)
+    return {**_percentiles(_time(lineup.pick_lineup, inputs)), "nodes": nodes[0]}
+
+
+def bench_composition_reachable() -> dict:
+    """Every prefix of every squad, as the draft asks after each pick, with
+    the slots a fifteen-man draft would still have. Nodes: min-cut subsets
+    evaluated."""
+    inputs = []
+    for squad in squads():
+        lines = [
+            draft.eligible_lines(
+                {"position": r["position_id"], "altPositions": r["alt_positions"]}
+            )
+            for r in squad
+        ]
+        inputs += [(lines[:k], max(0, 15 - k)) for k in range(1, len(lines) + 1)]
+
+    def call(item):
+        return draft.composition_reachable(*item)
+
+    subsets = len(draft._LINE_SUBSETS)
+    with _counting(draft, "_shortfall", lambda _: subsets) as nodes:
+        for item in inputs:
+            call(item)
+    return {**_percentiles(_time(call, inputs)), "nodes": nodes[0]}
+
+
+def bench_build_jp_index() -> dict:
+    """A cold `build_jp_index` — the memo would otherwise answer every run
+    after the first. Nodes: loose-ladder probes for one build."""
+    jp, names = jp_roster()
+
+    def call(_):
+        player_matching.reset_index_cache()
+        return player_matching.build_jp_index(jp, names)
+
+    with _counting(player_matching, "_loose_candidate") as nodes:
+        call(None)
+    samples = _time(call, range(INDEX_RUNS))
+    player_matching.reset_index_cache()
+    return {**_percentiles(samples), "nodes": nodes[0]}
+
+
+BENCHMARKS = {
+    "pick_lineup": bench_pick_lineup,
+    "composition_reachable": bench_composition_reachable,
+    "build_jp_index": bench_build_jp_index,
+}
+
+
+def run() -> dict:
+    """`{name: {"p50_ms", "p99_ms", "nodes"}}` for every benchmark."""
+    return {name: bench() for name, bench in BENCHMARKS.items()}
+
+
+def load_budgets() -> dict:
+    return json.loads(BUDGETS.read_text())
+
+
+def over_budget(results: dict, budgets: dict) -> list[str]:
+    """One line per node count above its ceiling; empty when all fit."""
+    return [
+        f"{name}: {result['nodes']} nodes over {budgets[name]['nodes']}"
+        for name, result in results.items()
+        if result["nodes"] > budgets[name]["nodes"]
+    ]
+
+
+def over_time(results: dict, budgets: dict) -> list[str]:
+    """One line per p99 above its ceiling. Reported, never a failure."""
+    return [
+        f"{name}: p99 {result['p99_ms']} ms over {budgets[name]['p99_ms']} ms"
+        for name, result in results.items()
+        if result["p99_ms"] > budgets[name]["p99_ms"]
+    ]
+
+
+def _report(results: dict, budgets: dict) -> str:
+    lines = [
+        f"{'':24}{'p50 ms':>10}{'p99 ms':>10}{'budget':>10}{'nodes':>10}{'budget':>10}"
+    ]
+    for name, r in results.items():
+        b = budgets.get(name, {})
+        lines.append(
+            f"{name:24}{r['p50_ms']:>10}{r['p99_ms']:>10}{b.get('p99_ms', '-'):>10}"
+            f"{r['nodes']:>10}{b.get('nodes', '-'):>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str]) -> int:
+    results = run()
+    if "--write" in argv:
+        budgets = {
+            name: {
+                "p99_ms": max(_TIME_FLOOR_MS, round(r["p99_ms"] * _TIME_HEADROOM)),
+                "nodes": int(r["nodes"] * _NODE_HEADROOM),
+            }
+            for name, r in results.items()
+        }
+        BUDGETS.write_text(json.dumps(budgets, indent=2) + "\n")
+    budgets = load_budgets()
+    print(_report(results, budgets))
+    for note in over_time(results, budgets):
+        print(f"slow (not a failure): {note}", file=sys.stderr)
+    failures = over_budget(results, budgets)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
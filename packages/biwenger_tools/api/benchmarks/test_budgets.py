@@ -0,0 +1,52 @@
+"""The stored budgets in `budgets.json`, enforced.
+
+Measuring is opt-in: the run needs `API_BENCHMARKS=1`, which
+`benchmarks/main.py` sets for the `api_benchmarks` target, so a plain
+`pytest` over the tree never spends its wall clock re-measuring. Only node
+counts are asserted; timings over their ceilings come out as warnings.
+"""
+
+import os
+import warnings
+
+import pytest
+
+from packages.biwenger_tools.api.benchmarks import harness
+
+
+@pytest.fixture(scope="module")
+def results():
+    return harness.run()
+
+
+def test_every_benchmark_has_a_budget():
+    assert set(harness.load_budgets()) == set(harness.BENCHMARKS)
+
+
+@pytest.mark.skipif(
+    not os.getenv("API_BENCHMARKS"),
+    reason="measures; run the api_benchmarks target (or set API_BENCHMARKS=1)",
+)
+@pytest.mark.parametrize("name", sorted(harness.BENCHMARKS))
+def test_benchmark_fits_its_budget(results, name):
+    budgets = harness.load_budgets()
+    for note in harness.over_time({name: results[name]}, budgets):
+        warnings.warn(note)
+    failures = harness.over_budget({name: results[name]}, budgets)
+    assert not failures, failures
+
+
+def test_only_a_node_regression_fails():
+    """A faster machine can hide an algorithmic regression from the clock,
+    never from the count; a slow machine can blow any timing ceiling without
+    a change to the code."""
+    budgets = {"x": {"p99_ms": 10, "nodes": 100}}
+
+    assert harness.over_budget({"x": {"p99_ms": 11, "nodes": 100}}, budgets) == []
+    assert harness.over_time({"x": {"p99_ms": 11, "nodes": 100}}, budgets) == [
+        "x: p99 11 ms over 10 ms"
+    ]
+    assert harness.over_budget({"x": {"p99_ms": 1, "nodes": 101}}, budgets) == [
+        "x: 101 nodes over 100"
+    ]
+    assert harness.over_time({"x": {"p99_ms": 1, "nodes": 101}}, budgets) == []
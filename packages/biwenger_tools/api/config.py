@@ -55,6 +55,10 @@ OFFERS_URL = biwenger_sdk.OFFERS_URL
 JP_AUTH_TOKEN = _BIWENGER_CFG.get("jp_auth_token") or os.getenv("JP_AUTH_TOKEN", "")
 JP_COMPETITION = 1  # LaLiga
 JP_SCORE_TYPE = 2  # SofaScore (Automanager system)
+# Share the last full JP payload between instances through Firestore, so a
+# cold start validates it with the cheap probe instead of the 30 s fetch.
+# Off falls back to the per-instance cache alone.
+JP_PERSISTENT_CACHE = os.getenv("JP_PERSISTENT_CACHE", "true").lower() != "false"
 
 # --- AUTO-BID PAUSE (daily digest only) ---
 # While today (Madrid) is before this ISO date, the daily digest skips the
@@ -85,6 +89,17 @@ DAILY_LEAGUE_VALUES_ENABLED = (
 #     --update-env-vars LINEUP_SUB_STARTS_ABOVE=400
 LINEUP_SUB_STARTS_ABOVE = int(os.getenv("LINEUP_SUB_STARTS_ABOVE", "350"))
 
+# --- TABLE RENDERING ---
+# Worker processes that render the squad/market PNGs, so a multi-image command
+# renders its tables side by side instead of one after another. Each worker
+# imports matplotlib and draws a throwaway table once when it starts, and
+# holds ~100 MiB from then on. 0 (default) renders in the request thread, as
+# before. Set it per deploy from the service's limits — the process sees the
+# host's cores, not Cloud Run's vCPU quota: at most the vCPUs, and only where
+# the memory limit has room for that many extra interpreters (e.g. 2 on a
+# 2 vCPU / 1 GiB service).
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "0"))
+
 # --- GCP TARGETS (the api needs to trigger the scraper Cloud Run Job) ---
 GCP_PROJECT_ID = os.getenv("GCP_PROJECT_ID", "biwenger-tools")
 CLOUD_RUN_REGION = os.getenv("CLOUD_RUN_REGION", "europe-southwest1")
@@ -2,4 +2,7 @@
 
 from core.serving.gunicorn import run
 
-run("packages.biwenger_tools.api.app:app", timeout=180)
+# Guarded: the render pool spawns its workers, and a spawned worker re-runs
+# this file as `__mp_main__` — unguarded, each would start its own gunicorn.
+if __name__ == "__main__":
+    run("packages.biwenger_tools.api.app:app", timeout=180)
@@ -7,13 +7,13 @@ The Flask route is a thin shell that calls the right one and translates
 exceptions into 5xx.
 """
 
-import time
 from datetime import datetime
 
 import requests
 
 from core.constants import MADRID_TZ
 from core.sdk.telegram import (
+    DeliveryPipeline,
     send_telegram_message,
     send_telegram_message_or_raise,
     send_telegram_photo_or_raise,
@@ -32,18 +32,46 @@ from packages.biwenger_tools.api.logic.orchestration import (
     require_telegram,
     send_image_or_text_fallback,
 )
+from packages.biwenger_tools.api.logic.render_service import submit_table
 from packages.biwenger_tools.api.logic.rows import build_market_rows, build_squad_rows
 
 logger = get_logger(__name__)
 
 
 def _send_image(token: str, chat_id: str, image: bytes, caption: str) -> None:
-    """sendPhoto + a small pause to stay under Telegram's send-rate cap.
+    """sendPhoto, paced by the SDK's per-chat rate limiter.
 
     Raises `TelegramDeliveryError` if Telegram rejects the photo; the
     route handler surfaces it as a 500."""
     send_telegram_photo_or_raise(token, chat_id, image, caption)
-    time.sleep(0.5)
+
+
+def _send_rendered(token: str, chat_id: str, render, caption: str) -> bool:
+    """`send_image_or_text_fallback` once the render pool hands the PNG back.
+
+    A failed render raises, as `build_table_image` did in the request thread.
+    """
+    return send_image_or_text_fallback(token, chat_id, render.result(), caption)
+
+
+def _send_market(token: str, chat_id: str, render) -> bool:
+    """The market photo of an all-managers run. A render that fails gets the
+    same notice as a market that could not be read, not a 500."""
+    try:
+        image = render.result()
+    except Exception:
+        logger.exception("Market render failed; squads already sent.")
+        _notify_market_unavailable(token, chat_id)
+        return False
+    return send_image_or_text_fallback(token, chat_id, image, "🛒 Mercado")
+
+
+def _notify_market_unavailable(token: str, chat_id: str) -> None:
+    send_telegram_message(
+        bot_token=token,
+        chat_id=chat_id,
+        text="⚠️ <b>Mercado</b> no disponible. Los equipos sí han salido.",
+    )
 
 
 def _squad_breakdown(rows: list[dict]) -> dict:
@@ -160,58 +188,52 @@ def run_teams(manager_id: int | None = None) -> dict:
     my_team: list[dict] = []
     rivals: dict[str, list[dict]] = {}
 
+    squads = biwenger.get_manager_squads(config.USER_SQUAD_URL, managers)
     for mgr_id, manager_name in managers.items():
-        squad = biwenger.get_manager_squad(config.USER_SQUAD_URL, mgr_id)
-        logger.info(
-            "Squad fetched.",
-            extra={"manager": manager_name, "size": len(squad)},
-        )
+        squad = squads[mgr_id]
         if mgr_id == biwenger.user_id:
             my_team = build_squad_rows(squad, biwenger_players, jp_index)
         else:
             rivals[manager_name] = build_squad_rows(
                 squad, biwenger_players, jp_index, include_clause=True
             )
-        time.sleep(0.5)
-
-    sent_count = 0
-    if send_image_or_text_fallback(
-        token,
-        chat_id,
-        build_table_image(my_team, "🛡️ Mi equipo", show_total_value=True),
-        "🛡️ Mi equipo",
-    ):
-        sent_count += 1
-    for manager_name, rows in rivals.items():
-        img = build_table_image(
-            rows,
-            f"👤 {manager_name}",
-            extra_cols=["Clausulable", "Cláusula"],
-            show_total_value=True,
-        )
-        if send_image_or_text_fallback(token, chat_id, img, f"👤 {manager_name}"):
-            sent_count += 1
-
-    # The squads are already in the chat by now, so a market failure must not
-    # turn the whole run into a 500 — the user would see every photo arrive and
-    # then a bare error. The market is also the section most likely to fail:
-    # it is off-season for months a year, and Biwenger answers a disabled
-    # market with a payload that carries no sales at all.
+
+    # Each table goes to the pipeline as soon as it is submitted, so the
+    # photos still land in order. With a render pool every table renders at
+    # once and the market is read meanwhile; without one (RENDER_WORKERS=0,
+    # the default) `submit_table` renders here, and table N+1 draws while
+    # table N uploads.
+    tables = [("🛡️ Mi equipo", my_team, None)] + [
+        (f"👤 {manager_name}", rows, ["Clausulable", "Cláusula"])
+        for manager_name, rows in rivals.items()
+    ]
+
+    photos = []
     market_rows: list[dict] = []
-    try:
-        market_players = biwenger.get_market_players(config.MARKET_URL)
-        market_rows = build_market_rows(market_players, biwenger_players, jp_index)
-        if send_image_or_text_fallback(
-            token, chat_id, build_table_image(market_rows, "🛒 Mercado"), "🛒 Mercado"
-        ):
-            sent_count += 1
-    except Exception:
-        logger.exception("Market section failed; squads already sent.")
-        send_telegram_message(
-            bot_token=token,
-            chat_id=chat_id,
-            text="⚠️ <b>Mercado</b> no disponible. Los equipos sí han salido.",
-        )
+    with DeliveryPipeline() as pipeline:
+        for caption, rows, extra_cols in tables:
+            render = submit_table(
+                rows, caption, extra_cols=extra_cols, show_total_value=True
+            )
+            photos.append(
+                pipeline.submit(_send_rendered, token, chat_id, render, caption)
+            )
+
+        # The squads are already on their way by now, so a market failure
+        # must not turn the whole run into a 500 — the user would see every
+        # photo arrive and then a bare error. The market is also the section
+        # most likely to fail: it is off-season for months a year, and
+        # Biwenger answers a disabled market with a payload that carries no
+        # sales at all.
+        try:
+            market_players = biwenger.get_market_players(config.MARKET_URL)
+            market_rows = build_market_rows(market_players, biwenger_players, jp_index)
+            render = submit_table(market_rows, "🛒 Mercado")
+            photos.append(pipeline.submit(_send_market, token, chat_id, render))
+        except Exception:
+            logger.exception("Market section failed; squads already sent.")
+            pipeline.submit(_notify_market_unavailable, token, chat_id)
+    sent_count = sum(1 for photo in photos if photo.result())
 
     logger.info(
         "All-teams analysis sent.",
@@ -280,7 +302,7 @@ def run_league_compare() -> dict:
         return {"sent": 0, "reason": "telegram_credentials_missing"}
     token, chat_id = telegram
 
-    summary = league_compare.collect_cached(ctx)
+    summary = league_compare.collect(ctx)
     if not summary:
         return {"sent": 0, "reason": "no_squads"}
     today = datetime.now(MADRID_TZ).strftime("%d/%m")
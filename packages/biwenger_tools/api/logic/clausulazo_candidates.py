@@ -10,13 +10,9 @@ with cash-justo / no margin). Kept here so both flows agree on:
   by `place_clausulazo` for the `to=<seller>` payload field).
 """
 
-import time
-
-from core.sdk.biwenger import BiwengerClient
 from core.sdk.jp import get_predict_rate
 from core.utils import get_logger
-from packages.biwenger_tools.api import config
-from packages.biwenger_tools.api.logic.rows import build_squad_rows
+from packages.biwenger_tools.api.logic import league_snapshot
 from packages.biwenger_tools.api.player_formatting import SCORE_SF
 
 logger = get_logger(__name__)
@@ -31,36 +27,35 @@ def sf_of(row: dict) -> int:
     return get_predict_rate(jp, SCORE_SF) or 0
 
 
-def gather_rivals(
-    biwenger: BiwengerClient,
-    biwenger_players: dict,
-    jp_index: dict,
-) -> list[dict]:
+def gather_rivals(ctx) -> list[dict]:
     """Build the rival_rows list, tagged with owner name + user id.
 
-    Skips the logged-in user's own squad. Each row carries:
+    Read from the shared league snapshot, so a chained command reuses the
+    squads the previous one fetched. Skips the logged-in user's own squad.
+    Each row carries:
     - `owner` (manager name) — used by the recommendations message.
     - `owner_user_id` (manager id) — used by emergency to fill
       `place_clausulazo`'s `to=<seller_user_id>` payload field.
     - `owner_gk_count` — used by `filter_affordable` to enforce the
       "don't leave a rival with zero GKs" house rule.
     """
-    managers = biwenger.get_league_users(
-        config.LEAGUE_DATA_URL, config.NON_PLAYING_MEMBER_IDS
-    )
+    snapshot = league_snapshot.get(ctx)
     rivals: list[dict] = []
-    for manager_id, manager_name in managers.items():
-        if manager_id == biwenger.user_id:
+    for manager_id, manager_name in snapshot.managers.items():
+        if manager_id == ctx.biwenger.user_id:
             continue
-        squad = biwenger.get_manager_squad(config.USER_SQUAD_URL, manager_id)
-        rows = build_squad_rows(squad, biwenger_players, jp_index, include_clause=True)
+        rows = snapshot.rows[manager_id]
         gk_count = sum(1 for r in rows if r.get("position_id") == GK_POSITION_ID)
         for r in rows:
-            r["owner"] = manager_name
-            r["owner_user_id"] = manager_id
-            r["owner_gk_count"] = gk_count
-            rivals.append(r)
-        time.sleep(0.3)
+            # Copies: the snapshot's rows are shared with the next caller.
+            rivals.append(
+                {
+                    **r,
+                    "owner": manager_name,
+                    "owner_user_id": manager_id,
+                    "owner_gk_count": gk_count,
+                }
+            )
     return rivals
 
 
@@ -57,17 +57,12 @@ def recent_lost_players(
     payload variants only expose `from.name`, so we fall back to a
     name match. Either suffices — we own both sides of the lookup.
     """
-    raw = biwenger.get_all_clausulazos(config.CLAUSULAZOS_URL)
-    entries = raw.get("data", []) or []
-    if isinstance(entries, dict):
-        entries = list(entries.values())
-
+    # Only the window is read: the feed stops at the first page past the
+    # cutoff instead of crawling the whole season's transfers.
     cutoff = now_epoch - RECENT_CLAUSULAZO_WINDOW_SECONDS
     losses: list[dict] = []
-    for entry in entries:
+    for entry in biwenger.iter_clausulazos(config.CLAUSULAZOS_URL, since=cutoff):
         entry_date = entry.get("date", 0) or 0
-        if entry_date < cutoff:
-            continue
         for item in entry.get("content") or []:
             if item.get("type") != "clause":
                 continue
@@ -27,16 +27,16 @@ note instead. The manual `POST /market/auto-bid` endpoint is not affected.
 from datetime import date, datetime
 
 from core.constants import MADRID_TZ
-from core.sdk.telegram import send_telegram_message
+from core.sdk.telegram import DeliveryPipeline, send_telegram_message
 from core.utils import get_logger
 from packages.biwenger_tools.api import config
 from packages.biwenger_tools.api.logic import actions, auto_bid, league_compare, offers
-from packages.biwenger_tools.api.logic.image_formatter import build_table_image
 from packages.biwenger_tools.api.logic.orchestration import (
     build_context,
     require_telegram,
     send_image_or_text_fallback,
 )
+from packages.biwenger_tools.api.logic.render_service import submit_table
 from packages.biwenger_tools.api.logic.rows import build_market_rows, build_squad_rows
 
 logger = get_logger(__name__)
@@ -72,36 +72,47 @@ def _notify_auto_bid_paused(token: str, chat_id: str) -> None:
     )
 
 
-def _safe_send_section(
-    token: str, chat_id: str, build_rows, title: str, show_total_value: bool = False
-):
-    """Build and send one digest table; never raises.
+def _start_section(build_rows, title: str, show_total_value: bool = False):
+    """Fetch one digest table's rows and start rendering it; never raises.
 
-    Returns `(image_sent, row_count)`. On any failure (Biwenger fetch,
-    row building, rendering) it logs, posts a short text note so the
-    chat shows the section died, and lets the digest continue — the
-    remaining sections must still arrive.
+    Returns `(render, row_count)`, `render` being the render pool's future
+    of the PNG, or `None` if the rows could not be built. The market section
+    is started after the team's send is queued, so it is fetched and drawn
+    while the team table uploads — with or without a render pool.
     """
     try:
         rows = build_rows()
-        sent = send_image_or_text_fallback(
-            token,
-            chat_id,
-            build_table_image(rows, title, show_total_value=show_total_value),
-            title,
-        )
-        return sent, len(rows)
+        render = submit_table(rows, title, show_total_value=show_total_value)
+        return render, len(rows)
     except Exception:
         logger.exception("Digest section failed.", extra={"section": title})
-        send_telegram_message(
-            bot_token=token,
-            chat_id=chat_id,
-            text=(
-                f"⚠️ <b>{title}</b> no pudo generarse hoy. "
-                "Continúo con el resto del digest."
-            ),
-        )
-        return False, 0
+        return None, 0
+
+
+def _safe_send_section(token: str, chat_id: str, section, title: str):
+    """Send one started digest table; never raises.
+
+    Returns `(image_sent, row_count)`. On any failure (Biwenger fetch,
+    row building, rendering) it posts a short text note so the chat shows
+    the section died, and lets the digest continue — the remaining
+    sections must still arrive.
+    """
+    render, row_count = section
+    if render is not None:
+        try:
+            image = render.result()
+            return send_image_or_text_fallback(token, chat_id, image, title), row_count
+        except Exception:
+            logger.exception("Digest section failed.", extra={"section": title})
+    send_telegram_message(
+        bot_token=token,
+        chat_id=chat_id,
+        text=(
+            f"⚠️ <b>{title}</b> no pudo generarse hoy. "
+            "Continúo con el resto del digest."
+        ),
+    )
+    return False, 0
 
 
 def _safe_run_auto_bid() -> dict:
@@ -149,13 +160,14 @@ def _safe_send_league_values(ctx, token: str, chat_id: str) -> dict:
 
     Chained after the lineup because it answers a different question and must
     not be able to disturb the one write of the morning. Reuses the digest's
-    ctx, but still costs one squad read per manager — see
-    `DAILY_LEAGUE_VALUES_ENABLED` when the 09:00 budget gets tight.
+    ctx, but still costs one squad read per manager unless the league snapshot
+    is fresh — see `DAILY_LEAGUE_VALUES_ENABLED` when the 09:00 budget gets
+    tight.
     """
     if not config.DAILY_LEAGUE_VALUES_ENABLED:
         return {"skipped": "disabled"}
     try:
-        summary = league_compare.collect_cached(ctx)
+        summary = league_compare.collect(ctx)
         if not summary:
             # No managers means the league read came back empty; an empty
             # ranking in the chat says less than nothing.
@@ -243,12 +255,17 @@ def _run_daily_inner() -> dict:
         market_players = ctx.biwenger.get_market_players(config.MARKET_URL)
         return build_market_rows(market_players, ctx.biwenger_players, ctx.jp_index)
 
-    team_sent, team_count = _safe_send_section(
-        token, chat_id, _team_rows, "Mi equipo", show_total_value=True
-    )
-    market_sent, market_count = _safe_send_section(
-        token, chat_id, _market_rows, "Mercado"
-    )
+    with DeliveryPipeline() as pipeline:
+        team = _start_section(_team_rows, "Mi equipo", show_total_value=True)
+        team_send = pipeline.submit(
+            _safe_send_section, token, chat_id, team, "Mi equipo"
+        )
+        market = _start_section(_market_rows, "Mercado")
+        market_send = pipeline.submit(
+            _safe_send_section, token, chat_id, market, "Mercado"
+        )
+    team_sent, team_count = team_send.result()
+    market_sent, market_count = market_send.result()
 
     lineup_result = _safe_run_auto_pick(ctx)
     league_values_result = _safe_send_league_values(ctx, token, chat_id)
@@ -5,6 +5,7 @@ import requests
 from core.utils import get_logger
 from packages.biwenger_tools.api import config
 from packages.biwenger_tools.api.logic import draft
+from core.sdk import http
 from core.sdk.biwenger import BiwengerClient
 from packages.biwenger_tools.api.logic import orchestration
 
@@ -33,7 +34,9 @@ def _with_session(action):
 
     A rejected token is retried once, and only once. This does not weaken the
     module's no-retry rule: a `401` is refused before Biwenger applies
-    anything, so unlike a timeout it cannot have half-happened.
+    anything, so unlike a timeout it cannot have half-happened. The shared
+    client already refreshes its own token, so this only fires when that
+    refresh failed — which is why the shared session is dropped too.
     """
     global _SESSION_CACHE
     if _SESSION_CACHE is None:
@@ -44,6 +47,7 @@ def _with_session(action):
         if exc.response is None or exc.response.status_code != 401:
             raise
         logger.info("Biwenger session rejected — re-authenticating once.")
+        orchestration.reset_biwenger_session()
         _SESSION_CACHE = orchestration.build_biwenger_session()
         return action(_SESSION_CACHE)
 
@@ -78,7 +82,7 @@ def _fetch_market_rows() -> list:
     """
     if config.DRAFT_MARKET_CSV_PATH:
         return draft.load_market_csv(config.DRAFT_MARKET_CSV_PATH)
-    response = requests.get(config.DRAFT_MARKET_CSV_URL, timeout=30)
+    response = http.get(config.DRAFT_MARKET_CSV_URL, timeout=30)
     response.raise_for_status()
     # Decode explicitly: the bucket serves the CSV without a charset, and
     # `response.text` would then fall back to ISO-8859-1 per the HTTP spec,
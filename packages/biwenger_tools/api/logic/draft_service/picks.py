@@ -6,7 +6,7 @@ from typing import Optional
 from packages.biwenger_tools.constants import LEAGUE_MEMBERS
 from core.utils import get_logger
 from packages.biwenger_tools.api import config
-from packages.biwenger_tools.api.logic import draft
+from packages.biwenger_tools.api.logic import draft, league_snapshot
 from . import store
 from .store import (
     ERROR_BIWENGER_TRANSFER_FAILED,
@@ -322,6 +322,8 @@ def _apply_confirmed_pick(manager_id: int, player_id: int, players_by_id: dict)
                     ),
                 )
 
+    if applied_to_biwenger:
+        league_snapshot.invalidate()
     new_state, waited = _finalize_pick(manager_id, player_id, players_by_id)
     store.fs.set_document(
         _picks_path(config.DRAFT_SEASON),
@@ -439,6 +441,7 @@ def undo_last_pick(telegram_user_id: str) -> dict:
             _with_session(
                 lambda client: client.release_player(player_id=last_pick.player_id)
             )
+            league_snapshot.invalidate()
             _with_session(
                 lambda client: client.apply_bonus(
                     amounts={
@@ -32,6 +32,7 @@ from typing import Optional
 from core.sdk.telegram import send_telegram_message_or_raise
 from core.utils import format_euros, get_logger
 from packages.biwenger_tools.api import config
+from packages.biwenger_tools.api.logic import league_snapshot
 from packages.biwenger_tools.api.logic.clausulazo_candidates import (
     filter_affordable,
     gather_rivals,
@@ -230,9 +231,7 @@ def preview_clausulazo(
     my_ids = {p.get("id") for p in my_squad if p.get("id") is not None}
     cash = int(biwenger.get_account_state(my_squad, ctx.biwenger_players)["cash"])
 
-    league_users = biwenger.get_league_users(
-        config.LEAGUE_DATA_URL, config.NON_PLAYING_MEMBER_IDS
-    )
+    league_users = league_snapshot.get(ctx).managers
     my_manager_name = league_users.get(int(biwenger.user_id), "")
 
     losses = recent_lost_players(
@@ -250,7 +249,7 @@ def preview_clausulazo(
     if selector_payload is not None:
         return selector_payload
 
-    rivals = gather_rivals(biwenger, ctx.biwenger_players, ctx.jp_index)
+    rivals = gather_rivals(ctx)
     affordable = filter_affordable(rivals, my_ids, target=cash)
     target, in_preferred = pick_top_in_position(affordable, preferred_position)
 
@@ -359,6 +358,9 @@ def execute_clausulazo(player_id: int, owner_user_id: int, amount: int) -> dict:
         )
         _send(f"❌ <b>Clausulazo rechazado</b> — <code>{_escape(str(exc))}</code>")
         raise
+    # The player changed hands: the next recommendation must not offer him
+    # again from a snapshot that still has him in the rival's squad.
+    league_snapshot.invalidate()
 
     # Resolve the player name for the success message — the callback
     # only carries the id and we want the chat to read "Pagado X € por
@@ -9,20 +9,17 @@ Shared so the two callers differ only in where the squads come from:
 
 - `rank` and `render` take a `{manager: {value, projection, ...}}` map and know
   nothing about drafts, prices or Biwenger.
-- `collect` builds that map from the live league — seven squad reads plus the
-  competition payload and one Jornada Perfecta fetch.
+- `collect` builds that map from the live league, through the snapshot the
+  clausulazo flows share (see `league_snapshot`).
 
 `gain` is optional on purpose. Right after the draft "what it cost against what
 it is worth" is the interesting number; a month later nobody remembers what a
 squad cost, because half of it arrived by clause.
 """
 
-import time
-
 from core.sdk.jp import get_predict_rate
 from core.utils import get_logger
-from packages.biwenger_tools.api import config
-from packages.biwenger_tools.api.logic.rows import build_squad_rows
+from packages.biwenger_tools.api.logic import league_snapshot
 from packages.biwenger_tools.api.player_formatting import SCORE_SF
 
 logger = get_logger(__name__)
@@ -39,16 +36,14 @@ def _thousands(number) -> str:
 def collect(ctx) -> dict:
     """`{manager: {value, projection, size}}` for every squad in the league.
 
-    Reuses the caller's context so a report chained onto something else pays
-    for no second round-trip.
+    Measured from the shared league snapshot, so repeat taps — and a report
+    chained onto recommendations or `/emergencia` — pay for no second
+    round of squad reads.
     """
-    managers = ctx.biwenger.get_league_users(
-        config.LEAGUE_DATA_URL, config.NON_PLAYING_MEMBER_IDS
-    )
+    snapshot = league_snapshot.get(ctx)
     out = {}
-    for manager_id, name in managers.items():
-        squad = ctx.biwenger.get_manager_squad(config.USER_SQUAD_URL, manager_id)
-        rows = build_squad_rows(squad, ctx.biwenger_players, ctx.jp_index)
+    for manager_id, name in snapshot.managers.items():
+        rows = snapshot.rows[manager_id]
         out[name] = {
             "value": sum(r.get("price") or 0 for r in rows),
             "projection": sum(
@@ -60,31 +55,6 @@ def collect(ctx) -> dict:
     return out
 
 
-# A squad read per manager is nine requests against a budget the whole league
-# shares, and this hangs off a button. Repeat taps within the window reuse the
-# answer instead of re-asking Biwenger the same question.
-_CACHE_TTL_SECONDS = 300
-_cache: tuple[float, dict] | None = None
-
-
-def collect_cached(ctx) -> dict:
-    """`collect`, but at most once every few minutes."""
-    global _cache
-    now = time.monotonic()
-    if _cache and now - _cache[0] < _CACHE_TTL_SECONDS:
-        logger.info("League comparison served from cache.")
-        return _cache[1]
-    summary = collect(ctx)
-    _cache = (now, summary)
-    return summary
-
-
-def reset_cache() -> None:
-    """Drop the cached comparison. Tests and the local runner call this."""
-    global _cache
-    _cache = None
-
-
 def rank(summary: dict, key: str) -> list:
     """Managers ordered by `key`, best first."""
     return sorted(summary, key=lambda m: -summary[m].get(key, 0))
@@ -0,0 +1,91 @@
+"""Every squad in the league, read once and shared by whoever asks next.
+
+Recommendations, `/emergencia` and the league comparison all start from the
+same question — who owns whom, and at what clause — and each used to ask
+Biwenger on its own: a roster read plus one squad read per manager, three
+times over when the bot chains the commands. They now share one snapshot:
+
+- `get` returns the current snapshot, reading the league only when none is
+  held or it is older than `SNAPSHOT_TTL_SECONDS`.
+- `invalidate` drops it. Called after every write that moves a player — an
+  executed clausulazo, an accepted offer, a draft transfer or its undo — so
+  the next read sees the squads as they are now, not as they were.
+
+Rows are built with `include_clause=True`, a superset of what the comparison
+needs, and are shared between callers: copy a row before annotating it.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from core.utils import get_logger
+from packages.biwenger_tools.api import config
+from packages.biwenger_tools.api.logic.rows import build_squad_rows
+
+logger = get_logger(__name__)
+
+# Long enough to cover a chain of commands, short enough that a rival's
+# clausulazo — which we are not told about — is not missed for long.
+SNAPSHOT_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class LeagueSnapshot:
+    """The league at `taken_at`, keyed by manager id.
+
+    `managers` maps id to name, `squads` holds the raw squad payloads and
+    `rows` the same squads as rows with the clause fields.
+    """
+
+    managers: dict
+    squads: dict
+    rows: dict
+    taken_at: float
+
+
+_snapshot: LeagueSnapshot | None = None
+# Held while the league is read, so callers arriving mid-read wait for that
+# read instead of starting a second fan-out of their own.
+_lock = threading.Lock()
+
+
+def _read(ctx) -> LeagueSnapshot:
+    managers = ctx.biwenger.get_league_users(
+        config.LEAGUE_DATA_URL, config.NON_PLAYING_MEMBER_IDS
+    )
+    squads = ctx.biwenger.get_manager_squads(config.USER_SQUAD_URL, managers)
+    rows = {
+        manager_id: build_squad_rows(
+            squads[manager_id],
+            ctx.biwenger_players,
+            ctx.jp_index,
+            include_clause=True,
+        )
+        for manager_id in managers
+    }
+    logger.info("League snapshot taken.", extra={"managers": len(managers)})
+    return LeagueSnapshot(
+        managers=managers, squads=squads, rows=rows, taken_at=time.monotonic()
+    )
+
+
+def get(ctx) -> LeagueSnapshot:
+    """The league's squads, read at most once every `SNAPSHOT_TTL_SECONDS`."""
+    global _snapshot
+    with _lock:
+        if (
+            _snapshot is not None
+            and time.monotonic() - _snapshot.taken_at < SNAPSHOT_TTL_SECONDS
+        ):
+            logger.info("League snapshot served from cache.")
+            return _snapshot
+        _snapshot = _read(ctx)
+        return _snapshot
+
+
+def invalidate() -> None:
+    """Drop the snapshot. Call after any write that moves a player."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
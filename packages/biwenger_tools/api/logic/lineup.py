@@ -3,9 +3,9 @@
 Given a squad of rows (with jp_player and position data), finds the formation
 and 11-player assignment that maximises the total SF predict score.
 
-For a high-level walkthrough of the algorithm (with the multi-position
-example that motivated exhaustive backtracking), see the
-"How `/alinear` picks the lineup" section of `../README.md`.
+Every formation is solved exactly in one pass over the squad — see
+`_solve_shapes` — so multi-position players are placed wherever the total
+is highest, with no cap on how many of them the search considers.
 """
 
 from html import escape
@@ -61,22 +61,15 @@ _UNCALLED_SF = 1
 # Injured, suspended, no fixture or no data. Still ahead of an empty slot.
 _DOUBTFUL_SF = 0
 
-# Per-slot branching cap inside `_try_fill`. The exhaustive backtracking
-# blows up exponentially when many multi-position players are eligible for
-# the same slot (a 20-player squad with several DEF/MID/FWD versatiles
-# pushed the search past 30 s and tripped gunicorn). Capping candidates per
-# slot to the top-K by SF bounds branching to K^slots while keeping the
-# optimal assignment for realistic Biwenger squads: no formation needs more
-# than 6 of a single position, and the chance the optimal picks a sub-top-K
-# (by SF) player at any given slot is negligible.
-_CANDIDATES_PER_SLOT = 4
-
-# Global pool cap per position before `_try_fill`. Trims the search at the
-# entry point: only the top-N players by SF eligible for each position make
-# it into the candidate pool (multi-position players are kept if they rank
-# top-N for any of their positions). N=8 leaves comfortable headroom over
-# the max 6 slots any formation uses for one position.
-_POOL_PER_POSITION = 8
+# The lines in the order the solver counts them, and the most slots any
+# formation gives each — the solver never needs to count past these.
+_LINES = (GK, DEF, MID, FWD)
+_LINE_CAPACITY = (
+    1,
+    max(n_def for _, n_def, _, _ in FORMATIONS),
+    max(n_mid for _, _, n_mid, _ in FORMATIONS),
+    max(n_fwd for _, _, _, n_fwd in FORMATIONS),
+)
 
 
 # ---------------------------------------------------------------------------
@@ -250,14 +243,12 @@ def _best_eleven(squad_rows: list) -> dict | None:
     """Best (formation, starters, reserves, captain) at the current marks."""
     available = [r for r in squad_rows if _is_available(r)]
     available.sort(key=_sf, reverse=True)
-    available = _trim_pool_by_position(available)
+    best_by_shape = _solve_shapes(available)
 
     best: dict | None = None
-    # Lexicographic (sum_sf, back_bias). Same tiebreaker as `_try_fill`, so
-    # ties between formations (3-4-3 vs 4-4-2 with the same SF) are broken in
-    # favour of the one that places more players further back than their
-    # primary position.
-    # Lexicographic (sum_sf, fallback projection, back_bias). The fallback
+    # Lexicographic (sum_sf, fallback projection, back_bias) — the same order
+    # `_solve_shapes` optimises within a formation, so ties between formations
+    # (3-4-3 vs 4-4-2 with the same SF) are broken the same way. The fallback
     # projection outranks the bias deliberately: the bias is worth a point or
     # two of goal bonus, while the gap between two fallbacks is hundreds of
     # projected points. Ranked the other way round, a 197 who gains +1 by
@@ -265,8 +256,7 @@ def _best_eleven(squad_rows: list) -> dict | None:
     best_score: tuple[int, int, int] = (-1, -1, -(10**9))
 
     for label, n_def, n_mid, n_fwd in FORMATIONS:
-        slots = {GK: 1, DEF: n_def, MID: n_mid, FWD: n_fwd}
-        assignment = _try_fill(available, slots)
+        assignment = best_by_shape.get((1, n_def, n_mid, n_fwd))
         if assignment is None:
             continue
 
@@ -325,8 +315,8 @@ def _promoted_starters(squad_rows: list, starters: list) -> list[dict]:
     "Displaced" is the highest-SF certain (`not _is_uncalled`) squad member
     in the promoted player's assigned line who did not start — `None` when
     the line has nobody else to displace. Computed from `squad_rows`, not
-    the trimmed candidate pool, so a certain starter dropped before
-    `_try_fill` still counts as the insurance that was bypassed.
+    the solver's candidates, so every certain squad member who did not
+    start counts as the insurance that was bypassed.
     """
     starter_ids = {r["bw_id"] for r, _ in starters}
     promotions = []
@@ -444,129 +434,94 @@ def _is_available(row: dict) -> bool:
 
 
 # ---------------------------------------------------------------------------
-# Internal: starters assignment (exhaustive backtracking)
+# Internal: starters assignment (exact dynamic programme)
 # ---------------------------------------------------------------------------
 
 
-def _trim_pool_by_position(players: list) -> list:
-    """Keep each player who ranks in the top-N by SF for any position they
-    can play. Drops obviously-unpickable depth (e.g. the 9th DEF when only
-    5 are needed) before `_try_fill` so the search space stays bounded for
-    20+ player squads. `players` must already be sorted by SF desc.
-    """
-    keep_ids: set = set()
-    for pos in (GK, DEF, MID, FWD):
-        seen = 0
-        for p in players:
-            if pos in _positions(p):
-                keep_ids.add(p["bw_id"])
-                seen += 1
-                if seen >= _POOL_PER_POSITION:
-                    break
-    return [p for p in players if p["bw_id"] in keep_ids]
-
-
-def _try_fill(players: list, slots: dict) -> list | None:
-    """Pick the assignment of `players` to `slots` that maximises (SF, back-bias).
-
-    Memoised exhaustive backtracking: for each open slot try every eligible
-    candidate, recurse on the rest, and keep the assignment with the highest
-    **lexicographic** `(sum of SF, back-bias)` score. Returns `None` if no
-    valid assignment exists.
-
-    Why two metrics:
-
-    1. SF (predicted score) is the primary signal. It already accounts for
-       most of what makes a player valuable for a given matchday.
-    2. When two assignments tie on SF — which happens often once you have
-       multi-position players — Biwenger's per-position goal bonus breaks
-       the tie. A DEF that scores a goal earns +7 points, a MID +5, a DEL
-       +4. JP's SF is a single number per player and does NOT change with
-       the slot, so picking the assignment that places players further back
-       captures expected bonus points the SF can't see. See `_back_bias_one`.
-
-    Why memoisation: the naive recursive search explores every ordering of
-    player picks, which is up to N! for a single formation. Many of those
-    orderings reach the same sub-state `(remaining_players, remaining_slots)`
-    by different paths. We cache by that state so each is solved once. A
-    squad of 12 with several multi-position players that previously timed
-    out the 300s job now completes in under a second.
-
-    Worked example with formation 4-3-3 that motivated the exhaustive search
-    (a FWD/MID player X with SF 400, three other FWDs 380/360/340 and three
-    MIDs 350/320/280):
-
-      X as FWD → FWDs sum 1140, MIDs sum 950 = 2090
-      X as MID → FWDs sum 1080, MIDs sum 1070 = 2150  ← higher SF, picked
-
-    To prune the search a bit, we fill the most-constrained position first
-    (fewest eligible players). This does not change correctness but cuts
-    branches early.
-    """
-    if not any(cnt > 0 for cnt in slots.values()):
-        return []
-    if not players:
-        return None
+def _slot_weights(players: list) -> list:
+    """Per player, the weight of fielding him in each line he covers.
 
-    # We memoise on (frozenset of bw_ids, sorted tuple of (pos, count)).
-    # Both keys are hashable and capture exactly the state of the search.
-    lookup = {p["bw_id"]: p for p in players}
-    cache: dict[tuple, tuple | None] = {}
+    The objective is lexicographic — `(sum of SF, fallback projection,
+    back-bias)` — and every term is a sum over the starters, so it packs into
+    one integer per `(player, line)` with each component scaled past the
+    largest total the components below it can reach over eleven starters.
+    Comparing packed sums is then exactly comparing the tuples, as long as
+    both sides count the same number of starters, which the solver
+    guarantees. The lower components are shifted to be non-negative (the
+    bias spans ±6 per player: a GK bonus of 10 against a FWD's 4).
+    """
+    bias_span = 2 * (max(GOAL_BONUS.values()) - min(GOAL_BONUS.values()))
+    bias_offset = bias_span // 2
+    fallbacks = [_fallback_rate(p) if _sf(p) <= _UNCALLED_SF else 0 for p in players]
+    fallback_low = min(fallbacks, default=0)
+    fallback_span = max(fallbacks, default=0) - fallback_low
+    fallback_scale = 11 * bias_span + 1
+    sf_scale = (11 * fallback_span + 1) * fallback_scale
+
+    weights = []
+    for player, fallback in zip(players, fallbacks):
+        sf = _sf(player)
+        covers = _positions(player)
+        weights.append(
+            [
+                (
+                    i,
+                    sf * sf_scale
+                    + (fallback - fallback_low) * fallback_scale
+                    + _back_bias_one(player, line)
+                    + bias_offset,
+                )
+                for i, line in enumerate(_LINES)
+                if line in covers
+            ]
+        )
+    return weights
 
-    def _solve(player_ids: frozenset, slots_t: tuple) -> tuple | None:
-        if not slots_t:
-            return ()
-        key = (player_ids, slots_t)
-        if key in cache:
-            return cache[key]
 
-        slots_dict = dict(slots_t)
+def _solve_shapes(players: list) -> dict:
+    """The best assignment for every formation at once.
 
-        def eligible(pos: int) -> int:
-            return sum(1 for pid in player_ids if pos in _positions(lookup[pid]))
+    Returns `{(gk, def, mid, fwd): [(row, pos_id), ...]}` for each line count
+    the squad can fill, each assignment maximising `(SF, fallback projection,
+    back-bias)` exactly.
 
-        pos_to_fill = min(slots_dict.keys(), key=eligible)
-        new_count = slots_dict[pos_to_fill] - 1
-        new_slots = dict(slots_dict)
-        if new_count == 0:
-            del new_slots[pos_to_fill]
-        else:
-            new_slots[pos_to_fill] = new_count
-        new_slots_t = tuple(sorted(new_slots.items()))
+    A 0/1 knapsack over the players: the state is how many players each line
+    holds so far, at most 2 x 6 x 7 x 6 of them, and each player either stays
+    out or joins one line he covers that still has room. Every formation is
+    one of the final states, so a single pass over the squad solves all
+    fourteen — a few milliseconds for a 25-man squad however many
+    multi-position players it carries, where the backtracking it replaced had
+    to cap both its candidates per slot and its pool per position to finish
+    at all, and so could only assume the optimum it now guarantees.
 
-        candidates = sorted(
-            (pid for pid in player_ids if pos_to_fill in _positions(lookup[pid])),
-            key=lambda pid: _sf(lookup[pid]),
-            reverse=True,
-        )[:_CANDIDATES_PER_SLOT]
-
-        best: tuple | None = None
-        best_score = (-1, -1, -(10**9))
-        for pid in candidates:
-            sub = _solve(player_ids - {pid}, new_slots_t)
-            if sub is None:
-                continue
-            here_sf = _sf(lookup[pid]) + sum(_sf(lookup[s_pid]) for s_pid, _ in sub)
-            here_bias = _back_bias_one(lookup[pid], pos_to_fill) + sum(
-                _back_bias_one(lookup[s_pid], slot) for s_pid, slot in sub
-            )
-            here_fallback = _fallback_total(
-                [(lookup[pid], pos_to_fill)] + [(lookup[s], sl) for s, sl in sub]
-            )
-            score = (here_sf, here_fallback, here_bias)
-            if score > best_score:
-                best_score = score
-                best = ((pid, pos_to_fill),) + sub
-
-        cache[key] = best
-        return best
-
-    initial_ids = frozenset(p["bw_id"] for p in players)
-    initial_slots = tuple(sorted((p, c) for p, c in slots.items() if c > 0))
-    solved = _solve(initial_ids, initial_slots)
-    if solved is None:
-        return None
-    return [(lookup[pid], slot) for pid, slot in solved]
+    Each player's weights are computed once up front instead of per search
+    node. Ties are kept by the first assignment reached, and `players` comes
+    in SF order, so the same squad always yields the same eleven.
+    """
+    weights = _slot_weights(players)
+    # state → (packed score, assignment as a linked list (row, pos, rest)).
+    best: dict[tuple, tuple] = {(0, 0, 0, 0): (0, None)}
+    for player, options in zip(players, weights):
+        if not options:
+            continue
+        for counts, (score, chain) in list(best.items()):
+            for i, weight in options:
+                if counts[i] == _LINE_CAPACITY[i]:
+                    continue
+                nxt = counts[:i] + (counts[i] + 1,) + counts[i + 1 :]
+                held = best.get(nxt)
+                if held is None or score + weight > held[0]:
+                    best[nxt] = (score + weight, (player, _LINES[i], chain))
+
+    shapes = {}
+    for counts, (_, chain) in best.items():
+        assignment = []
+        while chain is not None:
+            row, pos_id, chain = chain
+            assignment.append((row, pos_id))
+        assignment.reverse()
+        shapes[counts] = assignment
+    return shapes
 
 
 # ---------------------------------------------------------------------------
@@ -593,11 +548,11 @@ def _bench_rank(row: dict) -> tuple:
 def _pick_reserves(squad: list, starter_ids: set) -> list:
     """Pick up to 4 reserves in Biwenger's positional order: GK → DEF → MID → FWD.
 
-    Takes the **whole squad**, not the trimmed candidate pool. The trim exists
-    to bound the starter search, and letting it reach the bench silently lost
-    players: a squad with eleven midfield-eligible names left the midfield
-    reserve slot empty because the twelfth-ranked one had been dropped before
-    the bench was ever considered.
+    Takes the **whole squad**, not whatever the starter search was handed.
+    The search used to trim its pool per position, and letting that trim reach
+    the bench silently lost players: a squad with eleven midfield-eligible
+    names left the midfield reserve slot empty because the twelfth-ranked one
+    had been dropped before the bench was ever considered.
     """
     bench_pool = [r for r in squad if r["bw_id"] not in starter_ids]
     used_ids: set = set()
@@ -23,6 +23,7 @@ from core.sdk.telegram import send_telegram_message
 from core.utils import format_euros, get_logger
 from packages.biwenger_tools.api import config
 from packages.biwenger_tools.api.logic import auto_bid as ab
+from packages.biwenger_tools.api.logic import league_snapshot
 from packages.biwenger_tools.api.logic.orchestration import (
     OrchestratorContext,
     build_biwenger_session,
@@ -158,6 +159,9 @@ def run_offer_decision(offer_id: int, decision: str) -> dict:
     # players — skip the full context for speed.
     biwenger = build_biwenger_session()
     result = biwenger.decide_offer(int(offer_id), decision)
+    if decision == DECISION_ACCEPT:
+        # A sold player leaves the squad the snapshot still holds.
+        league_snapshot.invalidate()
 
     final_status = result.get("status")
     if decision == DECISION_ACCEPT:
@@ -3,16 +3,17 @@
 - `build_context()` — full setup: JP health probe, JP index,
   Biwenger session, players map.
 - `build_biwenger_session()` — Biwenger only, for handlers that
-  don't need JP.
+  don't need JP. Returns the instance's shared, already-authenticated
+  session; `reset_biwenger_session()` forgets it.
 - `require_telegram()` — `(token, chat_id)` if configured, else None.
 - `send_image_or_text_fallback()` — sendPhoto with a text fallback so a
   single Telegram refusal in a multi-photo flow doesn't kill the rest.
 """
 
-import time
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
+from core.sdk import biwenger as biwenger_sdk
 from core.sdk.biwenger import BiwengerClient
 from core.sdk.jp import check_api_health, fetch_all_players
 from core.sdk.telegram import (
@@ -52,6 +53,7 @@ def build_context() -> OrchestratorContext:
         config.JP_AUTH_TOKEN,
         competition=config.JP_COMPETITION,
         score_type=config.JP_SCORE_TYPE,
+        persistent=config.JP_PERSISTENT_CACHE,
     )
 
     biwenger = build_biwenger_session()
@@ -73,8 +75,12 @@ def build_context() -> OrchestratorContext:
 
 
 def build_biwenger_session() -> BiwengerClient:
-    """Biwenger session only — for handlers that don't need JP / player map."""
-    return BiwengerClient(
+    """Biwenger session only — for handlers that don't need JP / player map.
+
+    Shared across requests and threads: only the first call of an instance
+    logs in, and a stale token is refreshed by the client itself on `401`.
+    """
+    return biwenger_sdk.get_shared_client(
         config.BIWENGER_EMAIL,
         config.BIWENGER_PASSWORD,
         config.LOGIN_URL,
@@ -83,6 +89,11 @@ def build_biwenger_session() -> BiwengerClient:
     )
 
 
+def reset_biwenger_session() -> None:
+    """Drop the shared session so the next handler authenticates again."""
+    biwenger_sdk.reset_shared_clients()
+
+
 def require_telegram() -> Optional[Tuple[str, str]]:
     """Return `(bot_token, chat_id)` if both are configured, else None."""
     if not (config.TELEGRAM_BOT_TOKEN and config.TELEGRAM_CHAT_ID):
@@ -94,7 +105,7 @@ def require_telegram() -> Optional[Tuple[str, str]]:
 def send_image_or_text_fallback(
     token: str, chat_id: str, image: bytes, caption: str
 ) -> bool:
-    """sendPhoto + a small pause to stay under Telegram's send-rate cap.
+    """sendPhoto, paced by the SDK's per-chat rate limiter.
 
     Returns True on success. On photo failure (Telegram refusal, network
     blip), sends a short text fallback instead and returns False. Multi-
@@ -105,7 +116,6 @@ def send_image_or_text_fallback(
     """
     try:
         send_telegram_photo_or_raise(token, chat_id, image, caption)
-        time.sleep(0.5)
         return True
     except TelegramDeliveryError as exc:
         logger.error(
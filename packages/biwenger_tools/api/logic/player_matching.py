@@ -29,6 +29,19 @@ def normalize_name(name: str) -> str:
     return unidecode(name.lower().strip())
 
 
+# The last index built and the inputs it was built from. `fetch_all_players`
+# hands back the very same list for as long as JP's fingerprint holds, so the
+# identity of that list stands in for the fingerprint; the roster names are
+# compared by value. Holding the list also keeps its `id()` from being reused.
+_LAST_INDEX: tuple[list, tuple, dict] | None = None
+
+
+def reset_index_cache() -> None:
+    """Forget the memoised index so the next build starts from scratch."""
+    global _LAST_INDEX
+    _LAST_INDEX = None
+
+
 def build_jp_index(
     jp_players: list[dict], biwenger_names: list[str] | None = None
 ) -> dict:
@@ -37,6 +50,8 @@ def build_jp_index(
     Returns a dict with:
       - 'by_name': normalised name → JP player
       - 'by_slug': normalised slug → JP player (fallback)
+      - 'by_token': name token → normalised names carrying it, for the
+        token-subset tier; 'token_sets' holds each name's tokens
       - 'ambiguous_loose_targets': `id()` of JP players that the loose
         ladder in `find_player_match` would otherwise hand to 2+ different
         Biwenger players (e.g. "Rubén García", "Rubén López" and "Rubén
@@ -44,7 +59,21 @@ def build_jp_index(
         only when `biwenger_names` covers the full roster; empty otherwise,
         which disables the cross-roster check but leaves per-call matching
         (including the token-subset uniqueness gate) unaffected.
+      - 'resolved': Biwenger name → `find_player_match` result, filled for
+        the whole roster up front and for any other name on first lookup.
+
+    Rebuilding for the same JP payload and roster returns the previous
+    index, so every `build_context()` between two JP refreshes reuses it.
     """
+    global _LAST_INDEX
+    names = tuple(biwenger_names or ())
+    if (
+        _LAST_INDEX is not None
+        and _LAST_INDEX[0] is jp_players
+        and _LAST_INDEX[1] == names
+    ):
+        return _LAST_INDEX[2]
+
     by_name: dict[str, dict] = {}
     by_slug: dict[str, dict] = {}
     for p in jp_players:
@@ -54,24 +83,63 @@ def build_jp_index(
             by_name[normalize_name(name)] = p
         if slug:
             by_slug[normalize_name(slug)] = p
-    return {
+    token_sets, by_token = _token_index(by_name)
+
+    claims = {}
+    for bw_name in names:
+        norm = normalize_name(bw_name)
+        if norm not in claims:
+            safe = _safe_match(norm, by_name, by_slug)
+            loose = None
+            if safe is None:
+                loose = _loose_candidate(norm, by_name, by_token, token_sets)
+            claims[norm] = (safe, loose)
+    ambiguous = _find_ambiguous_loose_targets(claims)
+
+    resolved = {}
+    for bw_name in names:
+        safe, candidate = claims[normalize_name(bw_name)]
+        if safe is None and candidate is not None and id(candidate) in ambiguous:
+            candidate = None
+        resolved[bw_name] = safe if safe is not None else candidate
+
+    index = {
         "by_name": by_name,
         "by_slug": by_slug,
-        "ambiguous_loose_targets": _find_ambiguous_loose_targets(
-            biwenger_names or [], by_name, by_slug
-        ),
+        "by_token": by_token,
+        "token_sets": token_sets,
+        "ambiguous_loose_targets": ambiguous,
+        "resolved": resolved,
     }
+    _LAST_INDEX = (jp_players, names, index)
+    return index
+
 
+def _token_index(by_name: dict) -> tuple[dict, dict]:
+    """`(token_sets, by_token)` over the normalised JP names.
 
-def _loose_candidate(norm: str, by_name: dict) -> dict | None:
+    `by_token` lists names in `by_name` order, so the token-subset tier sees
+    its candidates in the order the old full scan did.
+    """
+    token_sets = {jp_norm: frozenset(jp_norm.split()) for jp_norm in by_name}
+    by_token: dict[str, list[str]] = defaultdict(list)
+    for jp_norm, tokens in token_sets.items():
+        for token in tokens:
+            by_token[token].append(jp_norm)
+    return token_sets, dict(by_token)
+
+
+def _loose_candidate(
+    norm: str, by_name: dict, by_token: dict, token_sets: dict
+) -> dict | None:
     """Surname / first name / initial+surname / token-subset ladder.
 
     The first three tiers are single-key lookups, so at most one JP
     player can ever qualify per call — real ambiguity there only shows up
     across the whole Biwenger roster (see `_find_ambiguous_loose_targets`).
-    The token-subset tier scans the whole index, so it can find several
-    qualifying JP players within a single call; it is accepted only when
-    exactly one does.
+    The token-subset tier can find several qualifying JP players within a
+    single call; it is accepted only when exactly one does. It reads the
+    names sharing the query's rarest token instead of the whole index.
     """
     parts = norm.split()
     if len(parts) > 1:
@@ -90,10 +158,11 @@ def _loose_candidate(norm: str, by_name: dict) -> dict | None:
     parts_set = set(parts)
     if not parts_set:
         return None
+    postings = [by_token.get(token, ()) for token in parts_set]
     matches = [
-        jp_player
-        for jp_norm, jp_player in by_name.items()
-        if parts_set.issubset(set(jp_norm.split()))
+        by_name[jp_norm]
+        for jp_norm in min(postings, key=len)
+        if parts_set <= token_sets[jp_norm]
     ]
     return matches[0] if len(matches) == 1 else None
 
@@ -114,12 +183,11 @@ def _safe_match(norm: str, by_name: dict, by_slug: dict) -> dict | None:
     return None
 
 
-def _find_ambiguous_loose_targets(
-    biwenger_names: list[str], by_name: dict, by_slug: dict
-) -> set[int]:
+def _find_ambiguous_loose_targets(claims: dict) -> set[int]:
     """JP player identities the loose ladder must not resolve on its own.
 
-    A target is blocked when either:
+    `claims` maps each normalised Biwenger name to its `(safe, loose)`
+    matches. A target is blocked when either:
       - 2+ Biwenger names would independently reduce to it through the
         loose ladder (e.g. "Rubén García" and "Rubén López" both landing
         on the JP mononym "Rubén"), or
@@ -130,14 +198,10 @@ def _find_ambiguous_loose_targets(
     """
     safely_claimed: set[int] = set()
     loose_claimants: dict[int, set[str]] = defaultdict(set)
-    for bw_name in biwenger_names:
-        norm = normalize_name(bw_name)
-        safe = _safe_match(norm, by_name, by_slug)
+    for norm, (safe, candidate) in claims.items():
         if safe is not None:
             safely_claimed.add(id(safe))
-            continue
-        candidate = _loose_candidate(norm, by_name)
-        if candidate is not None:
+        elif candidate is not None:
             loose_claimants[id(candidate)].add(norm)
     ambiguous = {jp_id for jp_id, names in loose_claimants.items() if len(names) > 1}
     ambiguous |= safely_claimed & set(loose_claimants)
@@ -163,17 +227,25 @@ def find_player_match(biwenger_name: str, jp_index: dict) -> dict | None:
     a loose match exists but is ambiguous. Callers already treat a missing
     JP player as "no data for this player" rather than an error.
     """
+    resolved = jp_index.get("resolved")
+    if resolved is not None and biwenger_name in resolved:
+        return resolved[biwenger_name]
+
     by_name = jp_index["by_name"]
     by_slug = jp_index["by_slug"]
     norm = normalize_name(biwenger_name)
 
-    safe = _safe_match(norm, by_name, by_slug)
-    if safe is not None:
-        return safe
-
-    candidate = _loose_candidate(norm, by_name)
-    if candidate is None:
-        return None
-    if id(candidate) in jp_index.get("ambiguous_loose_targets", ()):
-        return None
-    return candidate
+    match = _safe_match(norm, by_name, by_slug)
+    if match is None:
+        if "by_token" in jp_index:
+            token_sets, by_token = jp_index["token_sets"], jp_index["by_token"]
+        else:  # a hand-built index: derive the token tables on the spot
+            token_sets, by_token = _token_index(by_name)
+        match = _loose_candidate(norm, by_name, by_token, token_sets)
+        if match is not None and id(match) in jp_index.get(
+            "ambiguous_loose_targets", ()
+        ):
+            match = None
+    if resolved is not None:
+        resolved[biwenger_name] = match
+    return match
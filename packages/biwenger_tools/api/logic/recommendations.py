@@ -178,7 +178,7 @@ def run_recommendations(
     margin = max(0, margin)
     target = cash + margin
 
-    rivals = gather_rivals(ctx.biwenger, ctx.biwenger_players, ctx.jp_index)
+    rivals = gather_rivals(ctx)
     affordable = filter_affordable(rivals, my_ids, target)
     recommendations = _pick_top_per_position(affordable, top)
 
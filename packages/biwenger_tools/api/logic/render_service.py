@@ -0,0 +1,137 @@
+"""Renders table PNGs in a pool of worker processes.
+
+`build_table_image` costs a few hundred milliseconds of pure CPU a table, and
+the GIL keeps threads from sharing it out: `/analizar TODOS` renders one
+table per manager plus the market, and the daily digest two, each after the
+other in the request thread. Processes do run side by side, so those
+commands scale with the instance's cores.
+
+- `submit_table()` — start one render, get a `Future` of its PNG bytes.
+  Hand each future to a `DeliveryPipeline` as soon as it is submitted: the
+  PNGs go out in the order asked, and with no pool — where `submit_table`
+  itself draws — the next table still renders while the last one uploads.
+- `reset_render_pool()` — stop the workers; the next render starts new ones.
+
+Workers are spawned, not forked — the api runs threads that a fork would
+copy mid-flight — and each one imports matplotlib, loads the fonts and draws
+a throwaway table before taking work, so no request pays for that setup.
+The pool starts on the first render, never at import: gunicorn imports the
+app before it forks. A spawned worker re-imports the parent's `__main__` as
+`__mp_main__`, so whatever launched the process must keep its side effects
+under `if __name__ == "__main__":` — `gunicorn_prod_runner.py` does.
+
+`config.RENDER_WORKERS = 0` (the default) renders in the caller's thread
+instead. A pool that dies — on submit or under a render already queued —
+falls back to it, and the next render starts a new pool.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.utils import get_logger
+from packages.biwenger_tools.api import config
+from packages.biwenger_tools.api.logic import image_formatter
+
+logger = get_logger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _warm() -> None:
+    """Worker initializer: pay matplotlib's import, font cache and first
+    figure here rather than on a request's table."""
+    image_formatter.build_table_image([], "")
+
+
+def _render(rows, title, extra_cols, show_total_value) -> bytes:
+    return image_formatter.build_table_image(
+        rows, title, extra_cols=extra_cols, show_total_value=show_total_value
+    )
+
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    global _pool
+    with _pool_lock:
+        if _pool is None and config.RENDER_WORKERS > 0:
+            _pool = ProcessPoolExecutor(
+                max_workers=config.RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm,
+            )
+            logger.info(
+                "Render pool started.", extra={"workers": config.RENDER_WORKERS}
+            )
+        return _pool
+
+
+def reset_render_pool() -> None:
+    """Shut the workers down. The next render starts a fresh pool."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _drop(pool: ProcessPoolExecutor) -> None:
+    """Retire a pool found broken, unless another caller already replaced it."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _render_here(rows, title, extra_cols, show_total_value) -> Future:
+    done: Future = Future()
+    try:
+        done.set_result(_render(rows, title, extra_cols, show_total_value))
+    except Exception as exc:
+        done.set_exception(exc)
+    return done
+
+
+def _falling_back(render: Future, args: tuple, pool: ProcessPoolExecutor) -> Future:
+    """`render`'s outcome, except that a pool that broke under it (or was
+    shut down with it queued) renders `args` here instead."""
+    out: Future = Future()
+
+    def settle(done: Future) -> None:
+        if done.cancelled() or isinstance(done.exception(), BrokenProcessPool):
+            logger.warning("Render pool broken; rendering in-process.")
+            _drop(pool)
+            done = _render_here(*args)
+        if done.exception() is not None:
+            out.set_exception(done.exception())
+        else:
+            out.set_result(done.result())
+
+    render.add_done_callback(settle)
+    return out
+
+
+def submit_table(
+    rows: list[dict],
+    title: str,
+    extra_cols: list[str] | None = None,
+    show_total_value: bool = False,
+) -> Future:
+    """`build_table_image` in a worker; the `Future` resolves to the PNG.
+
+    Same arguments as `build_table_image`. A render that raises raises from
+    `Future.result()`, as it would have from the call.
+    """
+    args = (rows, title, extra_cols, show_total_value)
+    pool = _get_pool()
+    if pool is not None:
+        try:
+            return _falling_back(pool.submit(_render, *args), args, pool)
+        except (BrokenProcessPool, RuntimeError):
+            # A worker died (OOM-killed, most likely) and took the pool with
+            # it. Render here, and let the next call start a new pool.
+            logger.warning("Render pool broken; rendering in-process.")
+            _drop(pool)
+    return _render_here(*args)
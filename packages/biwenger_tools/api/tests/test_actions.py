@@ -1,16 +1,25 @@
 """Unit tests for `api/logic/actions` — specifically the resilience of
 multi-photo flows. Route wiring is tested in `test_routes.py`."""
 
+import time
+from concurrent.futures import Future
 from contextlib import ExitStack
 from unittest.mock import MagicMock, patch
 
-from packages.biwenger_tools.api.logic import league_compare
+from packages.biwenger_tools.api.logic import league_compare, league_snapshot
 
 
 def _patches(target):
     return f"packages.biwenger_tools.api.logic.actions.{target}"
 
 
+def _rendered(rows, title, extra_cols=None, show_total_value=False):
+    """`submit_table` without the pool: an already-finished render."""
+    render = Future()
+    render.set_result(b"")
+    return render
+
+
 def test_run_teams_all_mode_continues_after_first_photo_fails():
     """A single Telegram refusal in the middle of an /analizar TODOS run
     must not skip the remaining manager squads or the mercado photo. The
@@ -19,7 +28,7 @@ def test_run_teams_all_mode_continues_after_first_photo_fails():
     biwenger = MagicMock()
     biwenger.user_id = 1
     biwenger.get_league_users.return_value = {1: "Me", 2: "Rival"}
-    biwenger.get_manager_squad.return_value = []
+    biwenger.get_manager_squads.side_effect = lambda url, ids: {i: [] for i in ids}
     biwenger.get_market_players.return_value = []
 
     from packages.biwenger_tools.api.logic.orchestration import OrchestratorContext
@@ -36,7 +45,7 @@ def test_run_teams_all_mode_continues_after_first_photo_fails():
     stack.enter_context(
         patch(_patches("require_telegram"), return_value=("tok", "chat"))
     )
-    stack.enter_context(patch(_patches("build_table_image"), return_value=b""))
+    stack.enter_context(patch(_patches("submit_table"), side_effect=_rendered))
     # First photo (Mi equipo) fails, the rest land. The mercado photo at the
     # end MUST still go out — that's the regression.
     mock_send = stack.enter_context(
@@ -68,7 +77,7 @@ def test_run_teams_all_mode_survives_a_broken_market():
     biwenger = MagicMock()
     biwenger.user_id = 1
     biwenger.get_league_users.return_value = {1: "Me", 2: "Rival"}
-    biwenger.get_manager_squad.return_value = []
+    biwenger.get_manager_squads.side_effect = lambda url, ids: {i: [] for i in ids}
     biwenger.get_market_players.side_effect = AttributeError(
         "'NoneType' object has no attribute 'get'"
     )
@@ -87,7 +96,7 @@ def test_run_teams_all_mode_survives_a_broken_market():
     stack.enter_context(
         patch(_patches("require_telegram"), return_value=("tok", "chat"))
     )
-    stack.enter_context(patch(_patches("build_table_image"), return_value=b""))
+    stack.enter_context(patch(_patches("submit_table"), side_effect=_rendered))
     stack.enter_context(
         patch(_patches("send_image_or_text_fallback"), return_value=True)
     )
@@ -105,9 +114,118 @@ def test_run_teams_all_mode_survives_a_broken_market():
     assert "Mercado" in notice.call_args.kwargs["text"]
 
 
+def test_run_teams_all_mode_survives_a_market_that_fails_to_render():
+    """The market renders in the pool while the squads upload, so its failure
+    surfaces in the sender, not the request thread. It must still end as the
+    market notice, not a 500."""
+    biwenger = MagicMock()
+    biwenger.user_id = 1
+    biwenger.get_league_users.return_value = {1: "Me", 2: "Rival"}
+    biwenger.get_manager_squads.side_effect = lambda url, ids: {i: [] for i in ids}
+    biwenger.get_market_players.return_value = []
+
+    from packages.biwenger_tools.api.logic.orchestration import OrchestratorContext
+
+    ctx = OrchestratorContext(
+        biwenger=biwenger,
+        biwenger_players={},
+        jp_index={"by_name": {}, "by_slug": {}},
+    )
+
+    def _market_breaks(rows, title, extra_cols=None, show_total_value=False):
+        render = _rendered(rows, title)
+        if "Mercado" in title:
+            render = Future()
+            render.set_exception(RuntimeError("render boom"))
+        return render
+
+    stack = ExitStack()
+    stack.enter_context(patch(_patches("config")))
+    stack.enter_context(patch(_patches("build_context"), return_value=ctx))
+    stack.enter_context(
+        patch(_patches("require_telegram"), return_value=("tok", "chat"))
+    )
+    stack.enter_context(patch(_patches("submit_table"), side_effect=_market_breaks))
+    mock_send = stack.enter_context(
+        patch(_patches("send_image_or_text_fallback"), return_value=True)
+    )
+    notice = stack.enter_context(patch(_patches("send_telegram_message")))
+    try:
+        from packages.biwenger_tools.api.logic import actions
+
+        result = actions.run_teams(manager_id=None)
+    finally:
+        stack.close()
+
+    assert mock_send.call_count == 2
+    assert result["sent"] == 2
+    assert "Mercado" in notice.call_args.kwargs["text"]
+
+
 # --- league comparison ---
 
 
+def test_run_teams_uploads_while_rendering_without_a_render_pool():
+    """With `RENDER_WORKERS=0` — the shipped default — every table renders in
+    the request thread. The first photo must start uploading while the rest
+    are still drawing, not after all of them are done."""
+    biwenger = MagicMock()
+    biwenger.user_id = 1
+    biwenger.get_league_users.return_value = {1: "Me", 2: "R1", 3: "R2"}
+    biwenger.get_manager_squads.side_effect = lambda url, ids: {i: [] for i in ids}
+    biwenger.get_market_players.return_value = []
+
+    from packages.biwenger_tools.api import config as api_config
+    from packages.biwenger_tools.api.logic import render_service
+    from packages.biwenger_tools.api.logic.orchestration import OrchestratorContext
+
+    ctx = OrchestratorContext(
+        biwenger=biwenger,
+        biwenger_players={},
+        jp_index={"by_name": {}, "by_slug": {}},
+    )
+    events = []
+
+    def _render(rows, title, extra_cols, show_total_value):
+        time.sleep(0.03)
+        events.append(("rendered", title))
+        return title.encode()
+
+    def _upload(token, chat_id, image, caption):
+        events.append(("upload", caption))
+        time.sleep(0.03)
+        return True
+
+    stack = ExitStack()
+    stack.enter_context(patch(_patches("config")))
+    stack.enter_context(patch.object(api_config, "RENDER_WORKERS", 0))
+    stack.enter_context(patch.object(render_service, "_render", _render))
+    stack.enter_context(patch(_patches("build_context"), return_value=ctx))
+    stack.enter_context(
+        patch(_patches("require_telegram"), return_value=("tok", "chat"))
+    )
+    stack.enter_context(
+        patch(_patches("send_image_or_text_fallback"), side_effect=_upload)
+    )
+    try:
+        from packages.biwenger_tools.api.logic import actions
+
+        result = actions.run_teams(manager_id=None)
+    finally:
+        stack.close()
+
+    assert result["sent"] == 4
+    assert [c for kind, c in events if kind == "upload"] == [
+        "🛡️ Mi equipo",
+        "👤 R1",
+        "👤 R2",
+        "🛒 Mercado",
+    ]
+    assert events.index(("upload", "🛡️ Mi equipo")) < events.index(
+        ("rendered", "👤 R2")
+    )
+
+
 def _squad(value, projection):
     return {"value": value, "projection": projection, "size": 15}
 
@@ -137,21 +255,6 @@ def test_the_two_rankings_are_independent():
     assert league_compare.rank(summary, "projection") == ["Barato", "Caro"]
 
 
-def test_the_comparison_is_cached_so_a_second_tap_costs_nothing():
-    """Nine Biwenger reads hang off a button, against a budget the whole league
-    shares."""
-    league_compare.reset_cache()
-    ctx = object()
-    with patch.object(
-        league_compare, "collect", return_value={"A": _squad(1, 1)}
-    ) as collect:
-        league_compare.collect_cached(ctx)
-        league_compare.collect_cached(ctx)
-
-    collect.assert_called_once()
-    league_compare.reset_cache()
-
-
 def test_render_values_ranks_every_squad_and_totals_the_league():
     """The daily snapshot: value only. Projection is deliberately absent —
     it changes every matchday and the lineup message sent moments earlier
@@ -178,20 +281,20 @@ def test_collect_survives_a_player_jornada_perfecta_does_not_carry():
 
     biwenger = MagicMock()
     biwenger.get_league_users.return_value = {1: "Jorge"}
-    biwenger.get_manager_squad.return_value = [{"id": 10}, {"id": 11}]
+    biwenger.get_manager_squads.return_value = {1: [{"id": 10}, {"id": 11}]}
     ctx = MagicMock(biwenger=biwenger, biwenger_players={}, jp_index={})
 
     rows = [
         {"price": 7_400_000, "jp_player": {"predict": [{"type": 2, "rate": 538}]}},
         {"price": 2_200_000, "jp_player": None},  # signed, not in JP yet
     ]
-    league_compare.reset_cache()
+    league_snapshot.invalidate()
     with patch(
-        "packages.biwenger_tools.api.logic.league_compare.build_squad_rows",
+        "packages.biwenger_tools.api.logic.league_snapshot.build_squad_rows",
         return_value=rows,
     ):
         summary = league_compare.collect(ctx)
 
     assert summary["Jorge"]["value"] == 9_600_000
     assert summary["Jorge"]["projection"] == 538
-    league_compare.reset_cache()
+    league_snapshot.invalidate()
@@ -5,6 +5,8 @@ its swallow-on-failure behaviour. The HTTP route is tested in
 `test_routes.py`.
 """
 
+import time
+from concurrent.futures import Future
 from contextlib import ExitStack
 from unittest.mock import MagicMock, patch
 
@@ -13,6 +15,13 @@ def _patches(target):
     return f"packages.biwenger_tools.api.logic.digests.{target}"
 
 
+def _rendered(rows, title, extra_cols=None, show_total_value=False):
+    """`submit_table` without the pool: an already-finished render."""
+    render = Future()
+    render.set_result(b"")
+    return render
+
+
 def _build_ctx(biwenger):
     """Wrap a Biwenger mock in an OrchestratorContext for `build_context` to
     return. Pulled out so every test stays on the same wiring."""
@@ -71,9 +80,8 @@ def _digest_env(
     mock_send = stack.enter_context(
         patch(_patches("send_image_or_text_fallback"), return_value=True)
     )
-    # `build_table_image` runs synchronously before `_send_image` — patching
-    # the renderer avoids matplotlib choking on the empty-row stub data.
-    stack.enter_context(patch(_patches("build_table_image"), return_value=b""))
+    # Render in place of the pool: no worker processes, no matplotlib.
+    stack.enter_context(patch(_patches("submit_table"), side_effect=_rendered))
     if auto_bid_raises is not None:
         mock_auto_bid = stack.enter_context(
             patch(_patches("auto_bid.run_auto_bid"), side_effect=auto_bid_raises)
@@ -123,6 +131,43 @@ def test_run_daily_chains_auto_bid_after_sending_images():
     assert result["auto_bid"]["bid_count"] == 2
 
 
+def test_run_daily_uploads_the_team_while_the_market_renders():
+    """Without a render pool (`RENDER_WORKERS=0`, the default) each table
+    renders in the request thread; the team photo must be on its way before
+    the market table is drawn, not after both are."""
+    from packages.biwenger_tools.api import config as api_config
+    from packages.biwenger_tools.api.logic import render_service
+
+    events = []
+
+    def _render(rows, title, extra_cols, show_total_value):
+        time.sleep(0.03)
+        events.append(("rendered", title))
+        return b""
+
+    def _upload(token, chat_id, image, caption):
+        events.append(("upload", caption))
+        time.sleep(0.03)
+        return True
+
+    stack, mock_send, _, _ = _digest_env()
+    stack.enter_context(patch.object(api_config, "RENDER_WORKERS", 0))
+    stack.enter_context(patch.object(render_service, "_render", _render))
+    stack.enter_context(
+        patch(_patches("submit_table"), side_effect=render_service.submit_table)
+    )
+    mock_send.side_effect = _upload
+    try:
+        from packages.biwenger_tools.api.logic import digests
+
+        result = digests.run_daily()
+    finally:
+        stack.close()
+
+    assert result["sent"] == 2
+    assert events.index(("upload", "Mi equipo")) < events.index(("rendered", "Mercado"))
+
+
 def test_run_daily_swallows_auto_bid_failure_and_still_returns_digest_summary():
     """A broken auto-bid run must not lose the digest we already sent. The
     summary surfaces the error, but the route stays 200 OK."""
@@ -176,7 +221,7 @@ def test_send_image_or_text_fallback_sends_text_on_telegram_delivery_error():
     with patch(
         orch + "send_telegram_photo_or_raise",
         side_effect=TelegramDeliveryError("boom"),
-    ), patch(orch + "send_telegram_message") as mock_text, patch(orch + "time.sleep"):
+    ), patch(orch + "send_telegram_message") as mock_text:
         ok = orchestration.send_image_or_text_fallback(
             "tok", "chat", b"img", "Mi equipo"
         )
@@ -219,14 +264,16 @@ def test_run_daily_market_survives_team_section_failure():
     failure note for the dead section and the digest continues."""
 
     def _boom_on_team(rows, title, extra_cols=None, show_total_value=False):
+        render = _rendered(rows, title)
         if title == "Mi equipo":
-            raise RuntimeError("render boom")
-        return b""
+            render = Future()
+            render.set_exception(RuntimeError("render boom"))
+        return render
 
     stack, mock_send, mock_auto_bid, _ = _digest_env(
         auto_bid_result={"bid_count": 0, "skipped_count": 0}
     )
-    stack.enter_context(patch(_patches("build_table_image"), side_effect=_boom_on_team))
+    stack.enter_context(patch(_patches("submit_table"), side_effect=_boom_on_team))
     mock_text = stack.enter_context(patch(_patches("send_telegram_message")))
     try:
         from packages.biwenger_tools.api.logic import digests
@@ -354,12 +401,12 @@ def _league_values_env(*, collect_result=None, collect_raises=None, enabled=True
     digests.config.DAILY_LEAGUE_VALUES_ENABLED = enabled
     if collect_raises is not None:
         stack.enter_context(
-            patch(_patches("league_compare.collect_cached"), side_effect=collect_raises)
+            patch(_patches("league_compare.collect"), side_effect=collect_raises)
         )
     else:
         stack.enter_context(
             patch(
-                _patches("league_compare.collect_cached"),
+                _patches("league_compare.collect"),
                 return_value=collect_result if collect_result is not None else {},
             )
         )
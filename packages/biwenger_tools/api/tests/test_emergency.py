@@ -41,6 +41,13 @@ def _board_entry(date_epoch, from_id=None, from_name=None, player_id=42):
     }
 
 
+def _board(biwenger, entries):
+    """Serve `entries` through a windowed feed that honours `since`."""
+    biwenger.iter_clausulazos.side_effect = lambda url, since: (
+        e for e in entries if e["date"] >= since
+    )
+
+
 def _bw_player(player_id, name, position, alt=None):
     return {
         "id": player_id,
@@ -53,9 +60,7 @@ def _bw_player(player_id, name, position, alt=None):
 
 def test_recent_lost_players_matches_by_user_id():
     biwenger = MagicMock(user_id=99)
-    biwenger.get_all_clausulazos.return_value = {
-        "data": [_board_entry(1000, from_id=99, player_id=42)]
-    }
+    _board(biwenger, [_board_entry(1000, from_id=99, player_id=42)])
     players = {42: _bw_player(42, "Ana", position=2)}
     losses = clausulazo_detection.recent_lost_players(
         biwenger, players, my_manager_name="anyone", now_epoch=1500
@@ -66,9 +71,7 @@ def test_recent_lost_players_matches_by_user_id():
 def test_recent_lost_players_matches_by_name_when_id_missing():
     """Board payload variants may omit `from.id` — fall back to name match."""
     biwenger = MagicMock(user_id=99)
-    biwenger.get_all_clausulazos.return_value = {
-        "data": [_board_entry(1000, from_name="Lillo", player_id=42)]
-    }
+    _board(biwenger, [_board_entry(1000, from_name="Lillo", player_id=42)])
     players = {42: _bw_player(42, "Ana", position=2)}
     losses = clausulazo_detection.recent_lost_players(
         biwenger, players, my_manager_name="Lillo", now_epoch=1500
@@ -78,23 +81,27 @@ def test_recent_lost_players_matches_by_name_when_id_missing():
 
 def test_recent_lost_players_ignores_entries_older_than_24h():
     biwenger = MagicMock(user_id=99)
-    biwenger.get_all_clausulazos.return_value = {
-        "data": [_board_entry(date_epoch=10, from_id=99, player_id=42)]
-    }
+    _board(biwenger, [_board_entry(date_epoch=10, from_id=99, player_id=42)])
     players = {42: _bw_player(42, "Ana", position=2)}
     now = 10 + clausulazo_detection.RECENT_CLAUSULAZO_WINDOW_SECONDS + 1
     losses = clausulazo_detection.recent_lost_players(
         biwenger, players, my_manager_name="x", now_epoch=now
     )
     assert losses == []
+    # The window is the feed's cutoff, not a filter over the whole season.
+    biwenger.iter_clausulazos.assert_called_once_with(
+        clausulazo_detection.config.CLAUSULAZOS_URL, since=10 + 1
+    )
+    biwenger.get_all_clausulazos.assert_not_called()
 
 
 def test_recent_lost_players_returns_all_matches_including_multi_pos():
     """Multi-position losses are surfaced (so the selector can list
     them); the suppression rule lives in `preview_clausulazo`, not here."""
     biwenger = MagicMock(user_id=99)
-    biwenger.get_all_clausulazos.return_value = {
-        "data": [
+    _board(
+        biwenger,
+        [
             {
                 "date": 1000,
                 "content": [
@@ -110,8 +117,8 @@ def test_recent_lost_players_returns_all_matches_including_multi_pos():
                     },
                 ],
             }
-        ]
-    }
+        ],
+    )
     players = {
         42: _bw_player(42, "MultiGuy", position=2, alt=[3]),
         43: _bw_player(43, "SimpleGuy", position=4),
@@ -125,9 +132,7 @@ def test_recent_lost_players_returns_all_matches_including_multi_pos():
 
 def test_recent_lost_players_ignores_other_managers_losses():
     biwenger = MagicMock(user_id=99)
-    biwenger.get_all_clausulazos.return_value = {
-        "data": [_board_entry(1000, from_id=42, from_name="Otro", player_id=42)]
-    }
+    _board(biwenger, [_board_entry(1000, from_id=42, from_name="Otro", player_id=42)])
     players = {42: _bw_player(42, "X", position=2)}
     losses = clausulazo_detection.recent_lost_players(
         biwenger, players, my_manager_name="Lillo", now_epoch=1500
@@ -241,7 +246,8 @@ def _patches(target):
 @pytest.fixture
 def preview_env():
     """Wire `preview_clausulazo` collaborators: build_context, gather_rivals,
-    filter_affordable, _send. Returns the mocks the test wants to assert on."""
+    the league snapshot, filter_affordable, _send. Returns the mocks the
+    test wants to assert on."""
     from contextlib import ExitStack
 
     def _enter(
@@ -258,7 +264,6 @@ def preview_env():
         biwenger = MagicMock(user_id=99)
         biwenger.get_manager_squad.return_value = my_squad
         biwenger.get_account_state.return_value = {"cash": cash, "max_bid": cash}
-        biwenger.get_league_users.return_value = {99: "Lillo"}
 
         from packages.biwenger_tools.api.logic.orchestration import (
             OrchestratorContext,
@@ -276,6 +281,12 @@ def preview_env():
             patch(_patches("recent_lost_players"), return_value=losses or [])
         )
         stack.enter_context(patch(_patches("gather_rivals"), return_value=rivals))
+        stack.enter_context(
+            patch(
+                _patches("league_snapshot.get"),
+                return_value=MagicMock(managers={99: "Lillo"}),
+            )
+        )
         stack.enter_context(
             patch(_patches("filter_affordable"), return_value=affordable)
         )
@@ -497,6 +508,27 @@ def test_execute_clausulazo_calls_sdk_and_notifies():
     assert "Iago Aspas" in text
 
 
+def test_execute_clausulazo_drops_the_league_snapshot_only_once_it_lands():
+    """The player changed hands, so the shared squads are stale — but a
+    rejected clausulazo moved nobody and the snapshot stays."""
+    biwenger = MagicMock()
+    biwenger.place_clausulazo.return_value = {"id": 777, "status": "processed"}
+    biwenger.get_account_state.return_value = {"cash": 1_000_000}
+    biwenger.get_all_players_data_map.return_value = {}
+    with patch(_patches("build_biwenger_session"), return_value=biwenger), patch(
+        _patches("_send")
+    ), patch(_patches("league_snapshot.invalidate")) as invalidate:
+        emergency.execute_clausulazo(player_id=42, owner_user_id=7, amount=5_000_000)
+        invalidate.assert_called_once()
+
+        biwenger.place_clausulazo.side_effect = RuntimeError("403 Clause locked")
+        with pytest.raises(RuntimeError):
+            emergency.execute_clausulazo(
+                player_id=42, owner_user_id=7, amount=5_000_000
+            )
+        invalidate.assert_called_once()
+
+
 def test_execute_clausulazo_falls_back_to_id_when_player_missing_from_map():
     """Defensive: if the players map doesn't have the id (cache miss,
     new player, etc.), the message still goes out — just with the id."""
@@ -0,0 +1,96 @@
+"""Unit tests for `api/logic/league_snapshot.py`.
+
+The snapshot is what recommendations, `/emergencia` and the league
+comparison read their squads from, so the tests drive it through those
+callers' entry points (`gather_rivals`, `league_compare.collect`) and count
+the Biwenger reads underneath.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from packages.biwenger_tools.api.logic import clausulazo_candidates as cands
+from packages.biwenger_tools.api.logic import league_compare, league_snapshot
+
+_PLAYERS = {
+    11: {"id": 11, "name": "Ana-Gk", "position": 1, "price": 5, "altPositions": []},
+    21: {"id": 21, "name": "Beto-Fw", "position": 4, "price": 7, "altPositions": []},
+}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_snapshot():
+    league_snapshot.invalidate()
+    yield
+    league_snapshot.invalidate()
+
+
+def _ctx():
+    biwenger = MagicMock(user_id=1)
+    biwenger.get_league_users.return_value = {1: "Ana", 2: "Beto"}
+    biwenger.get_manager_squads.return_value = {1: [{"id": 11}], 2: [{"id": 21}]}
+    return MagicMock(
+        biwenger=biwenger,
+        biwenger_players=_PLAYERS,
+        jp_index={"by_name": {}, "by_slug": {}},
+    )
+
+
+def test_chained_commands_share_one_read_of_the_league():
+    """Recommendations, `/emergencia` and `/comparar` within a few minutes:
+    one roster read and one squad fan-out between the three."""
+    ctx = _ctx()
+
+    cands.gather_rivals(ctx)
+    cands.gather_rivals(ctx)
+    summary = league_compare.collect(ctx)
+
+    ctx.biwenger.get_league_users.assert_called_once()
+    ctx.biwenger.get_manager_squads.assert_called_once()
+    assert summary == {
+        "Ana": {"value": 5, "projection": 0, "size": 1},
+        "Beto": {"value": 7, "projection": 0, "size": 1},
+    }
+
+
+def test_invalidate_makes_the_next_caller_read_the_league_again():
+    """After a clausulazo or a transfer the snapshot is wrong by one player;
+    the next read must see the squads as they are now."""
+    ctx = _ctx()
+
+    league_compare.collect(ctx)
+    league_snapshot.invalidate()
+    league_compare.collect(ctx)
+
+    assert ctx.biwenger.get_manager_squads.call_count == 2
+
+
+def test_snapshot_expires_after_its_ttl(monkeypatch):
+    """A rival's clausulazo is never announced to us; the TTL is what bounds
+    how long it can go unseen."""
+    clock = [1000.0]
+    monkeypatch.setattr(league_snapshot.time, "monotonic", lambda: clock[0])
+    ctx = _ctx()
+
+    league_compare.collect(ctx)
+    clock[0] += league_snapshot.SNAPSHOT_TTL_SECONDS - 1
+    league_compare.collect(ctx)
+    assert ctx.biwenger.get_manager_squads.call_count == 1
+
+    clock[0] += 1
+    league_compare.collect(ctx)
+    assert ctx.biwenger.get_manager_squads.call_count == 2
+
+
+def test_rival_annotations_do_not_leak_into_the_shared_rows():
+    """`gather_rivals` tags its rows with the owner; the snapshot's rows are
+    shared with the next caller and must come back untouched."""
+    ctx = _ctx()
+
+    rivals = cands.gather_rivals(ctx)
+    shared = league_snapshot.get(ctx).rows[2][0]
+
+    assert [r["owner"] for r in rivals] == ["Beto"]
+    assert "owner" not in shared
+    assert shared["clause_value"] == 0  # built with include_clause
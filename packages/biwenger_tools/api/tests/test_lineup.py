@@ -17,11 +17,9 @@ from packages.biwenger_tools.api.logic.lineup import (
     MID,
     CANNOT_PLAY,
     _CAPTAIN_MAX_PRICE,
-    _POOL_PER_POSITION,
     _pick_captain,
     _pick_reserves,
     _sf,
-    _trim_pool_by_position,
     format_lineup_message,
     pick_lineup,
 )
@@ -235,12 +233,12 @@ def test_a_healthy_player_always_outranks_a_doubtful_one():
 
 
 def test_the_bench_is_drawn_from_the_whole_squad_not_the_trimmed_pool():
-    """`_trim_pool_by_position` keeps the top 8 per position to bound the
-    starter search. It used to feed the bench too, so a midfielder ranked ninth
-    among midfield-eligible players vanished before the bench was considered —
+    """The starter search used to keep only the top 8 per position, and that
+    trimmed pool fed the bench too, so a midfielder ranked ninth among
+    midfield-eligible players vanished before the bench was considered —
     which is how a fifteen-man squad fielded a bench of one.
 
-    Asserted against the trimmed pool directly: the formation search would
+    Asserted against `_pick_reserves` directly: the formation search would
     otherwise decide which players are spare, and that is not what is on
     trial here.
     """
@@ -248,11 +246,8 @@ def test_the_bench_is_drawn_from_the_whole_squad_not_the_trimmed_pool():
     ninth = _player(99, 3, MID)
     squad = crowded + [ninth]
 
-    trimmed = _trim_pool_by_position(sorted(squad, key=_sf, reverse=True))
-    assert ninth not in trimmed  # the pool the starter search sees drops him
-
     reserves = _pick_reserves(squad, starter_ids={p["bw_id"] for p in crowded})
-    assert reserves[2] is ninth  # …and the bench finds him anyway
+    assert reserves[2] is ninth
 
 
 # --- what the labels claim ------------------------------------------------
@@ -340,9 +335,6 @@ def test_formations_match_biwengers_strategy_picker():
 def test_every_formation_fields_exactly_eleven():
     for label, n_def, n_mid, n_fwd in FORMATIONS:
         assert 1 + n_def + n_mid + n_fwd == 11, label
-        # The search caps its candidate pool per position; a formation needing
-        # more slots than the pool holds would silently lose the optimum.
-        assert max(n_def, n_mid, n_fwd) <= _POOL_PER_POSITION, label
 
 
 # --- Watching the providers for values this code does not model ---
@@ -0,0 +1,192 @@
+"""Parity of the exact lineup solver against the search it replaced.
+
+`_solve_shapes` replaced a memoised backtracking search (`_try_fill`) that
+only finished in time because it capped its candidates per slot and its pool
+per position. That search is kept below, verbatim but for the caps being
+parameters, as the reference:
+
+- uncapped, it is exhaustive — the solver must match its score exactly;
+- capped, it is what production ran — the solver must never do worse, and
+  the squads where it does better are the optimum the caps were assuming.
+
+Scores are compared rather than elevens: when two elevens tie on every term
+of `(SF, fallback projection, back-bias)` either is correct.
+"""
+
+import random
+
+from packages.biwenger_tools.api.logic import lineup
+from packages.biwenger_tools.api.logic.lineup import (
+    DEF,
+    FORMATIONS,
+    FWD,
+    GK,
+    MID,
+    _back_bias,
+    _back_bias_one,
+    _fallback_total,
+    _positions,
+    _sf,
+)
+
+
+def _player(bw_id, rng, position=None):
+    """A squad member with the overlap that made the old search blow up."""
+    position = position or rng.choice((DEF, MID, FWD))
+    alts = []
+    if position != GK and rng.random() < 0.5:
+        alts = rng.sample([p for p in (DEF, MID, FWD) if p != position], k=1)
+    roll = rng.random()
+    return {
+        "bw_id": bw_id,
+        "name": f"P{bw_id}",
+        "price": 1_000_000,
+        "position_id": position,
+        "alt_positions": alts,
+        "jp_player": {
+            "status": "injured" if roll < 0.05 else "ok",
+            "nextMatch": {"status": "pending", "playerInLineup": roll > 0.2},
+            # Coarse rates so squads tie often, the case tiebreaks exist for.
+            "predict": [{"type": 2, "rate": rng.randrange(0, 600, 25)}],
+        },
+    }
+
+
+def _squad(size, seed):
+    """Two goalkeepers and `size - 2` outfield players, half of them
+    covering a second line."""
+    rng = random.Random(seed)
+    return [_player(i, rng, GK) for i in range(2)] + [
+        _player(i, rng) for i in range(2, size)
+    ]
+
+
+def _score(assignment):
+    return (
+        sum(_sf(r) for r, _ in assignment),
+        _fallback_total(assignment),
+        _back_bias(assignment),
+    )
+
+
+def _reference_try_fill(players, slots, per_slot):
+    """The backtracking `_try_fill` as it shipped, with its cap a parameter."""
+    if not any(cnt > 0 for cnt in slots.values()):
+        return []
+    if not players:
+        return None
+    lookup = {p["bw_id"]: p for p in players}
+    cache = {}
+
+    def _solve(player_ids, slots_t):
+        if not slots_t:
+            return ()
+        key = (player_ids, slots_t)
+        if key in cache:
+            return cache[key]
+        slots_dict = dict(slots_t)
+
+        def eligible(pos):
+            return sum(1 for pid in player_ids if pos in _positions(lookup[pid]))
+
+        pos_to_fill = min(slots_dict.keys(), key=eligible)
+        new_slots = dict(slots_dict)
+        new_slots[pos_to_fill] -= 1
+        if new_slots[pos_to_fill] == 0:
+            del new_slots[pos_to_fill]
+        new_slots_t = tuple(sorted(new_slots.items()))
+        candidates = sorted(
+            (pid for pid in player_ids if pos_to_fill in _positions(lookup[pid])),
+            key=lambda pid: _sf(lookup[pid]),
+            reverse=True,
+        )[:per_slot]
+
+        best, best_score = None, (-1, -1, -(10**9))
+        for pid in candidates:
+            sub = _solve(player_ids - {pid}, new_slots_t)
+            if sub is None:
+                continue
+            placed = [(lookup[pid], pos_to_fill)] + [(lookup[s], sl) for s, sl in sub]
+            score = (
+                sum(_sf(r) for r, _ in placed),
+                _fallback_total(placed),
+                sum(_back_bias_one(r, sl) for r, sl in placed),
+            )
+            if score > best_score:
+                best_score, best = score, ((pid, pos_to_fill),) + sub
+        cache[key] = best
+        return best
+
+    solved = _solve(
+        frozenset(p["bw_id"] for p in players),
+        tuple(sorted((p, c) for p, c in slots.items() if c > 0)),
+    )
+    return None if solved is None else [(lookup[pid], sl) for pid, sl in solved]
+
+
+def _reference_trim(players, per_position):
+    keep = set()
+    for pos in (GK, DEF, MID, FWD):
+        eligible = [p for p in players if pos in _positions(p)][:per_position]
+        keep |= {p["bw_id"] for p in eligible}
+    return [p for p in players if p["bw_id"] in keep]
+
+
+def _reference_best(squad, per_slot=None, per_position=None):
+    players = sorted(squad, key=_sf, reverse=True)
+    if per_position is not None:
+        players = _reference_trim(players, per_position)
+    best = None
+    for _, n_def, n_mid, n_fwd in FORMATIONS:
+        slots = {GK: 1, DEF: n_def, MID: n_mid, FWD: n_fwd}
+        assignment = _reference_try_fill(players, slots, per_slot)
+        if assignment is not None and (best is None or _score(assignment) > best):
+            best = _score(assignment)
+    return best
+
+
+def _solver_best(squad):
+    shapes = lineup._solve_shapes(sorted(squad, key=_sf, reverse=True))
+    scores = [
+        _score(shapes[(1, n_def, n_mid, n_fwd)])
+        for _, n_def, n_mid, n_fwd in FORMATIONS
+        if (1, n_def, n_mid, n_fwd) in shapes
+    ]
+    return max(scores, default=None)
+
+
+def test_solver_matches_the_exhaustive_search():
+    """Uncapped, the old search tried everything; the solver must agree.
+    Twelve players is as far as that stays affordable in a unit test."""
+    for seed in range(10):
+        squad = _squad(12, seed)
+        assert _solver_best(squad) == _reference_best(squad), seed
+
+
+def test_solver_never_does_worse_than_the_capped_search():
+    """What production ran: 4 candidates per slot, 8 per position. Kept to
+    fourteen-man squads — at 25 the capped search alone takes ~10 s a squad,
+    which is the timeout this solver exists to remove."""
+    for seed in range(3):
+        squad = _squad(14, 1000 + seed)
+        solved = _solver_best(squad)
+        capped = _reference_best(squad, per_slot=4, per_position=8)
+        assert capped is None or solved >= capped, seed
+
+
+def test_every_solved_shape_fills_its_lines_with_eligible_players():
+    for seed in range(10):
+        squad = _squad(25, 2000 + seed)
+        shapes = lineup._solve_shapes(sorted(squad, key=_sf, reverse=True))
+        for counts, assignment in shapes.items():
+            placed = {pos: 0 for pos in (GK, DEF, MID, FWD)}
+            for row, pos in assignment:
+                assert pos in _positions(row)
+                placed[pos] += 1
+            assert tuple(placed[p] for p in (GK, DEF, MID, FWD)) == counts
+            assert len({r["bw_id"] for r, _ in assignment}) == len(assignment)
+
+
+def test_squad_without_a_goalkeeper_has_no_lineup():
+    squad = [p for p in _squad(20, 7) if GK not in _positions(p)]
+    assert lineup.pick_lineup(squad) is None
@@ -103,3 +103,35 @@ def test_override_resolved_names_do_not_join_the_collision_pool():
 def test_no_match_returns_none():
     jp_index = build_jp_index([_jp("Iago Aspas")])
     assert find_player_match("Completely Unknown Player", jp_index) is None
+
+
+def test_index_is_reused_while_the_jp_payload_and_roster_hold():
+    """`fetch_all_players` returns the same list until JP refreshes; every
+    `build_context()` in between must get the index already built."""
+    players = [_jp("Iago Aspas"), _jp("Rubén")]
+    roster = ["Iago Aspas", "Rubén García"]
+
+    first = build_jp_index(players, biwenger_names=roster)
+
+    assert build_jp_index(players, biwenger_names=list(roster)) is first
+    assert build_jp_index(list(players), biwenger_names=roster) is not first
+    assert build_jp_index(players, biwenger_names=["Iago Aspas"]) is not first
+
+
+def test_roster_is_resolved_up_front_with_the_same_answers():
+    """The precomputed resolutions are the ladder's answers, ambiguity gates
+    included — a hand-built index without them must agree."""
+    players = [_jp("Rubén"), _jp("Aspas"), _jp("Pedro Gonzalez Lopez")]
+    roster = ["Rubén García", "Rubén López", "Iago Aspas", "Pedro Lopez"]
+    jp_index = build_jp_index(players, biwenger_names=roster)
+    bare = {
+        "by_name": jp_index["by_name"],
+        "by_slug": jp_index["by_slug"],
+        "ambiguous_loose_targets": jp_index["ambiguous_loose_targets"],
+    }
+
+    assert set(jp_index["resolved"]) == set(roster)
+    for name in roster:
+        assert jp_index["resolved"][name] is find_player_match(name, bare)
+    assert jp_index["resolved"]["Rubén García"] is None
+    assert jp_index["resolved"]["Pedro Lopez"]["name"] == "Pedro Gonzalez Lopez"
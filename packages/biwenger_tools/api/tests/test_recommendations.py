@@ -9,6 +9,7 @@ in `test_clausulazo_candidates.py`. HTTP wiring is in `test_routes.py`.
 from unittest.mock import MagicMock
 
 from packages.biwenger_tools.api.logic import clausulazo_candidates as cands
+from packages.biwenger_tools.api.logic import league_snapshot
 from packages.biwenger_tools.api.logic import recommendations as recs
 
 
@@ -88,7 +89,7 @@ def test_filter_affordable_excludes_rival_only_gk_house_rule():
 # --- gather_rivals ---
 
 
-def test_gather_rivals_annotates_owner_gk_count_and_user_id(monkeypatch):
+def test_gather_rivals_annotates_owner_gk_count_and_user_id():
     """`gather_rivals` must tag every rival row with the owner's GK count
     (for the house rule) and the owner_user_id (needed by emergency to
     fill `place_clausulazo`'s `to=<seller>` field). Two managers, one
@@ -96,10 +97,10 @@ def test_gather_rivals_annotates_owner_gk_count_and_user_id(monkeypatch):
     biwenger = MagicMock()
     biwenger.user_id = 0
     biwenger.get_league_users.return_value = {1: "Ana", 2: "Beto"}
-    biwenger.get_manager_squad.side_effect = lambda url, mgr_id: {
+    biwenger.get_manager_squads.return_value = {
         1: [{"id": 11}, {"id": 12}],  # Ana: 1 GK + 1 DEF
         2: [{"id": 21}, {"id": 22}, {"id": 23}],  # Beto: 2 GK + 1 FWD
-    }[mgr_id]
+    }
     biwenger_players = {
         11: {
             "id": 11,
@@ -137,12 +138,16 @@ def test_gather_rivals_annotates_owner_gk_count_and_user_id(monkeypatch):
             "altPositions": [],
         },
     }
-    monkeypatch.setattr(cands, "time", MagicMock())  # skip sleep
-
-    rivals = cands.gather_rivals(
-        biwenger, biwenger_players, jp_index={"by_name": {}, "by_slug": {}}
+    ctx = MagicMock(
+        biwenger=biwenger,
+        biwenger_players=biwenger_players,
+        jp_index={"by_name": {}, "by_slug": {}},
     )
 
+    league_snapshot.invalidate()
+    rivals = cands.gather_rivals(ctx)
+    league_snapshot.invalidate()
+
     by_gk = {r["bw_id"]: r["owner_gk_count"] for r in rivals}
     assert by_gk == {11: 1, 12: 1, 21: 2, 22: 2, 23: 2}
     by_owner_id = {r["bw_id"]: r["owner_user_id"] for r in rivals}
@@ -0,0 +1,128 @@
+"""Unit tests for `api/logic/render_service` — the process-pool renderer."""
+
+import os
+import runpy
+import subprocess
+import sys
+import textwrap
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from packages.biwenger_tools.api import config
+from packages.biwenger_tools.api.logic import render_service
+from packages.biwenger_tools.api.logic.image_formatter import build_table_image
+
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def _table(title):
+    return {
+        "rows": [{"name": f"{title} uno", "position_id": 3, "price": 7_400_000}],
+        "title": title,
+    }
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    render_service.reset_render_pool()
+    yield
+    render_service.reset_render_pool()
+
+
+def test_the_pool_returns_each_png_in_the_order_asked():
+    """Three tables rendered side by side come back as the three PNGs the
+    request thread would have drawn, in the order they were submitted."""
+    tables = [_table(title) for title in ("Mi equipo", "Rival", "Mercado")]
+    with patch.object(config, "RENDER_WORKERS", 2):
+        renders = [render_service.submit_table(**table) for table in tables]
+        pngs = [render.result(timeout=60) for render in renders]
+
+    assert all(png.startswith(PNG_MAGIC) for png in pngs)
+    assert pngs == [build_table_image(**table) for table in tables]
+
+
+def test_no_workers_renders_in_the_calling_thread():
+    with patch.object(config, "RENDER_WORKERS", 0), patch.object(
+        render_service, "ProcessPoolExecutor"
+    ) as pool:
+        render = render_service.submit_table(**_table("Mi equipo"))
+
+    pool.assert_not_called()
+    assert render.done() and render.result().startswith(PNG_MAGIC)
+
+
+def test_a_broken_pool_falls_back_and_is_replaced():
+    """A worker killed mid-run breaks the whole pool; the table still renders
+    and the next call starts a new pool instead of failing forever."""
+    broken = MagicMock()
+    broken.submit.side_effect = BrokenProcessPool("worker died")
+    with patch.object(config, "RENDER_WORKERS", 1), patch.object(
+        render_service, "ProcessPoolExecutor", return_value=broken
+    ) as pool:
+        render = render_service.submit_table(**_table("Mi equipo"))
+        render_service.submit_table(**_table("Mercado"))
+
+    assert render.result().startswith(PNG_MAGIC)
+    assert pool.call_count == 2
+
+
+def test_a_pool_that_breaks_under_a_queued_render_still_renders_it():
+    """The worker can die after `submit` accepted the table: the `Future`
+    then fails with `BrokenProcessPool`, which must not reach the caller."""
+    died: Future = Future()
+    died.set_exception(BrokenProcessPool("worker died"))
+    broken = MagicMock(submit=MagicMock(return_value=died))
+    with patch.object(config, "RENDER_WORKERS", 1), patch.object(
+        render_service, "ProcessPoolExecutor", return_value=broken
+    ) as pool:
+        render = render_service.submit_table(**_table("Mi equipo"))
+        render_service.submit_table(**_table("Mercado"))
+
+    assert render.result(timeout=60).startswith(PNG_MAGIC)
+    assert pool.call_count == 2
+
+
+def test_the_prod_runner_starts_gunicorn_only_as_main():
+    """A spawned render worker re-runs the launcher as `__mp_main__`; it must
+    not start a second gunicorn there."""
+    runner = Path(config.__file__).with_name("gunicorn_prod_runner.py")
+    with patch("core.serving.gunicorn.run") as run:
+        runpy.run_path(str(runner), run_name="__mp_main__")
+        run.assert_not_called()
+        runpy.run_path(str(runner), run_name="__main__")
+    run.assert_called_once()
+
+
+def test_workers_spawn_from_a_script_main(tmp_path):
+    """Production's `__main__` is a script, not pytest: the workers re-import
+    it, and the render must still come back."""
+    script = tmp_path / "launcher.py"
+    script.write_text(textwrap.dedent("""
+            from packages.biwenger_tools.api import config
+            from packages.biwenger_tools.api.logic import render_service
+
+            print("imported", flush=True)
+
+            if __name__ == "__main__":
+                config.RENDER_WORKERS = 1
+                png = render_service.submit_table([], "t").result(timeout=120)
+                print("rendered", png[:8] == bytes.fromhex("89504e470d0a1a0a"))
+                render_service.reset_render_pool()
+            """))
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+    out = subprocess.run(
+        [sys.executable, str(script)],
+        capture_output=True,
+        text=True,
+        timeout=180,
+        env=env,
+        check=True,
+    ).stdout
+
+    # The worker re-ran the script's top level, and rendered all the same.
+    assert out.count("imported") == 2
+    assert "rendered True" in out
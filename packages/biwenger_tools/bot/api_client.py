@@ -2,18 +2,52 @@
 
 Wraps the requests + auth boilerplate so `app.py` only sees
 `call_api(path, method)`.
+
+Every call used to fetch a fresh ID token from the metadata server and open a
+fresh TLS connection before the request itself went out — two round-trips on
+the latency path of every draft `/pick`. Tokens are now cached per audience
+until shortly before they expire, and every call goes through one pooled
+`requests.Session`, so a command pays for neither once the instance is warm.
 """
 
+import base64
+import json
+import threading
+import time
+
 import google.auth
 import google.auth.exceptions
 import google.auth.transport.requests
 import google.oauth2.id_token
 import requests as http_requests
 
+from core.sdk import http
 from core.utils import get_logger
 
 logger = get_logger(__name__)
 
+# Google ID tokens live an hour. Refreshing this long before `exp` keeps a
+# token from expiring between being read here and being checked by the api —
+# a request can sit in the job queue, and then take minutes.
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# audience → (token, exp as epoch seconds). Keyed by audience because the
+# token is only valid for the service it was minted for.
+_tokens: dict[str, tuple[str, float]] = {}
+_tokens_lock = threading.Lock()
+
+# One connection pool for every call to biwenger-api: keep-alive saves the TLS
+# handshake on all but the first. urllib3's pool is thread-safe, so the job
+# workers share it. Its own session rather than `http.session_for`'s: the
+# calls carry per-audience ID tokens, which stay out of the shared registry.
+_session = http.pooled_session()
+
+
+def reset_token_cache() -> None:
+    """Forget every cached ID token so the next call fetches."""
+    with _tokens_lock:
+        _tokens.clear()
+
 
 def _fetch_id_token(audience: str) -> str:
     """Return a Google-signed ID token for the given audience.
@@ -25,11 +59,62 @@ def _fetch_id_token(audience: str) -> str:
     return google.oauth2.id_token.fetch_id_token(auth_req, audience)
 
 
+def _token_expiry(token: str) -> float | None:
+    """The `exp` claim of a JWT, read without verifying it — the api verifies;
+    this only decides when to ask for a new one. None if unreadable."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(
+            base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4))
+        )
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _id_token(audience: str) -> str:
+    """An ID token for `audience`, from cache while it has more than
+    `TOKEN_REFRESH_MARGIN_SECONDS` left.
+
+    The fetch happens under the lock, so job workers that find the token
+    stale together make one metadata-server call between them. A token whose
+    `exp` cannot be read is used once and not cached.
+    """
+    with _tokens_lock:
+        cached = _tokens.get(audience)
+        if (
+            cached is not None
+            and cached[1] - time.time() > TOKEN_REFRESH_MARGIN_SECONDS
+        ):
+            return cached[0]
+        token = _fetch_id_token(audience)
+        exp = _token_expiry(token)
+        if exp is not None:
+            _tokens[audience] = (token, exp)
+        else:
+            _tokens.pop(audience, None)
+        return token
+
+
+def _drop_token_on_401(audience: str, resp) -> None:
+    """A 401 means the api refused the token, however fresh the cache thinks
+    it is; make the next call fetch another. The failing call is not retried:
+    most of these endpoints are not safe to run twice."""
+    if resp.status_code == 401:
+        with _tokens_lock:
+            _tokens.pop(audience, None)
+
+
+# The default `call_api` timeout. A job can take this long, so the bot's
+# gunicorn worker timeout and a durable task's deadline must exceed it.
+API_TIMEOUT_SECONDS = 600
+
+
 def call_api(
     base_url: str,
     path: str,
     method: str = "POST",
-    timeout: int = 600,
+    timeout: int = API_TIMEOUT_SECONDS,
     params: dict | None = None,
 ) -> None:
     """Call biwenger-api with an ID token. Raises on non-2xx.
@@ -40,8 +125,8 @@ def call_api(
     comfortable upper bound for these handlers.
     """
     url = base_url.rstrip("/") + path
-    token = _fetch_id_token(base_url)
-    resp = http_requests.request(
+    token = _id_token(base_url)
+    resp = _session.request(
         method,
         url,
         headers={
@@ -52,6 +137,7 @@ def call_api(
         json={} if method != "GET" else None,
         timeout=timeout,
     )
+    _drop_token_on_401(base_url, resp)
     resp.raise_for_status()
     logger.info(
         "biwenger-api call ok.",
@@ -74,8 +160,8 @@ def call_api_json(
     the query string when the method is GET.
     """
     url = base_url.rstrip("/") + path
-    token = _fetch_id_token(base_url)
-    resp = http_requests.request(
+    token = _id_token(base_url)
+    resp = _session.request(
         method,
         url,
         headers={
@@ -86,6 +172,7 @@ def call_api_json(
         json=payload if method != "GET" else None,
         timeout=timeout,
     )
+    _drop_token_on_401(base_url, resp)
     resp.raise_for_status()
     logger.info(
         "biwenger-api json call ok.",
@@ -103,12 +190,13 @@ def list_managers(base_url: str, timeout: int = 30) -> list[dict] | None:
     """
     url = base_url.rstrip("/") + "/managers"
     try:
-        token = _fetch_id_token(base_url)
-        resp = http_requests.get(
+        token = _id_token(base_url)
+        resp = _session.get(
             url,
             headers={"Authorization": f"Bearer {token}"},
             timeout=timeout,
         )
+        _drop_token_on_401(base_url, resp)
         resp.raise_for_status()
         return resp.json().get("managers", [])
     except (
@@ -124,12 +212,13 @@ def get_api_version(base_url: str, timeout: int = 10) -> dict | None:
     """Fetch /version from biwenger-api. Returns None on failure."""
     url = base_url.rstrip("/") + "/version"
     try:
-        token = _fetch_id_token(base_url)
-        resp = http_requests.get(
+        token = _id_token(base_url)
+        resp = _session.get(
             url,
             headers={"Authorization": f"Bearer {token}"},
             timeout=timeout,
         )
+        _drop_token_on_401(base_url, resp)
         resp.raise_for_status()
         return resp.json()
     except (
@@ -12,16 +12,16 @@ Two chats are routed, each with its own command set:
    chat. Any other chat is dropped silently (200, no reply).
 
 The bot acknowledges every tap, edits the picker into a "procesando…"
-message, then spawns a daemon thread to call biwenger-api so the webhook
-returns 200 to Telegram immediately. Without that fire-and-forget pattern
-a slow api call (e.g. /alinear on a 20+ player squad) blocks the gunicorn
-worker past its 30 s timeout — Telegram retries the webhook and the user
-sees the same "procesando…" line repeated 5-10 times.
+message, then hands the biwenger-api call to `jobs` so the webhook returns
+200 to Telegram immediately. Without that a slow api call (e.g. /alinear on
+a 20+ player squad) blocks the gunicorn worker past its 30 s timeout —
+Telegram retries the webhook and the user sees the same "procesando…" line
+repeated 5-10 times. Each job is a module-level `@jobs.job` function taking
+JSON keyword arguments, so it can also travel as a durable task.
 """
 
 import html
 import os
-import threading
 
 from flask import Flask, request
 
@@ -36,7 +36,7 @@ from core.sdk.telegram import (
     validate_webhook_secret,
 )
 from core.utils import get_logger
-from packages.biwenger_tools.bot import api_client, config, menu
+from packages.biwenger_tools.bot import api_client, config, jobs, menu
 
 logger = get_logger(__name__)
 
@@ -152,15 +152,23 @@ def _send_manager_picker() -> None:
     )
 
 
-def _run_in_background(fn, *args, **kwargs) -> None:
-    """Spawn `fn` in a daemon thread so the webhook returns 200 immediately.
+def _run_in_background(chat_id: str, fn, /, **kwargs) -> None:
+    """Queue job `fn(**kwargs)` behind `chat_id`'s earlier commands, so the
+    webhook returns 200 immediately.
 
     Long-running api calls (notably /alinear with a 20+ player squad) used
     to block the gunicorn worker past its 30 s timeout — Telegram then
-    retried the webhook and the user saw "procesando…" 5-10 times.
+    retried the webhook and the user saw "procesando…" 5-10 times. A full
+    queue refuses the job; the user is told so instead of waiting on a
+    "procesando…" that will never resolve.
     Tests patch this helper to run sync so assertions stay deterministic.
     """
-    threading.Thread(target=fn, args=args, kwargs=kwargs, daemon=True).start()
+    if not jobs.submit(chat_id, fn, **kwargs):
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN,
+            chat_id=chat_id,
+            text="⏳ Voy saturado — repite el comando en un minuto.",
+        )
 
 
 def _report_api_error(
@@ -188,6 +196,7 @@ def _report_api_error(
     )
 
 
+@jobs.job
 def _call_api_and_report(
     action_key: str,
     label: str,
@@ -210,7 +219,15 @@ def _dispatch_action(action_key: str, label: str) -> None:
         chat_id=config.TELEGRAM_CHAT_ID,
         text=f"⏳ <b>{label}</b> — procesando…",
     )
-    _run_in_background(_call_api_and_report, action_key, label, path, method, params)
+    _run_in_background(
+        config.TELEGRAM_CHAT_ID,
+        _call_api_and_report,
+        action_key=action_key,
+        label=label,
+        path=path,
+        method=method,
+        params=params,
+    )
 
 
 def _run_analizar(manager_value: str, edit_into: tuple[str, int] | None) -> None:
@@ -244,17 +261,25 @@ def _run_analizar(manager_value: str, edit_into: tuple[str, int] | None) -> None
             text=status_text,
         )
 
-    def _call_teams() -> None:
-        try:
-            api_client.call_api(
-                config.BIWENGER_API_URL, "/teams", method="GET", params=params
-            )
-        except Exception as exc:
-            _report_api_error(
-                label, exc, log="Webhook: /teams call failed", manager=manager_value
-            )
+    _run_in_background(
+        config.TELEGRAM_CHAT_ID,
+        _call_teams,
+        label=label,
+        params=params,
+        manager_value=manager_value,
+    )
 
-    _run_in_background(_call_teams)
+
+@jobs.job
+def _call_teams(label: str, params: dict | None, manager_value: str) -> None:
+    try:
+        api_client.call_api(
+            config.BIWENGER_API_URL, "/teams", method="GET", params=params
+        )
+    except Exception as exc:
+        _report_api_error(
+            label, exc, log="Webhook: /teams call failed", manager=manager_value
+        )
 
 
 def _run_emergencia_confirm(payload: str, edit_into: tuple[str, int] | None) -> None:
@@ -294,27 +319,35 @@ def _run_emergencia_confirm(payload: str, edit_into: tuple[str, int] | None) ->
         text="⏳ <b>Emergencia</b> — ejecutando clausulazo…",
     )
 
-    def _call_execute() -> None:
-        try:
-            api_client.call_api(
-                config.BIWENGER_API_URL,
-                "/emergency/clausulazo/execute",
-                method="POST",
-                params={
-                    "player_id": str(player_id),
-                    "owner_id": str(owner_id),
-                    "amount": str(amount),
-                },
-            )
-        except Exception as exc:
-            _report_api_error(
-                "Emergencia",
-                exc,
-                log="Webhook: emergency execute failed",
-                player_id=player_id,
-            )
+    _run_in_background(
+        config.TELEGRAM_CHAT_ID,
+        _call_emergency_execute,
+        player_id=player_id,
+        owner_id=owner_id,
+        amount=amount,
+    )
 
-    _run_in_background(_call_execute)
+
+@jobs.job
+def _call_emergency_execute(player_id: int, owner_id: int, amount: int) -> None:
+    try:
+        api_client.call_api(
+            config.BIWENGER_API_URL,
+            "/emergency/clausulazo/execute",
+            method="POST",
+            params={
+                "player_id": str(player_id),
+                "owner_id": str(owner_id),
+                "amount": str(amount),
+            },
+        )
+    except Exception as exc:
+        _report_api_error(
+            "Emergencia",
+            exc,
+            log="Webhook: emergency execute failed",
+            player_id=player_id,
+        )
 
 
 def _run_emergencia_cancel(edit_into: tuple[str, int] | None) -> None:
@@ -352,20 +385,22 @@ def _run_emergencia_refine(params: dict, edit_into: tuple[str, int] | None) -> N
         text="⏳ <b>Emergencia</b> — buscando objetivo…",
     )
 
-    def _call_refine() -> None:
-        try:
-            api_client.call_api(
-                config.BIWENGER_API_URL,
-                "/emergency/clausulazo/preview",
-                method="POST",
-                params=params,
-            )
-        except Exception as exc:
-            _report_api_error(
-                "Emergencia", exc, log="Webhook: emergency refine failed", params=params
-            )
+    _run_in_background(config.TELEGRAM_CHAT_ID, _call_emergency_refine, params=params)
 
-    _run_in_background(_call_refine)
+
+@jobs.job
+def _call_emergency_refine(params: dict) -> None:
+    try:
+        api_client.call_api(
+            config.BIWENGER_API_URL,
+            "/emergency/clausulazo/preview",
+            method="POST",
+            params=params,
+        )
+    except Exception as exc:
+        _report_api_error(
+            "Emergencia", exc, log="Webhook: emergency refine failed", params=params
+        )
 
 
 def _run_offer_decision(decision_char: str, offer_id_str: str, edit_into) -> None:
@@ -408,30 +443,38 @@ def _run_offer_decision(decision_char: str, offer_id_str: str, edit_into) -> Non
     decision = "accepted" if decision_char == "a" else "rejected"
     label = "Aceptar" if decision_char == "a" else "Rechazar"
 
-    def _call_decide() -> None:
-        try:
-            api_client.call_api(
-                config.BIWENGER_API_URL,
-                "/offers/decide",
-                method="POST",
-                params={"offer_id": str(offer_id), "decision": decision},
-            )
-        except Exception as exc:
-            logger.error(
-                "Webhook: offer decision failed",
-                extra={"offer_id": offer_id, "decision": decision, "error": str(exc)},
-            )
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN,
-                chat_id=config.TELEGRAM_CHAT_ID,
-                text=(
-                    f"❌ Error al {label.lower()} oferta "
-                    f"<code>{offer_id}</code>: "
-                    f"<code>{html.escape(str(exc))}</code>"
-                ),
-            )
+    _run_in_background(
+        config.TELEGRAM_CHAT_ID,
+        _call_offer_decision,
+        offer_id=offer_id,
+        decision=decision,
+        label=label,
+    )
 
-    _run_in_background(_call_decide)
+
+@jobs.job
+def _call_offer_decision(offer_id: int, decision: str, label: str) -> None:
+    try:
+        api_client.call_api(
+            config.BIWENGER_API_URL,
+            "/offers/decide",
+            method="POST",
+            params={"offer_id": str(offer_id), "decision": decision},
+        )
+    except Exception as exc:
+        logger.error(
+            "Webhook: offer decision failed",
+            extra={"offer_id": offer_id, "decision": decision, "error": str(exc)},
+        )
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN,
+            chat_id=config.TELEGRAM_CHAT_ID,
+            text=(
+                f"❌ Error al {label.lower()} oferta "
+                f"<code>{offer_id}</code>: "
+                f"<code>{html.escape(str(exc))}</code>"
+            ),
+        )
 
 
 def _handle_callback(cb: dict) -> None:
@@ -600,27 +643,28 @@ def _draft_managers_keyboard(managers: list) -> dict:
 
 def _run_draft_who_am_i(chat_id: str) -> None:
     """`/soy` with no name — post the manager picker instead of an error."""
+    _run_in_background(chat_id, _call_draft_managers, chat_id=chat_id)
 
-    def _call() -> None:
-        try:
-            data = _call_draft_api("/draft/managers", "GET", None)
-        except Exception as exc:
-            logger.error("Webhook: draft managers failed", extra={"error": str(exc)})
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN,
-                chat_id=chat_id,
-                text="❌ No pude cargar la lista de managers.",
-            )
-            return
-        managers = data.get("managers", [])
+
+@jobs.job
+def _call_draft_managers(chat_id: str) -> None:
+    try:
+        data = _call_draft_api("/draft/managers", "GET", None)
+    except Exception as exc:
+        logger.error("Webhook: draft managers failed", extra={"error": str(exc)})
         send_telegram_message(
             bot_token=config.TELEGRAM_BOT_TOKEN,
             chat_id=chat_id,
-            text=data.get("message", "¿Quién eres?"),
-            reply_markup=_draft_managers_keyboard(managers) if managers else None,
+            text="❌ No pude cargar la lista de managers.",
         )
-
-    _run_in_background(_call)
+        return
+    managers = data.get("managers", [])
+    send_telegram_message(
+        bot_token=config.TELEGRAM_BOT_TOKEN,
+        chat_id=chat_id,
+        text=data.get("message", "¿Quién eres?"),
+        reply_markup=_draft_managers_keyboard(managers) if managers else None,
+    )
 
 
 def _draft_candidates_keyboard(requesting_user_id: str, candidates: list) -> dict:
@@ -649,32 +693,43 @@ def _run_draft_action(
     path: str, method: str, params: dict | None, chat_id: str, label: str
 ) -> None:
     """Call a `/draft/*` endpoint in the background and relay its `message`."""
+    _run_in_background(
+        chat_id,
+        _call_draft_action,
+        path=path,
+        method=method,
+        params=params,
+        chat_id=chat_id,
+        label=label,
+    )
 
-    def _call() -> None:
-        try:
-            data = _call_draft_api(path, method, params)
-        except Exception as exc:
-            _report_api_error(
-                label,
-                exc,
-                log="Webhook: draft api call failed",
-                chat_id=chat_id,
-                path=path,
-            )
-            return
-        message = data.get("message", "")
-        if message:
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=message
-            )
-        # Endpoints whose payload cannot fit Telegram's 4096-char limit send a
-        # pre-split list; the api decides where the seams go.
-        for extra in data.get("messages") or []:
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=extra
-            )
 
-    _run_in_background(_call)
+@jobs.job
+def _call_draft_action(
+    path: str, method: str, params: dict | None, chat_id: str, label: str
+) -> None:
+    try:
+        data = _call_draft_api(path, method, params)
+    except Exception as exc:
+        _report_api_error(
+            label,
+            exc,
+            log="Webhook: draft api call failed",
+            chat_id=chat_id,
+            path=path,
+        )
+        return
+    message = data.get("message", "")
+    if message:
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=message
+        )
+    # Endpoints whose payload cannot fit Telegram's 4096-char limit send a
+    # pre-split list; the api decides where the seams go.
+    for extra in data.get("messages") or []:
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=extra
+        )
 
 
 def _run_draft_pick(user_id: str, query: str, chat_id: str) -> None:
@@ -684,40 +739,43 @@ def _run_draft_pick(user_id: str, query: str, chat_id: str) -> None:
     renders the candidates as an inline keyboard (`d:<user_id>:<player_id>`)
     instead — the user taps the right one to confirm.
     """
+    _run_in_background(
+        chat_id, _call_draft_pick, user_id=user_id, query=query, chat_id=chat_id
+    )
 
-    def _call() -> None:
-        try:
-            data = _call_draft_api(
-                "/draft/pick",
-                "POST",
-                {"telegram_user_id": user_id, "query": query},
-            )
-        except Exception as exc:
-            _report_api_error(
-                "Pick",
-                exc,
-                log="Webhook: draft pick failed",
-                chat_id=chat_id,
-                user_id=user_id,
-            )
-            return
 
-        message = data.get("message", "")
-        if data.get("status") == "ambiguous":
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN,
-                chat_id=chat_id,
-                text=message,
-                reply_markup=_draft_candidates_keyboard(
-                    user_id, data.get("candidates", [])
-                ),
-            )
-        elif message:
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=message
-            )
+@jobs.job
+def _call_draft_pick(user_id: str, query: str, chat_id: str) -> None:
+    try:
+        data = _call_draft_api(
+            "/draft/pick",
+            "POST",
+            {"telegram_user_id": user_id, "query": query},
+        )
+    except Exception as exc:
+        _report_api_error(
+            "Pick",
+            exc,
+            log="Webhook: draft pick failed",
+            chat_id=chat_id,
+            user_id=user_id,
+        )
+        return
 
-    _run_in_background(_call)
+    message = data.get("message", "")
+    if data.get("status") == "ambiguous":
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN,
+            chat_id=chat_id,
+            text=message,
+            reply_markup=_draft_candidates_keyboard(
+                user_id, data.get("candidates", [])
+            ),
+        )
+    elif message:
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=message
+        )
 
 
 def _handle_draft_message(text: str, user_id: str) -> None:
@@ -848,50 +906,60 @@ def _handle_draft_callback(cb: dict) -> None:
 
     answer_callback_query(config.TELEGRAM_BOT_TOKEN, cb_id)
     chat_id = cb["chat_id"]
-    edit_into = (chat_id, cb["message_id"]) if cb.get("message_id") else None
-    if edit_into is not None:
+    message_id = cb.get("message_id")
+    if message_id:
         edit_message_reply_markup(
             bot_token=config.TELEGRAM_BOT_TOKEN,
             chat_id=chat_id,
-            message_id=edit_into[1],
+            message_id=message_id,
             reply_markup={"inline_keyboard": []},
         )
+    _run_in_background(
+        chat_id,
+        _call_draft_pick_confirm,
+        requesting_user_id=requesting_user_id,
+        player_id=player_id,
+        chat_id=chat_id,
+        message_id=message_id or None,
+    )
 
-    def _call() -> None:
-        try:
-            data = _call_draft_api(
-                "/draft/pick/confirm",
-                "POST",
-                {"telegram_user_id": requesting_user_id, "player_id": player_id},
-            )
-        except Exception as exc:
-            logger.error(
-                "Webhook: draft pick confirm failed",
-                extra={"player_id": player_id, "error": str(exc)},
-            )
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN,
-                chat_id=chat_id,
-                text=(
-                    f"❌ Error al confirmar el fichaje: "
-                    f"<code>{html.escape(str(exc))}</code>"
-                ),
-            )
-            return
-        message = data.get("message", "") or "Fichaje confirmado."
-        if edit_into is not None:
-            edit_message_text(
-                bot_token=config.TELEGRAM_BOT_TOKEN,
-                chat_id=chat_id,
-                message_id=edit_into[1],
-                text=message,
-            )
-        else:
-            send_telegram_message(
-                bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=message
-            )
 
-    _run_in_background(_call)
+@jobs.job
+def _call_draft_pick_confirm(
+    requesting_user_id: str, player_id: int, chat_id: str, message_id: int | None
+) -> None:
+    try:
+        data = _call_draft_api(
+            "/draft/pick/confirm",
+            "POST",
+            {"telegram_user_id": requesting_user_id, "player_id": player_id},
+        )
+    except Exception as exc:
+        logger.error(
+            "Webhook: draft pick confirm failed",
+            extra={"player_id": player_id, "error": str(exc)},
+        )
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN,
+            chat_id=chat_id,
+            text=(
+                f"❌ Error al confirmar el fichaje: "
+                f"<code>{html.escape(str(exc))}</code>"
+            ),
+        )
+        return
+    message = data.get("message", "") or "Fichaje confirmado."
+    if message_id is not None:
+        edit_message_text(
+            bot_token=config.TELEGRAM_BOT_TOKEN,
+            chat_id=chat_id,
+            message_id=message_id,
+            text=message,
+        )
+    else:
+        send_telegram_message(
+            bot_token=config.TELEGRAM_BOT_TOKEN, chat_id=chat_id, text=message
+        )
 
 
 @app.route("/telegram/webhook", methods=["POST"])
@@ -938,6 +1006,16 @@ def webhook():
     return "", 200
 
 
+@app.route("/jobs/run", methods=["POST"])
+def run_job():
+    """Callback for a durable job task (see `jobs`). Not for Telegram."""
+    status = jobs.run_delivered(
+        request.headers.get(jobs.JOB_SECRET_HEADER, ""),
+        request.get_json(silent=True) or {},
+    )
+    return "", status
+
+
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
     app.run(debug=True, host="0.0.0.0", port=port)
@@ -32,6 +32,25 @@ TELEGRAM_DRAFT_CHAT_ID = (
 # command (and uses the same URL as the audience for the ID token).
 BIWENGER_API_URL = os.getenv("BIWENGER_API_URL", "")
 
+# Background jobs (see jobs.py). `memory` runs them on a bounded in-process
+# pool; `durable` posts each one as a Cloud Tasks-style HTTP task to
+# BOT_TASKS_URL, which calls back BOT_JOBS_TARGET_URL (this service's
+# `/jobs/run`) so the work runs inside a request with its CPU allocated.
+BOT_JOB_MODE = os.getenv("BOT_JOB_MODE", "memory").strip().lower()
+BOT_JOB_WORKERS = int(os.getenv("BOT_JOB_WORKERS", "4"))
+BOT_JOB_QUEUE_MAX = int(os.getenv("BOT_JOB_QUEUE_MAX", "32"))
+BOT_TASKS_URL = os.getenv("BOT_TASKS_URL", "")
+BOT_JOBS_TARGET_URL = os.getenv("BOT_JOBS_TARGET_URL", "")
+# How long a job may run in a request: `api_client.API_TIMEOUT_SECONDS` plus a
+# margin. A durable job runs inside `/jobs/run`, so gunicorn's worker timeout,
+# Cloud Run's request timeout (`--timeout` in deploy.yml) and the task's
+# dispatch deadline are all set to this. Any one of them shorter kills the job
+# mid-run, the task sees a failure and retries it — running it twice.
+BOT_JOB_TIMEOUT_SECONDS = int(os.getenv("BOT_JOB_TIMEOUT_SECONDS", "660"))
+# Requests one gunicorn worker serves at once, so the Telegram webhook is not
+# queued behind a job running in `/jobs/run` on the same instance.
+BOT_THREADS = int(os.getenv("BOT_THREADS", "4"))
+
 # Deployed version metadata (set by CI, see deploy.yml). Used by /version.
 GIT_COMMIT = os.getenv("GIT_COMMIT", "local")
 DEPLOY_TIME = os.getenv("DEPLOY_TIME", "")
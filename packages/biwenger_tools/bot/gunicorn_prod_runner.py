@@ -1,5 +1,10 @@
 """Gunicorn launcher for the Biwenger bot service on Cloud Run."""
 
 from core.serving.gunicorn import run
+from packages.biwenger_tools.bot import config
 
-run("packages.biwenger_tools.bot.app:app", timeout=180)
+run(
+    "packages.biwenger_tools.bot.app:app",
+    timeout=config.BOT_JOB_TIMEOUT_SECONDS,
+    threads=config.BOT_THREADS,
+)
@@ -0,0 +1,259 @@
+"""Background work for the webhook: a bounded queue, serialised per chat.
+
+Every command answers Telegram at once and does its real work — a call to
+biwenger-api that can take minutes — afterwards. That used to be one bare
+daemon thread per command: nothing bounded how many a burst of draft-group
+traffic could start, two `/pick`s from the same chat could reach the api in
+either order, and nothing counted what was waiting.
+
+`submit` hands a job to one of two backends:
+
+- **memory** (default) — a fixed pool of `BOT_JOB_WORKERS` threads draining
+  at most `BOT_JOB_QUEUE_MAX` pending jobs. A chat's jobs run one at a time,
+  in the order they arrived; different chats run side by side. A full queue
+  refuses the job rather than growing, and the caller tells the user.
+- **durable** — the job is posted as a Cloud Tasks-style HTTP task to
+  `BOT_TASKS_URL`, which calls back `POST /jobs/run` on this service. The
+  work then runs *inside a request*, so Cloud Run keeps the CPU allocated
+  and does not scale the instance away mid-job — which it may do to a thread
+  running after the response. An enqueue that fails falls back to memory.
+
+A job is a module-level function registered with `@job`, called with JSON
+keyword arguments: durable mode ships it as `(name, kwargs)` and the
+callback looks the name up, so a closure could not make the trip.
+
+Depth, running count and outcomes are logged on every submit and finish,
+which is what the log-based metrics read.
+"""
+
+import base64
+import hmac
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable
+
+import requests as http_requests
+
+from core.utils import get_logger
+from packages.biwenger_tools.bot import config
+
+logger = get_logger(__name__)
+
+# The header the durable callback must carry; its value is the webhook secret.
+JOB_SECRET_HEADER = "X-Bot-Job-Secret"
+
+_REGISTRY: dict[str, Callable] = {}
+
+
+def job(fn: Callable) -> Callable:
+    """Register `fn` as a job, by its name. Names must be unique."""
+    if fn.__name__ in _REGISTRY:
+        raise ValueError(f"job {fn.__name__!r} is already registered")
+    _REGISTRY[fn.__name__] = fn
+    return fn
+
+
+class JobQueue:
+    """A worker pool over per-chat FIFO queues, bounded in total.
+
+    A chat is *ready* while it has pending jobs and none running; workers
+    take ready chats in turn, one job each, so a chat with ten queued jobs
+    cannot starve a chat with one. Workers start on the first submit, never
+    at import — gunicorn forks after import, and threads do not survive it.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._cond = threading.Condition()
+        self._pending: dict[str, deque] = {}
+        self._ready: deque = deque()
+        self._running: set[str] = set()
+        self._depth = 0
+        self._threads: list[threading.Thread] = []
+        self._counts = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+
+    def submit(self, chat_id: str, fn: Callable, kwargs: dict) -> bool:
+        """Queue `fn(**kwargs)` behind `chat_id`'s earlier jobs. False when
+        the queue is full."""
+        with self._cond:
+            if self._depth >= self.max_pending:
+                self._counts["rejected"] += 1
+                logger.warning(
+                    "Job queue full; job refused.",
+                    extra={"job": fn.__name__, "chat_id": chat_id, **self._gauges()},
+                )
+                return False
+            waiting = self._pending.setdefault(chat_id, deque())
+            waiting.append((fn, kwargs))
+            self._depth += 1
+            self._counts["submitted"] += 1
+            if chat_id not in self._running and len(waiting) == 1:
+                self._ready.append(chat_id)
+                self._cond.notify()
+            self._start_workers()
+            logger.info(
+                "Job queued.",
+                extra={"job": fn.__name__, "chat_id": chat_id, **self._gauges()},
+            )
+        return True
+
+    def stats(self) -> dict:
+        """Gauges and lifetime counters, for logs and tests."""
+        with self._cond:
+            return {**self._gauges(), **self._counts}
+
+    def drain(self, timeout: float = 5.0) -> bool:
+        """Block until nothing is pending or running. False on timeout."""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._depth or self._running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _gauges(self) -> dict:
+        return {"depth": self._depth, "running": len(self._running)}
+
+    def _start_workers(self) -> None:
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while not self._ready:
+                    self._cond.wait()
+                chat_id = self._ready.popleft()
+                fn, kwargs = self._pending[chat_id].popleft()
+                self._running.add(chat_id)
+                self._depth -= 1
+
+            ok = _run(chat_id, fn, kwargs)
+
+            with self._cond:
+                self._running.discard(chat_id)
+                self._counts["completed" if ok else "failed"] += 1
+                if self._pending[chat_id]:
+                    self._ready.append(chat_id)
+                else:
+                    del self._pending[chat_id]
+                # Wakes a worker for the chat just readied, and `drain`.
+                self._cond.notify_all()
+
+
+def _run(chat_id: str, fn: Callable, kwargs: dict) -> bool:
+    """Run one job, logging how it went. Never raises."""
+    start = time.monotonic()
+    try:
+        fn(**kwargs)
+    except Exception:
+        logger.exception("Job failed.", extra={"job": fn.__name__, "chat_id": chat_id})
+        return False
+    logger.info(
+        "Job done.",
+        extra={
+            "job": fn.__name__,
+            "chat_id": chat_id,
+            "duration_ms": round((time.monotonic() - start) * 1000),
+        },
+    )
+    return True
+
+
+_queue: JobQueue | None = None
+_queue_lock = threading.Lock()
+
+# Durable callbacks hold their chat's lock while they run, so two tasks for
+# one chat delivered together still run in turn on this instance.
+_chat_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+
+def get_queue() -> JobQueue:
+    """The process-wide in-memory queue, sized from config on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(config.BOT_JOB_WORKERS, config.BOT_JOB_QUEUE_MAX)
+        return _queue
+
+
+def reset_queue() -> None:
+    """Forget the in-memory queue. Tests only; running workers are orphaned."""
+    global _queue
+    with _queue_lock:
+        _queue = None
+
+
+def submit(chat_id: str, fn: Callable, /, **kwargs) -> bool:
+    """Run registered job `fn(**kwargs)` in the background, after `chat_id`'s
+    earlier jobs. False when the work was refused and will not run."""
+    if fn.__name__ not in _REGISTRY:
+        raise ValueError(f"{fn.__name__!r} is not a registered job")
+    if config.BOT_JOB_MODE == "durable" and _enqueue_task(chat_id, fn, kwargs):
+        return True
+    return get_queue().submit(chat_id, fn, kwargs)
+
+
+def _enqueue_task(chat_id: str, fn: Callable, kwargs: dict) -> bool:
+    """Post the job as a Cloud Tasks `httpRequest` task. False on any failure,
+    so the caller can fall back to memory rather than lose the work."""
+    if not (config.BOT_TASKS_URL and config.BOT_JOBS_TARGET_URL):
+        logger.warning("Durable jobs enabled without BOT_TASKS_URL/target.")
+        return False
+    try:
+        body = json.dumps({"job": fn.__name__, "chat_id": chat_id, "kwargs": kwargs})
+        task = {
+            "task": {
+                "httpRequest": {
+                    "url": config.BOT_JOBS_TARGET_URL,
+                    "httpMethod": "POST",
+                    "headers": {
+                        "Content-Type": "application/json",
+                        JOB_SECRET_HEADER: config.TELEGRAM_WEBHOOK_SECRET,
+                    },
+                    "body": base64.b64encode(body.encode()).decode(),
+                },
+                # Cloud Tasks gives up on (and retries) a callback after 10
+                # minutes by default — shorter than a job may take.
+                "dispatchDeadline": f"{config.BOT_JOB_TIMEOUT_SECONDS}s",
+            }
+        }
+        resp = http_requests.post(config.BOT_TASKS_URL, json=task, timeout=10)
+        resp.raise_for_status()
+    except (http_requests.RequestException, TypeError) as exc:
+        logger.warning(
+            "Durable enqueue failed; running in memory.",
+            extra={"job": fn.__name__, "chat_id": chat_id, "error": str(exc)},
+        )
+        return False
+    logger.info("Job enqueued as task.", extra={"job": fn.__name__, "chat_id": chat_id})
+    return True
+
+
+def run_delivered(secret: str, payload: dict) -> int:
+    """Run a job a durable task delivered to `/jobs/run`. Returns the status.
+
+    401 for a wrong secret, 400 for a payload naming no registered job. A job
+    that runs answers 200 whether or not it succeeded: the queue retries on
+    anything else, and most jobs are not safe to run twice — a retried
+    `/emergencia` execute is a second clausulazo.
+    """
+    expected = config.TELEGRAM_WEBHOOK_SECRET
+    if not expected or not hmac.compare_digest(secret or "", expected):
+        return 401
+    fn = _REGISTRY.get(payload.get("job", ""))
+    kwargs = payload.get("kwargs")
+    if fn is None or not isinstance(kwargs, dict):
+        logger.warning("Delivered job not runnable.", extra={"job": payload.get("job")})
+        return 400
+    chat_id = str(payload.get("chat_id", ""))
+    with _chat_locks[chat_id]:
+        _run(chat_id, fn, kwargs)
+    return 200
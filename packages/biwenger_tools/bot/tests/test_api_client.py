@@ -0,0 +1,127 @@
+"""Tests for the bot's biwenger-api client: ID-token cache and pooled session."""
+
+import base64
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from packages.biwenger_tools.bot import api_client
+
+_API = "https://biwenger-api.example.run.app"
+
+
+def _jwt(exp: float) -> str:
+    claims = base64.urlsafe_b64encode(json.dumps({"exp": exp}).encode()).decode()
+    return f"header.{claims.rstrip('=')}.signature"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tokens():
+    api_client.reset_token_cache()
+    yield
+    api_client.reset_token_cache()
+
+
+@pytest.fixture
+def session():
+    ok = MagicMock(status_code=200)
+    with patch.object(api_client, "_session") as mock:
+        mock.request.return_value = ok
+        mock.get.return_value = ok
+        yield mock
+
+
+def test_one_token_serves_every_call_until_it_nears_expiry(session):
+    """A warm instance does not touch the metadata server per command."""
+    clock = [1_000_000.0]
+    token = _jwt(clock[0] + 3600)
+    with patch.object(api_client.time, "time", lambda: clock[0]), patch.object(
+        api_client, "_fetch_id_token", return_value=token
+    ) as fetch:
+        api_client.call_api(_API, "/market")
+        api_client.call_api_json(_API, "/draft/state", "GET")
+        api_client.list_managers(_API)
+
+        clock[0] += 3600 - api_client.TOKEN_REFRESH_MARGIN_SECONDS
+        api_client.call_api(_API, "/market")
+
+    assert fetch.call_count == 2
+    auth = session.request.call_args.kwargs["headers"]["Authorization"]
+    assert auth == f"Bearer {token}"
+
+
+def test_tokens_are_kept_per_audience(session):
+    with patch.object(
+        api_client, "_fetch_id_token", side_effect=lambda aud: _jwt(time.time() + 3600)
+    ) as fetch:
+        api_client.call_api(_API, "/market")
+        api_client.call_api("https://other.example.run.app", "/market")
+        api_client.call_api(_API, "/market")
+
+    assert [c.args[0] for c in fetch.call_args_list] == [
+        _API,
+        "https://other.example.run.app",
+    ]
+
+
+def test_a_token_without_a_readable_expiry_is_never_cached(session):
+    with patch.object(api_client, "_fetch_id_token", return_value="opaque") as fetch:
+        api_client.call_api(_API, "/market")
+        api_client.call_api(_API, "/market")
+
+    assert fetch.call_count == 2
+
+
+def test_a_401_drops_the_cached_token(session):
+    """The api is the judge of a token, not its `exp`."""
+    session.request.return_value = MagicMock(
+        status_code=401,
+        raise_for_status=MagicMock(side_effect=api_client.http_requests.HTTPError()),
+    )
+    with patch.object(
+        api_client, "_fetch_id_token", return_value=_jwt(time.time() + 3600)
+    ) as fetch:
+        with pytest.raises(api_client.http_requests.HTTPError):
+            api_client.call_api(_API, "/market")
+        session.request.return_value = MagicMock(status_code=200)
+        api_client.call_api(_API, "/market")
+
+    assert fetch.call_count == 2
+    assert session.request.call_count == 2  # the failed call is not retried
+
+
+def test_concurrent_first_calls_share_one_fetch(session):
+    """The job workers start together after a cold start."""
+    gate = threading.Event()
+
+    def slow_fetch(audience):
+        gate.wait(1)
+        return _jwt(time.time() + 3600)
+
+    with patch.object(api_client, "_fetch_id_token", side_effect=slow_fetch) as fetch:
+        threads = [
+            threading.Thread(target=api_client.call_api, args=(_API, "/market"))
+            for _ in range(4)
+        ]
+        for t in threads:
+            t.start()
+        gate.set()
+        for t in threads:
+            t.join()
+
+    assert fetch.call_count == 1
+    assert session.request.call_count == 4
+
+
+def test_every_call_goes_through_the_pooled_session(session):
+    with patch.object(api_client, "_fetch_id_token", return_value="opaque"):
+        api_client.call_api(_API, "/market")
+        api_client.call_api_json(_API, "/draft/state", "GET")
+        api_client.list_managers(_API)
+        api_client.get_api_version(_API)
+
+    assert session.request.call_count == 2
+    assert session.get.call_count == 2
@@ -7,6 +7,7 @@ from unittest.mock import patch
 
 import pytest
 
+from core.sdk import telegram
 import packages.biwenger_tools.bot.config as cfg
 from packages.biwenger_tools.bot.menu import MAIN_MENU_ACTIONS
 from packages.biwenger_tools.bot.app import app
@@ -28,14 +29,22 @@ def patch_config():
     yield
 
 
+@pytest.fixture(autouse=True)
+def fresh_rate_limits():
+    """Every reply waits on the chat's send bucket; tests share one chat id,
+    so without a reset each test past the burst would sleep for real."""
+    telegram.reset_rate_limits()
+    yield
+    telegram.reset_rate_limits()
+
+
 @pytest.fixture(autouse=True)
 def run_background_sync():
     """Force `_run_in_background` to run sync so the test thread sees the
-    mocked api call before asserting. Production keeps the daemon-thread
-    behaviour."""
+    mocked api call before asserting. Production queues the job."""
     with patch(
         "packages.biwenger_tools.bot.app._run_in_background",
-        side_effect=lambda fn, *a, **kw: fn(*a, **kw),
+        side_effect=lambda chat_id, fn, /, **kw: fn(**kw),
     ):
         yield
 
@@ -0,0 +1,207 @@
+"""Tests for the bot's background job queue (`jobs.py`)."""
+
+import base64
+import json
+import runpy
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import packages.biwenger_tools.bot.config as cfg
+from packages.biwenger_tools.bot import api_client
+from packages.biwenger_tools.bot import app as bot_app
+from packages.biwenger_tools.bot import jobs
+
+_SECRET = "test-secret"
+
+_log: list = []
+_gate = threading.Event()
+
+
+@jobs.job
+def _record(tag: str) -> None:
+    _log.append(tag)
+
+
+@jobs.job
+def _blocked(tag: str) -> None:
+    _log.append(f"{tag}:start")
+    _gate.wait(5)
+    _log.append(f"{tag}:end")
+
+
+@jobs.job
+def _explode() -> None:
+    raise RuntimeError("boom")
+
+
+@pytest.fixture(autouse=True)
+def _fresh():
+    cfg.TELEGRAM_WEBHOOK_SECRET = _SECRET
+    cfg.BOT_JOB_MODE = "memory"
+    cfg.BOT_TASKS_URL = ""
+    cfg.BOT_JOBS_TARGET_URL = ""
+    _log.clear()
+    _gate.clear()
+    jobs.reset_queue()
+    yield
+    _gate.set()
+    jobs.reset_queue()
+
+
+def test_one_chats_jobs_run_in_order_and_never_overlap():
+    """Two `/pick`s from the draft group must reach the api in the order they
+    were typed: the second waits for the first to finish."""
+    queue = jobs.JobQueue(workers=4, max_pending=10)
+
+    queue.submit("group", _blocked, {"tag": "a"})
+    queue.submit("group", _record, {"tag": "b"})
+    _gate.set()
+
+    assert queue.drain()
+    assert _log == ["a:start", "a:end", "b"]
+
+
+def test_other_chats_are_not_held_up_by_a_slow_one():
+    queue = jobs.JobQueue(workers=2, max_pending=10)
+
+    queue.submit("group", _blocked, {"tag": "slow"})
+    queue.submit("owner", _record, {"tag": "fast"})
+
+    # `fast` finishes while `slow` is still parked on the gate.
+    for _ in range(100):
+        if "fast" in _log:
+            break
+        time.sleep(0.01)
+    assert "fast" in _log and "slow:end" not in _log
+    _gate.set()
+    assert queue.drain()
+
+
+def test_a_full_queue_refuses_instead_of_growing():
+    """A burst past the bound is refused and counted, not buffered without
+    limit; what was accepted still runs."""
+    queue = jobs.JobQueue(workers=1, max_pending=2)
+
+    queue.submit("group", _blocked, {"tag": "running"})
+    for _ in range(100):
+        if queue.stats()["running"]:
+            break
+        time.sleep(0.01)
+    accepted = [queue.submit("group", _record, {"tag": str(i)}) for i in range(3)]
+    _gate.set()
+
+    assert accepted == [True, True, False]
+    assert queue.drain()
+    stats = queue.stats()
+    assert stats["rejected"] == 1 and stats["completed"] == 3
+    assert stats["depth"] == 0 and stats["running"] == 0
+
+
+def test_a_failing_job_does_not_take_its_worker_down():
+    queue = jobs.JobQueue(workers=1, max_pending=10)
+
+    queue.submit("owner", _explode, {})
+    queue.submit("owner", _record, {"tag": "after"})
+
+    assert queue.drain()
+    assert _log == ["after"]
+    assert queue.stats()["failed"] == 1
+
+
+def test_a_refused_job_is_reported_to_the_chat():
+    """The user already saw "procesando…"; silence would leave it forever."""
+    with patch.object(jobs, "submit", return_value=False), patch.object(
+        bot_app, "send_telegram_message"
+    ) as send:
+        bot_app._run_in_background("group", _record, tag="x")
+
+    assert send.call_args.kwargs["chat_id"] == "group"
+    assert "repite" in send.call_args.kwargs["text"]
+
+
+def test_unregistered_functions_are_refused_up_front():
+    with pytest.raises(ValueError):
+        jobs.submit("owner", lambda: None)
+
+
+def test_durable_mode_posts_a_cloud_tasks_http_task():
+    cfg.BOT_JOB_MODE = "durable"
+    cfg.BOT_TASKS_URL = "http://localhost:8123/v2/queues/bot/tasks"
+    cfg.BOT_JOBS_TARGET_URL = "https://bot.example/jobs/run"
+
+    with patch.object(jobs.http_requests, "post") as post:
+        assert jobs.submit("group", _record, tag="durable")
+
+    assert _log == []  # nothing ran here; the task calls back
+    request = post.call_args.kwargs["json"]["task"]["httpRequest"]
+    assert post.call_args.args[0] == cfg.BOT_TASKS_URL
+    assert request["url"] == cfg.BOT_JOBS_TARGET_URL
+    assert request["headers"][jobs.JOB_SECRET_HEADER] == _SECRET
+    assert json.loads(base64.b64decode(request["body"])) == {
+        "job": "_record",
+        "chat_id": "group",
+        "kwargs": {"tag": "durable"},
+    }
+    assert post.call_args.kwargs["json"]["task"]["dispatchDeadline"] == (
+        f"{cfg.BOT_JOB_TIMEOUT_SECONDS}s"
+    )
+
+
+def test_durable_mode_falls_back_to_memory_when_the_queue_is_down():
+    cfg.BOT_JOB_MODE = "durable"
+    cfg.BOT_TASKS_URL = "http://localhost:8123/v2/queues/bot/tasks"
+    cfg.BOT_JOBS_TARGET_URL = "https://bot.example/jobs/run"
+
+    down = MagicMock(side_effect=jobs.http_requests.ConnectionError("refused"))
+    with patch.object(jobs.http_requests, "post", down):
+        assert jobs.submit("group", _record, tag="kept")
+
+    assert jobs.get_queue().drain()
+    assert _log == ["kept"]
+
+
+def test_the_callback_runs_the_delivered_job():
+    bot_app.app.config["TESTING"] = True
+    body = {"job": "_record", "chat_id": "group", "kwargs": {"tag": "delivered"}}
+    with bot_app.app.test_client() as client:
+        wrong = client.post(
+            "/jobs/run", json=body, headers={jobs.JOB_SECRET_HEADER: "nope"}
+        )
+        unknown = client.post(
+            "/jobs/run",
+            json={**body, "job": "_nothing"},
+            headers={jobs.JOB_SECRET_HEADER: _SECRET},
+        )
+        ok = client.post(
+            "/jobs/run", json=body, headers={jobs.JOB_SECRET_HEADER: _SECRET}
+        )
+
+    assert (wrong.status_code, unknown.status_code, ok.status_code) == (401, 400, 200)
+    assert _log == ["delivered"]
+
+
+def test_a_delivered_job_that_fails_is_not_retried():
+    """Cloud Tasks retries anything but 2xx, and a retried clausulazo is a
+    second clausulazo."""
+    assert (
+        jobs.run_delivered(_SECRET, {"job": "_explode", "chat_id": "o", "kwargs": {}})
+        == 200
+    )
+
+
+def test_a_durable_job_outlives_its_api_call():
+    """A job runs inside `/jobs/run` for as long as its api call may take.
+    Killed sooner — by gunicorn or by the task's deadline — the task sees a
+    failure and runs the job a second time."""
+    assert cfg.BOT_JOB_TIMEOUT_SECONDS > api_client.API_TIMEOUT_SECONDS
+    runner = Path(cfg.__file__).with_name("gunicorn_prod_runner.py")
+    with patch("core.serving.gunicorn.run") as run:
+        runpy.run_path(str(runner))
+    assert run.call_args.kwargs == {
+        "timeout": cfg.BOT_JOB_TIMEOUT_SECONDS,
+        "threads": cfg.BOT_THREADS,
+    }
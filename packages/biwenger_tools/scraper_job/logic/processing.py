@@ -60,6 +60,36 @@ def process_participation(messages: list, user_map: dict) -> list:
     return list(by_author.values())
 
 
+def merge_participation(stored: list, new_messages: list, user_map: dict) -> list:
+    """Advance stored participation by `new_messages` only.
+
+    Same result as `process_participation` over the whole season, without
+    re-reading it: each author's new ids go in front of the stored ones, as
+    the board is newest first and `new_messages` arrive sorted the same way.
+    Ids already counted are not counted twice. Returns list[Participation]
+    for the authors in `user_map`.
+    """
+    by_author = {p.autor: p for p in stored}
+    merged: list[Participation] = []
+    for delta in process_participation(new_messages, user_map):
+        base = by_author.get(delta.autor) or Participation(autor=delta.autor)
+        merged.append(
+            Participation(
+                autor=delta.autor,
+                comunicados=_prepend_new(delta.comunicados, base.comunicados),
+                datos=_prepend_new(delta.datos, base.datos),
+                cesiones=_prepend_new(delta.cesiones, base.cesiones),
+                cronicas=_prepend_new(delta.cronicas, base.cronicas),
+            )
+        )
+    return merged
+
+
+def _prepend_new(new_ids: list, stored_ids: list) -> list:
+    known = set(stored_ids)
+    return [i for i in new_ids if i not in known] + list(stored_ids)
+
+
 def sort_messages(messages: list) -> list:
     """Sorts LeagueMessage list by fecha descending (most recent first)."""
 
@@ -1,8 +1,11 @@
 """Scraper job: fetch Biwenger board messages and write them to Firestore.
 
 Every run is idempotent — `comunicados/{season}/messages` is keyed by a
-content hash, and `participacion`, `clausulazos`, `tabla_justicia` are
-rewritten in full (wipe + bulk-write) so a deletion upstream propagates.
+content hash and only gains the new messages; `participacion` is advanced by
+those new messages alone, and written before them, so a run that dies midway
+leaves them new for the next one; `clausulazos` and `tabla_justicia` are synced to
+their desired contents (only the documents that differ are written) so a
+deletion upstream propagates without rewriting the whole season.
 """
 
 import hashlib
@@ -11,7 +14,7 @@ from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 
 from core.constants import MADRID_TZ
-from core.domain.models import Clausulazo, LeagueMessage
+from core.domain.models import Clausulazo, LeagueMessage, Participation
 from core.sdk import firestore
 from core.sdk.biwenger import BiwengerClient
 from core.sdk.telegram import send_telegram_message
@@ -20,6 +23,7 @@ from packages.biwenger_tools.scraper_job import config
 from packages.biwenger_tools.scraper_job.logic.processing import (
     build_tabla_justicia,
     categorize_title,
+    merge_participation,
     parse_clausulazos,
     process_participation,
     sort_messages,
@@ -50,15 +54,51 @@ def _existing_message_ids(season: str) -> set[str]:
     return {snap.id for snap in collection.select([]).stream()}
 
 
-def _existing_messages(season: str) -> list[LeagueMessage]:
-    """All current `LeagueMessage`s for the season, used to recompute
-    derived collections (participacion) after appending the new ones."""
+def _message_projection(season: str) -> list[LeagueMessage]:
+    """Every stored message of the season, reduced to what participación needs.
+
+    `select()` leaves the HTML `contenido` and the title on the server, so
+    this streams a few short fields per message instead of whole documents.
+    Only needed to rebuild participación from scratch.
+    """
+    collection = firestore.get_client().collection(f"comunicados/{season}/messages")
     return [
-        LeagueMessage.from_firestore(doc_id, data)
-        for doc_id, data in firestore.list_documents(f"comunicados/{season}/messages")
+        LeagueMessage.from_firestore(snap.id, snap.to_dict() or {})
+        for snap in collection.select(["autor", "categoria", "fecha"]).stream()
     ]
 
 
+def _updated_participation(
+    season: str, new_messages: list, existing_ids: set, user_map: dict
+) -> list[Participation]:
+    """Participación after `new_messages`, without re-reading the season.
+
+    The stored per-author documents (one per league member) are advanced by
+    the new messages alone. When there are none yet but messages are stored
+    — a fresh collection, or one wiped by hand — it is rebuilt once from the
+    projection instead.
+    """
+    stored = [
+        Participation.from_firestore(doc_id, data)
+        for doc_id, data in firestore.list_documents(f"participacion/{season}/authors")
+    ]
+    if not stored and existing_ids:
+        logger.info("Participación missing — rebuilding from stored messages.")
+        history = sort_messages(_message_projection(season) + new_messages)
+        return process_participation(history, user_map)
+    return merge_participation(stored, sort_messages(new_messages), user_map)
+
+
+def _message_id_hash(item: dict) -> str:
+    """Deterministic doc id of a raw board entry: date + visible text."""
+    content_text = BeautifulSoup(item.get("content", ""), "html.parser").get_text(
+        separator=" ", strip=True
+    )
+    return hashlib.sha256(
+        f"{item.get('date', '')}{content_text}".encode("utf-8")
+    ).hexdigest()
+
+
 def _process_new_messages(
     board_messages: list, existing_ids: set, user_map: dict
 ) -> list:
@@ -66,12 +106,7 @@ def _process_new_messages(
     new_messages: list[LeagueMessage] = []
     for item in board_messages:
         content_html = item.get("content", "")
-        content_text = BeautifulSoup(content_html, "html.parser").get_text(
-            separator=" ", strip=True
-        )
-        id_hash = hashlib.sha256(
-            f"{item.get('date', '')}{content_text}".encode("utf-8")
-        ).hexdigest()
+        id_hash = _message_id_hash(item)
         if id_hash in existing_ids:
             continue
         author = item.get("author")
@@ -105,17 +140,17 @@ def _clausulazo_doc_id(c: Clausulazo) -> str:
 
 
 def _write_collection(collection: str, pairs: list[tuple[str, dict]]) -> None:
-    """Wipe + bulk-write a Firestore collection.
+    """Sync a Firestore collection to exactly `pairs`.
 
-    Matches the contract the backfill script uses, so deletions on
-    Biwenger propagate (a board message removed upstream disappears from
-    Firestore on the next run).
+    Same end state as the old wipe + bulk-write — deletions on Biwenger
+    propagate (a clausulazo removed upstream disappears from Firestore on the
+    next run) — but only documents whose content changed are written, so the
+    cost follows the change rather than the size of the season.
     """
-    deleted = firestore.delete_collection(collection)
-    written = firestore.batch_write(collection, pairs)
+    counts = firestore.sync_collection(collection, pairs)
     logger.info(
-        "Firestore collection rewritten.",
-        extra={"collection": collection, "deleted": deleted, "written": written},
+        "Firestore collection synced.",
+        extra={"collection": collection, "counts": counts},
     )
 
 
@@ -189,7 +224,13 @@ def main() -> None:
             email, password, config.LOGIN_URL, config.ACCOUNT_URL, config.LEAGUE_ID
         )
 
-        board_messages = biwenger.get_all_board_messages(config.BOARD_MESSAGES_URL)
+        # Incremental crawl: the board is newest first, so the first page that
+        # reaches an already-stored message is the last one worth reading.
+        existing_ids = _existing_message_ids(season)
+        board_messages = biwenger.get_all_board_messages(
+            config.BOARD_MESSAGES_URL,
+            stop_when=lambda item: _message_id_hash(item) in existing_ids,
+        )
         logger.info("Board messages downloaded.", extra={"count": len(board_messages)})
         # include_non_playing: the cronista's messages must resolve an author
         # and count in participación, even though they never compete.
@@ -200,22 +241,28 @@ def main() -> None:
             frozenset(),
         )
 
-        new_messages = _process_new_messages(
-            board_messages, _existing_message_ids(season), user_map
-        )
+        new_messages = _process_new_messages(board_messages, existing_ids, user_map)
         new_count = len(new_messages)
         if new_messages:
             logger.info("New messages found.", extra={"count": new_count})
-            all_messages = sort_messages(_existing_messages(season) + new_messages)
-            _write_collection(
-                f"comunicados/{season}/messages",
-                [(m.id_hash, m.to_firestore()) for m in all_messages if m.id_hash],
+            # Participación first: a stored message is never new again, so
+            # one written before its participación would go uncounted if the
+            # run died in between. The other way round a retry re-counts it,
+            # which `merge_participation` ignores — ids already counted stay
+            # counted once.
+            participaciones = _updated_participation(
+                season, new_messages, existing_ids, user_map
             )
-            participaciones = process_participation(all_messages, user_map)
             _write_collection(
                 f"participacion/{season}/authors",
                 [(p.autor, p.to_firestore()) for p in participaciones if p.autor],
             )
+            # Append only: the stored messages are already there, and reading
+            # them back just to rewrite them was the bulk of the run's reads.
+            firestore.batch_write(
+                f"comunicados/{season}/messages",
+                [(m.id_hash, m.to_firestore()) for m in new_messages if m.id_hash],
+            )
         else:
             logger.info("No new messages found.")
 
@@ -2,7 +2,7 @@
 
 The scraper is Firestore-only now: every board message is hashed into
 `comunicados/{season}/messages`, and `participacion`, `clausulazos` and
-`tabla_justicia` are rewritten via wipe + bulk-write on each run. These
+`tabla_justicia` are synced to their desired contents on each run. These
 tests stub out Firestore and the Biwenger client so the behaviour is
 exercised without touching the network or a real database.
 """
@@ -12,6 +12,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from core.domain.models import LeagueMessage
 from packages.biwenger_tools.scraper_job.main import main
 
 
@@ -44,30 +45,40 @@ def mock_external_deps():
         "packages.biwenger_tools.scraper_job.main._existing_message_ids",
         return_value=set(),
     ) as mock_existing_ids, patch(
-        "packages.biwenger_tools.scraper_job.main._existing_messages",
+        "packages.biwenger_tools.scraper_job.main._message_projection",
         return_value=[],
-    ) as mock_existing_msgs:
+    ) as mock_projection:
 
         mock_biwenger_instance = MagicMock()
         mock_biwenger_client.return_value = mock_biwenger_instance
         mock_biwenger_instance.get_all_players_data_map.return_value = {}
         mock_biwenger_instance.get_all_clausulazos.return_value = {"data": []}
 
-        # Firestore helpers return integers; tests inspect call sites, not
-        # values. Side effect on batch_write echoes the input size.
-        mock_firestore.delete_collection.return_value = 0
+        # Tests inspect call sites, not values; the sync reports every pair
+        # as created.
+        mock_firestore.list_documents.return_value = []
         mock_firestore.batch_write.side_effect = lambda _coll, pairs: len(pairs)
+        mock_firestore.sync_collection.side_effect = lambda _coll, pairs: {
+            "created": len(pairs),
+            "updated": 0,
+            "deleted": 0,
+            "unchanged": 0,
+        }
 
         yield {
             "biwenger": mock_biwenger_instance,
             "firestore": mock_firestore,
             "existing_ids": mock_existing_ids,
-            "existing_msgs": mock_existing_msgs,
+            "projection": mock_projection,
         }
 
 
 def _firestore_collections_written(mock_firestore) -> list[str]:
-    return [c.args[0] for c in mock_firestore.batch_write.call_args_list]
+    return [
+        c.args[0]
+        for c in mock_firestore.method_calls
+        if c[0] in ("batch_write", "sync_collection")
+    ]
 
 
 def test_main_with_new_messages(mock_external_deps):
@@ -85,30 +96,109 @@ def test_main_with_new_messages(mock_external_deps):
 
     main()
 
-    # The 4 collections rewritten in the new-messages path
+    # The 4 collections written in the new-messages path, participación before
+    # the messages it counts.
     assert _firestore_collections_written(mock_external_deps["firestore"]) == [
-        "comunicados/25-26/messages",
         "participacion/25-26/authors",
+        "comunicados/25-26/messages",
         "clausulazos/25-26/transfers",
         "tabla_justicia/25-26/teams",
     ]
-    # Every wipe paired with a write, in the same order
-    deleted = [
-        c.args[0]
-        for c in mock_external_deps["firestore"].delete_collection.call_args_list
-    ]
-    assert deleted == _firestore_collections_written(mock_external_deps["firestore"])
+    # Nothing is wiped any more: the sync deletes only what vanished upstream.
+    mock_external_deps["firestore"].delete_collection.assert_not_called()
 
-    # The new comunicado is in the messages payload (first batch_write call)
+    # Comunicados are appended, not synced: only the new one is written.
     messages_pairs = (
         mock_external_deps["firestore"].batch_write.call_args_list[0].args[1]
     )
+    assert len(messages_pairs) == 1
     assert any("Un nuevo comunicado" in p[1].get("titulo", "") for p in messages_pairs)
 
 
+def test_main_advances_stored_participation_without_reloading_messages(
+    mock_external_deps,
+):
+    """With participación already stored, a new message bumps its author's
+    counters — the season's messages are never streamed back."""
+    mock_external_deps["biwenger"].get_league_users.return_value = {123: "Jorge"}
+    mock_external_deps["existing_ids"].return_value = {"old"}
+    mock_external_deps["firestore"].list_documents.return_value = [
+        ("Jorge", {"comunicados": ["old"], "datos": [], "cesiones": [], "cronicas": []})
+    ]
+    mock_external_deps["biwenger"].get_all_board_messages.return_value = [
+        {
+            "id": 1,
+            "date": 1672531200,
+            "author": {"id": 123},
+            "title": "Un nuevo comunicado",
+            "content": "Contenido del comunicado.",
+        }
+    ]
+
+    main()
+
+    mock_external_deps["projection"].assert_not_called()
+    sync_calls = mock_external_deps["firestore"].sync_collection.call_args_list
+    participation = dict(sync_calls[0].args[1])
+    assert participation["Jorge"]["comunicados"][1:] == ["old"]
+    assert participation["Jorge"]["total"] == 2
+
+
+def test_main_rebuilds_missing_participation_from_the_projection(
+    mock_external_deps,
+):
+    """No participación stored yet but messages are: rebuild it once from the
+    lightweight projection rather than from the new messages alone."""
+    mock_external_deps["biwenger"].get_league_users.return_value = {123: "Jorge"}
+    mock_external_deps["existing_ids"].return_value = {"old"}
+    mock_external_deps["projection"].return_value = [
+        LeagueMessage("old", "01-01-2022 10:00:00", "Jorge", "", "", "dato")
+    ]
+    mock_external_deps["biwenger"].get_all_board_messages.return_value = [
+        {
+            "id": 1,
+            "date": 1672531200,
+            "author": {"id": 123},
+            "title": "Un nuevo comunicado",
+            "content": "Contenido del comunicado.",
+        }
+    ]
+
+    main()
+
+    sync_calls = mock_external_deps["firestore"].sync_collection.call_args_list
+    participation = dict(sync_calls[0].args[1])
+    assert participation["Jorge"]["datos"] == ["old"]
+    assert participation["Jorge"]["total"] == 2
+
+
+def test_a_failed_participation_write_leaves_the_messages_new(mock_external_deps):
+    """Stored messages are never new again: written before their
+    participación, a crash in between would lose them from the counts for
+    good. Unwritten, the next run picks them up."""
+    mock_external_deps["biwenger"].get_league_users.return_value = {123: "Jorge"}
+    mock_external_deps["biwenger"].get_all_board_messages.return_value = [
+        {
+            "id": 1,
+            "date": 1672531200,
+            "author": {"id": 123},
+            "title": "Un nuevo comunicado",
+            "content": "Contenido del comunicado.",
+        }
+    ]
+    mock_external_deps["firestore"].sync_collection.side_effect = RuntimeError(
+        "firestore unavailable"
+    )
+
+    with pytest.raises(RuntimeError):
+        main()
+
+    mock_external_deps["firestore"].batch_write.assert_not_called()
+
+
 def test_main_no_new_messages(mock_external_deps):
     """When every board message already lives in Firestore, only the
-    always-rewritten collections (clausulazos + tabla_justicia) get
+    always-synced collections (clausulazos + tabla_justicia) get
     touched. Comunicados / participacion stay as-is."""
     content = "Contenido del comunicado."
     existing_hash = hashlib.sha256(f"1672531200{content}".encode("utf-8")).hexdigest()
@@ -131,6 +221,25 @@ def test_main_no_new_messages(mock_external_deps):
     ]
 
 
+def test_main_stops_the_board_crawl_at_a_stored_message(mock_external_deps):
+    """The board is read incrementally: the crawl's stop predicate recognises
+    a message Firestore already holds, and only that one."""
+    content = "Contenido del comunicado."
+    stored = {"date": 1672531200, "content": content}
+    mock_external_deps["existing_ids"].return_value = {
+        hashlib.sha256(f"1672531200{content}".encode("utf-8")).hexdigest()
+    }
+    mock_external_deps["biwenger"].get_all_board_messages.return_value = []
+
+    main()
+
+    stop_when = mock_external_deps["biwenger"].get_all_board_messages.call_args.kwargs[
+        "stop_when"
+    ]
+    assert stop_when(stored)
+    assert not stop_when({"date": 1672531201, "content": content})
+
+
 # --- Telegram notify on completion ---
 
 
@@ -1,7 +1,8 @@
-from core.domain.models import Clausulazo, LeagueMessage
+from core.domain.models import Clausulazo, LeagueMessage, Participation
 from packages.biwenger_tools.scraper_job.logic.processing import (
     build_tabla_justicia,
     categorize_title,
+    merge_participation,
     parse_clausulazos,
     process_participation,
     sort_messages,
@@ -74,6 +75,35 @@ def test_process_participation():
     assert by_author["Autor1"].total == 2
 
 
+def test_merge_participation_matches_a_full_recompute():
+    """Advancing the stored counters by the new messages gives what a full
+    recompute over the season gives, without reading the season back."""
+    user_map = {1: "Ana", 2: "Luis", 3: "Sin mensajes"}
+    old = [_msg("Ana", "comunicado", "a1"), _msg("Luis", "dato", "l1")]
+    new = [
+        _msg("Ana", "comunicado", "a2"),
+        _msg("Luis", "cronica", "l2"),
+        _msg("Ana", "comunicado", "a1"),  # already counted — no double count
+    ]
+    stored = process_participation(old, user_map)
+
+    merged = merge_participation(stored, new, user_map)
+
+    assert merged == process_participation(new[:2] + old, user_map)
+
+
+def test_merge_participation_starts_authors_missing_from_storage():
+    """An author with no stored document yet starts from zero."""
+    merged = merge_participation(
+        [Participation(autor="Ana", datos=["d1"])],
+        [_msg("Luis", "cesion", "c1")],
+        {1: "Ana", 2: "Luis"},
+    )
+    by_author = {p.autor: p for p in merged}
+    assert by_author["Ana"].datos == ["d1"]
+    assert by_author["Luis"].cesiones == ["c1"]
+
+
 def test_sort_messages():
     messages = [
         LeagueMessage("h1", "02-01-2024 10:00:00", "", "", "", ""),
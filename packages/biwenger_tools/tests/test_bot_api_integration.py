@@ -23,7 +23,7 @@ import pytest
 import packages.biwenger_tools.api.config as api_cfg
 import packages.biwenger_tools.bot.config as bot_cfg
 from packages.biwenger_tools.api.app import app as api_app
-from packages.biwenger_tools.api.logic import league_compare
+from packages.biwenger_tools.api.logic import league_snapshot
 from packages.biwenger_tools.api.logic.orchestration import OrchestratorContext
 from packages.biwenger_tools.api.logic.player_matching import build_jp_index
 from packages.biwenger_tools.bot.app import app as bot_app
@@ -84,6 +84,9 @@ class _FakeBiwenger:
             for pid in _SQUADS[int(manager_id)]
         ]
 
+    def get_manager_squads(self, url, manager_ids):
+        return {mid: self.get_manager_squad(url, mid) for mid in manager_ids}
+
 
 def _fake_context() -> OrchestratorContext:
     return OrchestratorContext(
@@ -124,18 +127,18 @@ def wire_bot_to_api():
         )
 
     with patch(
-        "packages.biwenger_tools.bot.api_client.http_requests.request",
+        "packages.biwenger_tools.bot.api_client._session.request",
         side_effect=forward,
     ), patch(
         "packages.biwenger_tools.bot.api_client._fetch_id_token",
         return_value="fake-token",
     ), patch(
         "packages.biwenger_tools.bot.app._run_in_background",
-        side_effect=lambda fn, *a, **kw: fn(*a, **kw),
+        side_effect=lambda chat_id, fn, /, **kw: fn(**kw),
     ):
-        league_compare.reset_cache()
+        league_snapshot.invalidate()
         yield
-    league_compare.reset_cache()
+    league_snapshot.invalidate()
 
 
 @pytest.fixture
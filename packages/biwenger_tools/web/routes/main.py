@@ -6,7 +6,6 @@ import time
 from datetime import date, datetime
 
 import icalendar
-import requests
 from dateutil.rrule import rrulestr
 from flask import (
     Blueprint,
@@ -22,6 +21,7 @@ from flask import (
 from core.constants import MADRID_TZ
 from packages.biwenger_tools.constants import DRAFT_ORDER_NAMES
 from core.sdk.gcp import get_sheets_data
+from core.sdk import http
 from core.sdk.http import retry_http_request
 from core.utils import get_logger
 from packages.biwenger_tools.web import config, repository, services
@@ -309,7 +309,7 @@ def _fetch_calendar_ics() -> bytes:
         return _calendar_cache["raw"]
 
     response = retry_http_request(
-        lambda: requests.get(CALENDAR_ICS_URL, timeout=10),
+        lambda: http.get(CALENDAR_ICS_URL, timeout=10),
         label="league calendar ics fetch",
     )
     _calendar_cache["raw"] = response.content
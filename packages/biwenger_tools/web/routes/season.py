@@ -12,10 +12,9 @@ Data flow:
 import time
 from dataclasses import asdict
 
-import requests
-
 from flask import Blueprint, Response, g, jsonify, render_template, request
 
+from core.sdk import http
 from core.sdk.gcp import get_sheets_data
 from core.utils import get_logger
 from packages.biwenger_tools.web import config, repository, services
@@ -143,7 +142,7 @@ def _fetch_portadas(season: str) -> list:
 
     base = f"https://storage.googleapis.com/{config.PERIODICO_BUCKET}/periodico"
     try:
-        response = requests.get(f"{base}/{season}/index.json", timeout=5)
+        response = http.get(f"{base}/{season}/index.json", timeout=5)
         response.raise_for_status()
         entries = response.json()
         portadas = [
@@ -48,7 +48,7 @@ def no_network():
 
     season_routes._portadas_cache.clear()
     with patch(
-        "packages.biwenger_tools.web.routes.season.requests.get",
+        "packages.biwenger_tools.web.routes.season.http.get",
         side_effect=AssertionError("a test reached the network"),
     ):
         yield
@@ -962,7 +962,7 @@ def test_nav_separates_what_the_season_selector_governs(mock_get, client):
     "packages.biwenger_tools.web.routes.season.repository.get_messages_by_category",
     return_value=[],
 )
-@patch("packages.biwenger_tools.web.routes.season.requests.get")
+@patch("packages.biwenger_tools.web.routes.season.http.get")
 def test_salseo_shows_the_league_front_pages(mock_http, mock_get, client):
     """Covers are named by the date printed on the masthead — the edition
     numbers the generator prints are not consistent, the dates are. Newest
@@ -993,7 +993,7 @@ def test_salseo_shows_the_league_front_pages(mock_http, mock_get, client):
     return_value=[],
 )
 @patch(
-    "packages.biwenger_tools.web.routes.season.requests.get",
+    "packages.biwenger_tools.web.routes.season.http.get",
     side_effect=Exception("bucket unreachable"),
 )
 def test_salseo_survives_a_season_with_no_front_pages(mock_http, mock_get, client):
@@ -220,7 +220,9 @@ def _python_workload(*, name, package, repository, spec, image, serves_http):
 
     srcs = svc.srcs
     if srcs == None:
-        srcs = native.glob(["**/*.py"], exclude = ["tests/**/*.py"])
+        # `benchmarks/` is a test target of its own (see the api's BUILD), and
+        # like `tests/` it has no business in the image.
+        srcs = native.glob(["**/*.py"], exclude = ["tests/**/*.py", "benchmarks/**/*.py"])
 
     pkg_dir = "/app/packages/" + package + "/" + name
     templates = native.glob(["templates/**/*.html"], allow_empty = True)